@@ -1,4 +1,3 @@
-import os
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -16,21 +15,18 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Import Base and models
-from src.todolist.db.session import Base
-from src.todolist.domain.models import Task, Category  # Import all models
+from src.todolist.db.session import Base, get_database_url
+from src.todolist.domain.models import Task, Category, Project, CategoryTaskCounts, TaskDailyStats, TaskHistory, SchedulerLease, OutboxEvent  # Import all models
 
 # Set target metadata
 target_metadata = Base.metadata
 
-# Override sqlalchemy.url from environment if available
-DB_USER = os.getenv('DB_USER', 'postgres')
-DB_PASSWORD = os.getenv('DB_PASSWORD', 'postgres')
-DB_HOST = os.getenv('DB_HOST', 'localhost')
-DB_PORT = os.getenv('DB_PORT', '5432')
-DB_NAME = os.getenv('DB_NAME', 'todolist_db')
+# Override sqlalchemy.url from environment (DATABASE_URL or DB_* parameters)
+DATABASE_URL = get_database_url()
+config.set_main_option('sqlalchemy.url', DATABASE_URL.replace('%', '%%'))
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-config.set_main_option('sqlalchemy.url', DATABASE_URL)
+# SQLite can't ALTER most things in place: use batch (copy-and-move) mode
+RENDER_AS_BATCH = DATABASE_URL.startswith('sqlite')
 
 
 def run_migrations_offline() -> None:
@@ -51,6 +47,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=RENDER_AS_BATCH,
     )
 
     with context.begin_transaction():
@@ -73,7 +70,8 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            render_as_batch=RENDER_AS_BATCH
         )
 
         with context.begin_transaction():
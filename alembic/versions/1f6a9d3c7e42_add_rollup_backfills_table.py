@@ -0,0 +1,32 @@
+"""Add rollup_backfills table
+
+Revision ID: 1f6a9d3c7e42
+Revises: e8c5a3f17d20
+Create Date: 2026-10-19 21:12:08.304517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f6a9d3c7e42'
+down_revision: Union[str, Sequence[str], None] = 'e8c5a3f17d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rollup_backfills',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('backfilled_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rollup_backfills')
@@ -0,0 +1,33 @@
+"""Add scheduler_leases table for leader election
+
+Revision ID: 5b7e2c9d41a3
+Revises: 098c3ad3c44a
+Create Date: 2026-10-19 09:12:40.114305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d41a3'
+down_revision: Union[str, Sequence[str], None] = '098c3ad3c44a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scheduler_leases',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('holder', sa.String(length=200), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scheduler_leases')
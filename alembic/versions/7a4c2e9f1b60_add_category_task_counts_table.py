@@ -0,0 +1,36 @@
+"""Add category_task_counts table and tasks.category_id index
+
+Revision ID: 7a4c2e9f1b60
+Revises: e5f1b7c93a2d
+Create Date: 2026-10-19 17:22:05.118946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4c2e9f1b60'
+down_revision: Union[str, Sequence[str], None] = 'e5f1b7c93a2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('category_task_counts',
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('category_id')
+    )
+    op.create_index(op.f('ix_tasks_category_id'), 'tasks', ['category_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tasks_category_id'), table_name='tasks')
+    op.drop_table('category_task_counts')
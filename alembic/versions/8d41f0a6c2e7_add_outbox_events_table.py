@@ -0,0 +1,42 @@
+"""Add outbox_events table for webhook delivery
+
+Revision ID: 8d41f0a6c2e7
+Revises: 5b7e2c9d41a3
+Create Date: 2026-10-19 11:03:17.582941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0a6c2e7'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9d41a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('delivered_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_outbox_status_next_attempt', 'outbox_events', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_outbox_status_next_attempt', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,59 @@
+"""Add projects table, tasks.project_id and per-project indexes
+
+Revision ID: a6e2f0c4b913
+Revises: f9c3d7a25e81
+Create Date: 2026-10-19 21:07:45.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e2f0c4b913'
+down_revision: Union[str, Sequence[str], None] = 'f9c3d7a25e81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'projects',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('task_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+    op.create_index(op.f('ix_projects_name'), 'projects', ['name'], unique=True)
+
+    # Batch mode: SQLite can't add a foreign key to an existing table
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.add_column(sa.Column('project_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_tasks_project_id_projects', 'projects', ['project_id'], ['id'], ondelete='CASCADE'
+        )
+        batch_op.create_index(
+            'idx_task_project_listing', ['project_id', 'is_completed', 'due_date'], unique=False
+        )
+        batch_op.create_index(
+            'idx_task_project_priority', ['project_id', 'is_completed', 'priority'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_index('idx_task_project_priority')
+        batch_op.drop_index('idx_task_project_listing')
+        batch_op.drop_constraint('fk_tasks_project_id_projects', type_='foreignkey')
+        batch_op.drop_column('project_id')
+    op.drop_index(op.f('ix_projects_name'), table_name='projects')
+    op.drop_index(op.f('ix_projects_id'), table_name='projects')
+    op.drop_table('projects')
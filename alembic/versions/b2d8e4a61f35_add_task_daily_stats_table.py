@@ -0,0 +1,35 @@
+"""Add task_daily_stats table
+
+Revision ID: b2d8e4a61f35
+Revises: 7a4c2e9f1b60
+Create Date: 2026-10-19 18:04:37.512803
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d8e4a61f35'
+down_revision: Union[str, Sequence[str], None] = '7a4c2e9f1b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('created', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'category_id', 'priority')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_daily_stats')
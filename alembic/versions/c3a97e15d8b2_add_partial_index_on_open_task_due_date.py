@@ -0,0 +1,32 @@
+"""Add partial index on due_date of open tasks
+
+Revision ID: c3a97e15d8b2
+Revises: 8d41f0a6c2e7
+Create Date: 2026-10-19 13:41:52.207614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a97e15d8b2'
+down_revision: Union[str, Sequence[str], None] = '8d41f0a6c2e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_task_open_due_date', 'tasks', ['due_date'], unique=False,
+        postgresql_where=sa.text('is_completed = false'),
+        sqlite_where=sa.text('is_completed = 0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_task_open_due_date', table_name='tasks')
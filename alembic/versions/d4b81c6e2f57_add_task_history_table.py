@@ -0,0 +1,44 @@
+"""Add task_history audit table (partitioned by month on PostgreSQL)
+
+Revision ID: d4b81c6e2f57
+Revises: a6e2f0c4b913
+Create Date: 2026-10-19 22:34:09.541377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b81c6e2f57'
+down_revision: Union[str, Sequence[str], None] = 'a6e2f0c4b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Monthly partitions are created on demand by the audit log writer
+    op.create_table(
+        'task_history',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=True),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('changes', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'changed_at'),
+        postgresql_partition_by='RANGE (changed_at)'
+    )
+    op.create_index(
+        'idx_task_history_task_changed_at', 'task_history', ['task_id', 'changed_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_task_history_task_changed_at', table_name='task_history')
+    op.drop_table('task_history')
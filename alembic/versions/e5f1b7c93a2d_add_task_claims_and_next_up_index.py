@@ -0,0 +1,35 @@
+"""Add task claim columns and next-up index
+
+Revision ID: e5f1b7c93a2d
+Revises: c3a97e15d8b2
+Create Date: 2026-10-19 16:08:27.530164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f1b7c93a2d'
+down_revision: Union[str, Sequence[str], None] = 'c3a97e15d8b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('claimed_by', sa.String(length=100), nullable=True))
+    op.add_column('tasks', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+    op.create_index(
+        'idx_task_next_up', 'tasks',
+        ['is_completed', sa.text('priority DESC'), 'due_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_task_next_up', table_name='tasks')
+    op.drop_column('tasks', 'claimed_until')
+    op.drop_column('tasks', 'claimed_by')
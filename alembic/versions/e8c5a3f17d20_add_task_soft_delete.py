@@ -0,0 +1,51 @@
+"""Add tasks.deleted_at for soft delete, with partial indexes
+
+Revision ID: e8c5a3f17d20
+Revises: d4b81c6e2f57
+Create Date: 2026-10-19 23:52:18.067431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c5a3f17d20'
+down_revision: Union[str, Sequence[str], None] = 'd4b81c6e2f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    # Overdue index: open, live tasks only
+    op.drop_index('idx_task_open_due_date', table_name='tasks')
+    op.create_index(
+        'idx_task_open_due_date', 'tasks', ['due_date'], unique=False,
+        postgresql_where=sa.text('is_completed = false AND deleted_at IS NULL'),
+        sqlite_where=sa.text('is_completed = 0 AND deleted_at IS NULL')
+    )
+    # Purge queue: soft-deleted tasks only
+    op.create_index(
+        'idx_task_deleted_at', 'tasks', ['deleted_at'], unique=False,
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+        sqlite_where=sa.text('deleted_at IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_task_deleted_at', table_name='tasks')
+    op.drop_index('idx_task_open_due_date', table_name='tasks')
+    op.create_index(
+        'idx_task_open_due_date', 'tasks', ['due_date'], unique=False,
+        postgresql_where=sa.text('is_completed = false'),
+        sqlite_where=sa.text('is_completed = 0')
+    )
+    # Soft-deleted tasks would reappear without the column
+    op.execute("DELETE FROM tasks WHERE deleted_at IS NOT NULL")
+    op.drop_column('tasks', 'deleted_at')
@@ -0,0 +1,28 @@
+"""Add tasks.version column for optimistic concurrency control
+
+Revision ID: f9c3d7a25e81
+Revises: b2d8e4a61f35
+Create Date: 2026-10-19 18:41:12.306519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9c3d7a25e81'
+down_revision: Union[str, Sequence[str], None] = 'b2d8e4a61f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'version')
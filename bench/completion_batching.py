@@ -0,0 +1,84 @@
+"""
+Benchmark: task completions per second with and without group commit
+(COMPLETION_BATCH_MS).
+
+    python bench/completion_batching.py [--threads 32] [--tasks 4000] [--window-ms 5]
+
+Each thread completes its share of the tasks through TaskService, on its
+own session per request as the API does, first committing every
+completion on its own and then through the completion batcher.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ["AUDIT_LOG"] = "False"
+
+from sqlalchemy import insert, select
+from src.todolist.config import Config
+from src.todolist.db.session import Base, WriteSessionLocal, get_engine
+from src.todolist.domain.models import Task
+from src.todolist.services.completion_batcher import completion_batcher
+from src.todolist.services.task_service import TaskService
+
+
+def create_tasks(count: int) -> list:
+    """Insert `count` open tasks; returns the IDs of all open tasks."""
+    with get_engine().begin() as connection:
+        connection.execute(insert(Task.__table__), [
+            {"title": f"task {i}", "priority": 2, "is_completed": False, "version": 1}
+            for i in range(count)
+        ])
+        return list(connection.scalars(select(Task.id).where(Task.is_completed == False)))
+
+
+def run(task_ids: list, threads: int) -> float:
+    """Complete task_ids from `threads` threads; returns completions per second."""
+    shares = [task_ids[i::threads] for i in range(threads)]
+
+    def worker(share):
+        for task_id in share:
+            db = WriteSessionLocal()
+            try:
+                assert TaskService(db).complete_task(task_id) is not None
+            finally:
+                db.close()
+
+    workers = [threading.Thread(target=worker, args=(share,)) for share in shares]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return len(task_ids) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--tasks", type=int, default=4000)
+    parser.add_argument("--window-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(get_engine())
+
+    Config.COMPLETION_BATCH_MS = 0
+    unbatched = run(create_tasks(args.tasks), args.threads)
+
+    Config.COMPLETION_BATCH_MS = args.window_ms
+    completion_batcher.window_seconds = args.window_ms / 1000
+    batched = run(create_tasks(args.tasks), args.threads)
+
+    print(f"SQLite, {args.threads} threads, {args.tasks} completions per run")
+    print(f"one commit per completion:          {unbatched:8.0f}/s")
+    print(f"group commit (window {args.window_ms:g} ms):      {batched:8.0f}/s  ({batched / unbatched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
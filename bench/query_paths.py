@@ -0,0 +1,149 @@
+"""
+Microbenchmark: TaskRepository's select()/lambda statements against the
+legacy Query (db.query) implementations they replaced.
+
+    python bench/query_paths.py [--tasks 5000] [--repeat 7] [--number 300]
+
+Runs on a throwaway SQLite database, checks that both paths return the
+same results and prints the per-call time (min of --repeat runs).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ["AUDIT_LOG"] = "False"
+
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import joinedload
+from src.todolist.db.session import Base, SessionLocal, get_engine
+from src.todolist.domain.models import Category, Task
+from src.todolist.repositories.task_repository import TaskRepository
+
+
+# Legacy implementations, as they were before the port to select()
+
+def legacy_get_by_id_with_category(db, task_id):
+    return (
+        db.query(Task)
+        .options(joinedload(Task.category))
+        .filter(Task.id == task_id)
+        .first()
+    )
+
+
+def legacy_get_statistics(db):
+    total = db.query(Task).count()
+    completed = db.query(Task).filter(Task.is_completed == True).count()
+    overdue = db.query(Task).filter(Task.is_overdue).count()
+    return {
+        'total': total,
+        'completed': completed,
+        'pending': total - completed,
+        'overdue': overdue
+    }
+
+
+def legacy_get_tasks(db, skip=0, limit=100, completed=None, search=None):
+    query = db.query(Task).options(joinedload(Task.category))
+    if completed is not None:
+        query = query.filter(Task.is_completed == completed)
+    if search:
+        pattern = f"%{search}%"
+        query = query.filter(or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+    query = query.order_by(
+        Task.is_completed.asc(),
+        Task.due_date.asc().nulls_last(),
+        Task.id.desc()
+    )
+    return query.offset(skip).limit(limit).all()
+
+
+def populate(task_count: int):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Category.__table__), [
+            {"name": f"category-{i}", "created_at": now, "updated_at": now} for i in range(1, 11)
+        ])
+        rows = []
+        for i in range(task_count):
+            completed = rng.random() < 0.4
+            rows.append({
+                "title": f"task {i} {rng.choice(['alpha', 'beta', 'gamma'])}",
+                "description": None,
+                "priority": rng.randint(1, 3),
+                "is_completed": completed,
+                "completed_at": now if completed else None,
+                "due_date": now + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.7 else None,
+                "category_id": rng.randint(1, 10) if rng.random() < 0.8 else None,
+                "created_at": now,
+                "updated_at": now,
+                "version": 1,
+            })
+        connection.execute(insert(Task.__table__), rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--number", type=int, default=300)
+    args = parser.parse_args()
+
+    populate(args.tasks)
+    db = SessionLocal()
+    repo = TaskRepository(db)
+    ids = [random.Random(7).randint(1, args.tasks) for _ in range(args.number)]
+
+    def by_id(get):
+        def run():
+            for task_id in ids:
+                get(task_id)
+                # Empty the identity map so every call hits the database
+                db.expunge_all()
+        return run
+
+    cases = [
+        ("by-id with category",
+         by_id(repo.get_by_id_with_category),
+         by_id(lambda task_id: legacy_get_by_id_with_category(db, task_id))),
+        ("get_statistics",
+         lambda: [repo.get_statistics() for _ in ids],
+         lambda: [legacy_get_statistics(db) for _ in ids]),
+        ("get_tasks (search, page 2)",
+         lambda: [repo.get_tasks(skip=100, limit=50, search="beta") and db.expunge_all() for _ in ids],
+         lambda: [legacy_get_tasks(db, skip=100, limit=50, search="beta") and db.expunge_all() for _ in ids]),
+    ]
+
+    # Same answers on both paths
+    assert repo.get_statistics() == legacy_get_statistics(db)
+    assert [t.id for t in repo.get_tasks(completed=False, search="alpha")] == \
+        [t.id for t in legacy_get_tasks(db, completed=False, search="alpha")]
+    for task_id in ids[:50]:
+        assert repo.get_by_id_with_category(task_id).category_id == \
+            legacy_get_by_id_with_category(db, task_id).category_id
+
+    print(f"SQLite, {args.tasks} tasks, per call (min of {args.repeat} x {args.number})")
+    print(f"{'case':<28}{'legacy db.query':>18}{'select()':>12}")
+    for name, current, legacy in cases:
+        # Warm up statement caches for both paths
+        current()
+        legacy()
+        current_us = min(timeit.repeat(current, number=1, repeat=args.repeat)) / args.number * 1e6
+        legacy_us = min(timeit.repeat(legacy, number=1, repeat=args.repeat)) / args.number * 1e6
+        print(f"{name:<28}{legacy_us:>15.0f} us{current_us:>9.0f} us")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: restart time of the persistent in-memory backend
+(MEMORY_DATA_DIR) from a snapshot.
+
+    python bench/snapshot_restart.py [--tasks 1000000] [--categories 20]
+
+Writes a snapshot of --tasks tasks, then times StorePersistence.open() on
+a fresh store (the restart), the first lookup by ID, and the first full
+scan, which builds every remaining task record.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.todolist.infrastructure.memory_backend import InMemoryStore, InMemoryTaskRepository
+from src.todolist.infrastructure.persistence import StorePersistence, write_snapshot
+from src.todolist.infrastructure.records import CategoryRecord, TaskRecord
+
+
+def write_tasks(directory: str, count: int, categories: int):
+    """Write a snapshot of `count` tasks spread over `categories` categories."""
+    category_records = [CategoryRecord(i, f"category {i}") for i in range(1, categories + 1)]
+    tasks = []
+    due = datetime(2030, 1, 1)
+    for i in range(1, count + 1):
+        task = TaskRecord(
+            i, f"Task number {i}", "A longer description" if i % 3 == 0 else None,
+            priority=1 + i % 3, category=category_records[i % categories]
+        )
+        if i % 2:
+            task.due_date = due + timedelta(minutes=i)
+        tasks.append(task)
+    write_snapshot(
+        os.path.join(directory, StorePersistence.SNAPSHOT_FILE), 0, count + 1, categories + 1,
+        category_records, tasks
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=20)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    write_tasks(directory, args.tasks, args.categories)
+
+    store = InMemoryStore()
+    persistence = StorePersistence(store, directory, snapshot_interval_seconds=3600)
+    start = time.perf_counter()
+    persistence.open()
+    restart = time.perf_counter() - start
+
+    repo = InMemoryTaskRepository(store)
+    start = time.perf_counter()
+    assert repo.get_by_id(args.tasks // 2) is not None
+    lookup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = repo.get_statistics()
+    scan = time.perf_counter() - start
+    assert stats["total"] == args.tasks
+    persistence.close()
+
+    print(f"Snapshot with {args.tasks} tasks")
+    print(f"restart (StorePersistence.open): {restart * 1000:8.0f} ms")
+    print(f"first lookup by ID:              {lookup * 1000:8.2f} ms")
+    print(f"first full scan (get_statistics): {scan * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
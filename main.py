@@ -1,16 +1,102 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.orm.exc import StaleDataError
+from src.todolist.config import Config
+from src.todolist.db.session import get_engine
+from src.todolist.events.broker import broker
+from src.todolist.api.admission import AdmissionControlMiddleware
+from src.todolist.audit import audit_log
+from src.todolist.services.single_flight import single_flight
 from src.todolist.api.routers.task_router import router as task_router
+from src.todolist.api.routers.category_router import router as category_router
+from src.todolist.api.routers.project_router import router as project_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # On PostgreSQL, task events from every process arrive via LISTEN/NOTIFY
+    listener = None
+    if Config.STORAGE_BACKEND == "sql" and get_engine().dialect.name == "postgresql":
+        from src.todolist.events.pg_listener import PostgresListener
+        listener = PostgresListener(broker)
+        listener.start()
+
+    # Optionally run the overdue closer in-process (RUN_SCHEDULER_IN_API=True),
+    # so small deployments don't need a separate scheduler daemon
+    scheduler = None
+    if Config.RUN_SCHEDULER_IN_API:
+        from src.todolist.scheduler.background import BackgroundScheduler
+        scheduler = BackgroundScheduler()
+        scheduler.start()
+
+    yield
+
+    if scheduler is not None:
+        await scheduler.stop()
+    if listener is not None:
+        listener.stop()
+    # Write out buffered task history before the process exits
+    audit_log.close()
+    if Config.STORAGE_BACKEND == "memory":
+        from src.todolist.infrastructure.memory_backend import close_memory_store
+        close_memory_store()
+
 
 app = FastAPI(
     title="To Do List Project (Phase 3 - Web API)",
     description="FastAPI",
     version="3.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Shed load before requests queue up on the connection pool
+if Config.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionControlMiddleware)
+
 app.include_router(task_router)
+app.include_router(category_router)
+app.include_router(project_router)
+
+@app.exception_handler(StaleDataError)
+def stale_data_handler(request: Request, exc: StaleDataError):
+    # A versioned UPDATE/DELETE matched no row: another request changed it first
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "Task was modified concurrently; fetch it again and retry"}
+    )
 
 @app.get("/")
 def root():
-    return {"message": "Welcome to ToDoList Web API - Phase 3"}
\ No newline at end of file
+    return {"message": "Welcome to ToDoList Web API - Phase 3"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus text format: executed vs. coalesced (shared) reads per
+    operation, and task history entries written, dropped and buffered.
+    """
+    lines = [
+        "# HELP todolist_single_flight_executions_total Reads that ran a query",
+        "# TYPE todolist_single_flight_executions_total counter",
+        "# HELP todolist_single_flight_coalesced_total Reads that shared an in-flight query",
+        "# TYPE todolist_single_flight_coalesced_total counter",
+    ]
+    for operation, counts in sorted(single_flight.stats().items()):
+        lines.append(f'todolist_single_flight_executions_total{{operation="{operation}"}} {counts["executions"]}')
+        lines.append(f'todolist_single_flight_coalesced_total{{operation="{operation}"}} {counts["coalesced"]}')
+    audit = audit_log.stats()
+    lines += [
+        "# HELP todolist_audit_written_total Task history entries written",
+        "# TYPE todolist_audit_written_total counter",
+        f"todolist_audit_written_total {audit['written']}",
+        "# HELP todolist_audit_dropped_total Task history entries dropped (buffer full or write failed at shutdown)",
+        "# TYPE todolist_audit_dropped_total counter",
+        f"todolist_audit_dropped_total {audit['dropped']}",
+        "# HELP todolist_audit_buffered Task history entries waiting to be written",
+        "# TYPE todolist_audit_buffered gauge",
+        f"todolist_audit_buffered {audit['buffered']}",
+    ]
+    return "\n".join(lines) + "\n"
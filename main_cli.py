@@ -1,8 +1,6 @@
+import json
 import sys
 from datetime import datetime
-from src.todolist.db.session import check_database_connection, SessionLocal
-from src.todolist.services.task_service import TaskService
-from src.todolist.cli.scheduler_cli import handle_autoclose_command
 
 import warnings
 warnings.warn(
@@ -12,6 +10,25 @@ warnings.warn(
     DeprecationWarning
 )
 
+# Commands import what they need on first use, so `help` and friends don't
+# pay for SQLAlchemy, the models or the scheduler on every invocation.
+
+def open_session(write: bool = False):
+    """
+    Open a database session (imports the database layer).
+    Only commands that change data open a write session: on SQLite it takes
+    the write lock at BEGIN and keeps it until the transaction ends.
+    """
+    from src.todolist.db.session import SessionLocal, WriteSessionLocal
+    return WriteSessionLocal() if write else SessionLocal()
+
+
+def task_service(db):
+    """Create a TaskService on the given session."""
+    from src.todolist.services.task_service import TaskService
+    return TaskService(db)
+
+
 def print_help():
     """Print usage help information."""
     help_text = """
@@ -32,44 +49,141 @@ Commands:
   tasks:completed              Show completed tasks
   tasks:overdue                Show overdue tasks
   
+  Listing options (tasks:list, tasks:pending, tasks:completed, tasks:overdue):
+    --limit <n>                 Show at most n tasks
+    --page <n>                  Show page n (--limit tasks per page, default 50)
+    --format table|json         Output a table (default) or one JSON object per line
+  
+  categories:rebuild-stats     Rebuild cached per-category counts
+  analytics:backfill           Rebuild daily created/completed rollups
+  projects:rebuild-counts      Recompute per-project task counts
+  tasks:purge-deleted          Purge soft-deleted tasks once (rate limited)
+  
   tasks:autoclose-overdue      Close overdue tasks once
   tasks:autoclose-overdue -d   Run scheduler in daemon mode
   
+  outbox:dispatch              Deliver pending webhook events once
+  outbox:dispatch -d           Run webhook dispatcher in daemon mode
+  
+  batch [file]                 Run JSON Lines commands from file or stdin
+  batch --commit-every <n>     Commands per transaction (default 100)
+  
   db:check                     Check database connection
   help                         Show this help message
 
 Examples:
   python main.py tasks:list
+  python main.py tasks:pending --limit 20 --page 2
+  python main.py tasks:list --format json
   python main.py tasks:create
   python main.py tasks:complete 5
   python main.py tasks:autoclose-overdue --daemon
+  echo '{"op": "complete", "id": 5}' | python main.py batch
 """
     print(help_text)
 
 
-def handle_tasks_list():
-    """Display list of all tasks."""
-    db = SessionLocal()
+def parse_list_options(args):
+    """
+    Parse --limit, --page and --format options of the listing commands.
+    
+    Returns:
+        Tuple (skip, limit, output_format); limit is None for no limit
+    """
+    options = {"--limit": None, "--page": None, "--format": "table"}
+    args = list(args)
+    while args:
+        name = args.pop(0)
+        if name not in options or not args:
+            print("❌ Options: [--limit <n>] [--page <n>] [--format table|json]")
+            sys.exit(1)
+        options[name] = args.pop(0)
+
     try:
-        service = TaskService(db)
-        tasks = service.get_all_tasks()
-        
-        if not tasks:
-            print("📭 No tasks found!")
-            return
-        
-        print(f"\n📋 All Tasks ({len(tasks)} total):\n")
-        print(f"{'ID':<5} {'Title':<30} {'Status':<12} {'Priority':<10} {'Due Date':<20}")
-        print("=" * 85)
-        
+        limit = int(options["--limit"]) if options["--limit"] is not None else None
+        page = int(options["--page"]) if options["--page"] is not None else 1
+    except ValueError:
+        print("❌ --limit and --page must be numbers")
+        sys.exit(1)
+    if (limit is not None and limit < 1) or page < 1:
+        print("❌ --limit and --page must be at least 1")
+        sys.exit(1)
+    if options["--format"] not in ("table", "json"):
+        print("❌ --format must be 'table' or 'json'")
+        sys.exit(1)
+
+    # Pages need a size: default to 50 tasks per page
+    if options["--page"] is not None and limit is None:
+        limit = 50
+    skip = (page - 1) * limit if limit is not None else 0
+    return skip, limit, options["--format"]
+
+
+def print_tasks(tasks, output_format, title, header, format_row, empty_message):
+    """
+    Print tasks as they are fetched, so output starts immediately and
+    memory use stays flat however many tasks there are.
+    
+    Args:
+        tasks: Iterator over tasks
+        output_format: "table", or "json" for one JSON object per line
+        title: Heading printed before the table
+        header: Column header line
+        format_row: Function formatting a task as a table row
+        empty_message: Printed when there are no tasks
+    """
+    if output_format == "json":
+        from src.todolist.api.schemas import TaskResponse
         for task in tasks:
+            print(json.dumps(TaskResponse.model_validate(task).model_dump(mode="json")))
+        return
+
+    shown = 0
+    for task in tasks:
+        if shown == 0:
+            print(f"\n{title}\n")
+            print(header)
+            print("=" * len(header))
+        print(format_row(task))
+        shown += 1
+
+    if shown == 0:
+        print(empty_message)
+    else:
+        print(f"\n{shown} task(s) shown")
+
+
+PRIORITY_LABELS = {1: "🟢 Low", 2: "🟡 Medium", 3: "🔴 High"}
+
+
+def short_title(task) -> str:
+    return task.title[:27] + "..." if len(task.title) > 30 else task.title
+
+
+def format_due(task) -> str:
+    return task.due_date.strftime("%Y-%m-%d %H:%M") if task.due_date else "N/A"
+
+
+def handle_tasks_list(args=()):
+    """Display list of all tasks."""
+    skip, limit, output_format = parse_list_options(args)
+    db = open_session()
+    try:
+        service = task_service(db)
+
+        def format_row(task):
             status = "✅ Done" if task.is_completed else "⏳ Pending"
-            priority_map = {1: "🟢 Low", 2: "🟡 Medium", 3: "🔴 High"}
-            priority = priority_map.get(task.priority, "Unknown")
-            due = task.due_date.strftime("%Y-%m-%d %H:%M") if task.due_date else "N/A"
-            
-            title = task.title[:27] + "..." if len(task.title) > 30 else task.title
-            print(f"{task.id:<5} {title:<30} {status:<12} {priority:<10} {due:<20}")
+            priority = PRIORITY_LABELS.get(task.priority, "Unknown")
+            return f"{task.id:<5} {short_title(task):<30} {status:<12} {priority:<10} {format_due(task):<20}"
+
+        print_tasks(
+            service.iter_tasks(skip=skip, limit=limit),
+            output_format,
+            title="📋 All Tasks:",
+            header=f"{'ID':<5} {'Title':<30} {'Status':<12} {'Priority':<10} {'Due Date':<20}",
+            format_row=format_row,
+            empty_message="📭 No tasks found!"
+        )
             
     finally:
         db.close()
@@ -108,9 +222,9 @@ def handle_tasks_create():
     category = input("Category (optional): ").strip() or None
     
     # Create task
-    db = SessionLocal()
+    db = open_session(write=True)
     try:
-        service = TaskService(db)
+        service = task_service(db)
         task = service.create_task(
             title=title,
             description=description,
@@ -127,9 +241,9 @@ def handle_tasks_create():
 
 def handle_tasks_show(task_id: int):
     """Show detailed information about a task."""
-    db = SessionLocal()
+    db = open_session()
     try:
-        service = TaskService(db)
+        service = task_service(db)
         task = service.get_task_by_id(task_id)
         
         if not task:
@@ -161,44 +275,53 @@ def handle_tasks_show(task_id: int):
 
 def handle_tasks_update(task_id: int):
     """Update an existing task."""
-    db = SessionLocal()
+    db = open_session()
     try:
-        service = TaskService(db)
-        task = service.get_task_by_id(task_id)
+        task = task_service(db).get_task_by_id(task_id)
         
         if not task:
             print(f"❌ Task with ID {task_id} not found!")
             return
         
-        print(f"\n✏️  Update Task (ID: {task_id})")
-        print("Leave blank to keep current value\n")
-        
-        # Get new values
-        title = input(f"Title [{task.title}]: ").strip() or None
-        description = input(f"Description [{task.description or 'N/A'}]: ").strip() or None
-        
-        # Priority
         priority_map = {1: "Low", 2: "Medium", 3: "High"}
+        current_title = task.title
+        current_description = task.description or 'N/A'
         current_priority = priority_map.get(task.priority, "Unknown")
-        priority_input = input(f"Priority (1-3) [{current_priority}]: ").strip()
-        priority = int(priority_input) if priority_input in ['1', '2', '3'] else None
-        
-        # Due date
         current_due = task.due_date.strftime("%Y-%m-%d %H:%M") if task.due_date else "N/A"
-        due_date_str = input(f"Due date (YYYY-MM-DD HH:MM) [{current_due}]: ").strip()
-        due_date = None
-        if due_date_str:
-            try:
-                due_date = datetime.strptime(due_date_str, "%Y-%m-%d %H:%M")
-            except ValueError:
-                print("⚠️  Invalid date format, keeping current due date...")
-        
-        # Category
         current_category = task.category.name if task.category else "N/A"
-        category = input(f"Category [{current_category}]: ").strip() or None
         
-        # Update task
-        updated_task = service.update_task(
+        # Don't keep a transaction open while waiting for the user
+        db.rollback()
+    finally:
+        db.close()
+    
+    print(f"\n✏️  Update Task (ID: {task_id})")
+    print("Leave blank to keep current value\n")
+    
+    # Get new values
+    title = input(f"Title [{current_title}]: ").strip() or None
+    description = input(f"Description [{current_description}]: ").strip() or None
+    
+    # Priority
+    priority_input = input(f"Priority (1-3) [{current_priority}]: ").strip()
+    priority = int(priority_input) if priority_input in ['1', '2', '3'] else None
+    
+    # Due date
+    due_date_str = input(f"Due date (YYYY-MM-DD HH:MM) [{current_due}]: ").strip()
+    due_date = None
+    if due_date_str:
+        try:
+            due_date = datetime.strptime(due_date_str, "%Y-%m-%d %H:%M")
+        except ValueError:
+            print("⚠️  Invalid date format, keeping current due date...")
+    
+    # Category
+    category = input(f"Category [{current_category}]: ").strip() or None
+    
+    # Update task
+    db = open_session(write=True)
+    try:
+        updated_task = task_service(db).update_task(
             task_id=task_id,
             title=title,
             description=description,
@@ -220,10 +343,9 @@ def handle_tasks_update(task_id: int):
 
 def handle_tasks_delete(task_id: int):
     """Delete a task."""
-    db = SessionLocal()
+    db = open_session()
     try:
-        service = TaskService(db)
-        task = service.get_task_by_id(task_id)
+        task = task_service(db).get_task_by_id(task_id)
         
         if not task:
             print(f"❌ Task with ID {task_id} not found!")
@@ -232,25 +354,32 @@ def handle_tasks_delete(task_id: int):
         print(f"\n⚠️  You are about to delete:")
         print(f"    [{task.id}] {task.title}")
         
-        confirm = input("\nAre you sure? (y/n): ")
-        
-        if confirm.lower() == 'y':
-            if service.delete_task(task_id):
-                print(f"\n✅ Task deleted successfully!")
-            else:
-                print(f"\n❌ Failed to delete task!")
+        # Don't keep a transaction open while waiting for the user
+        db.rollback()
+    finally:
+        db.close()
+    
+    confirm = input("\nAre you sure? (y/n): ")
+    
+    if confirm.lower() != 'y':
+        print("\n❌ Deletion cancelled.")
+        return
+    
+    db = open_session(write=True)
+    try:
+        if task_service(db).delete_task(task_id):
+            print(f"\n✅ Task deleted successfully!")
         else:
-            print("\n❌ Deletion cancelled.")
-            
+            print(f"\n❌ Failed to delete task!")
     finally:
         db.close()
 
 
 def handle_tasks_complete(task_id: int):
     """Mark a task as completed."""
-    db = SessionLocal()
+    db = open_session(write=True)
     try:
-        service = TaskService(db)
+        service = task_service(db)
         task = service.complete_task(task_id)
         
         if task:
@@ -264,9 +393,9 @@ def handle_tasks_complete(task_id: int):
 
 def handle_tasks_search(keyword: str):
     """Search tasks by keyword."""
-    db = SessionLocal()
+    db = open_session()
     try:
-        service = TaskService(db)
+        service = task_service(db)
         tasks = service.search_tasks(keyword)
         
         if not tasks:
@@ -291,9 +420,9 @@ def handle_tasks_search(keyword: str):
 
 def handle_tasks_stats():
     """Display task statistics."""
-    db = SessionLocal()
+    db = open_session()
     try:
-        service = TaskService(db)
+        service = task_service(db)
         stats = service.get_statistics()
         
         print("\n📊 Task Statistics:\n")
@@ -310,84 +439,118 @@ def handle_tasks_stats():
         db.close()
 
 
-def handle_tasks_pending():
+def handle_tasks_pending(args=()):
     """Display pending tasks."""
-    db = SessionLocal()
+    skip, limit, output_format = parse_list_options(args)
+    db = open_session()
     try:
-        service = TaskService(db)
-        tasks = service.get_pending_tasks()
-        
-        if not tasks:
-            print("✅ No pending tasks!")
-            return
-        
-        print(f"\n⏳ Pending Tasks ({len(tasks)}):\n")
-        print(f"{'ID':<5} {'Title':<30} {'Priority':<10} {'Due Date':<20}")
-        print("=" * 70)
-        
-        for task in tasks:
-            priority_map = {1: "🟢 Low", 2: "🟡 Medium", 3: "🔴 High"}
-            priority = priority_map.get(task.priority, "Unknown")
-            due = task.due_date.strftime("%Y-%m-%d %H:%M") if task.due_date else "N/A"
-            
-            title = task.title[:27] + "..." if len(task.title) > 30 else task.title
-            print(f"{task.id:<5} {title:<30} {priority:<10} {due:<20}")
+        service = task_service(db)
+
+        def format_row(task):
+            priority = PRIORITY_LABELS.get(task.priority, "Unknown")
+            return f"{task.id:<5} {short_title(task):<30} {priority:<10} {format_due(task):<20}"
+
+        print_tasks(
+            service.iter_tasks(status="pending", skip=skip, limit=limit),
+            output_format,
+            title="⏳ Pending Tasks:",
+            header=f"{'ID':<5} {'Title':<30} {'Priority':<10} {'Due Date':<20}",
+            format_row=format_row,
+            empty_message="✅ No pending tasks!"
+        )
             
     finally:
         db.close()
 
 
-def handle_tasks_completed():
+def handle_tasks_completed(args=()):
     """Display completed tasks."""
-    db = SessionLocal()
+    skip, limit, output_format = parse_list_options(args)
+    db = open_session()
     try:
-        service = TaskService(db)
-        tasks = service.get_completed_tasks()
-        
-        if not tasks:
-            print("📭 No completed tasks!")
-            return
-        
-        print(f"\n✅ Completed Tasks ({len(tasks)}):\n")
-        print(f"{'ID':<5} {'Title':<30} {'Completed At':<20}")
-        print("=" * 60)
-        
-        for task in tasks:
+        service = task_service(db)
+
+        def format_row(task):
             completed = task.completed_at.strftime("%Y-%m-%d %H:%M") if task.completed_at else "Unknown"
-            title = task.title[:27] + "..." if len(task.title) > 30 else task.title
-            print(f"{task.id:<5} {title:<30} {completed:<20}")
+            return f"{task.id:<5} {short_title(task):<30} {completed:<20}"
+
+        print_tasks(
+            service.iter_tasks(status="completed", skip=skip, limit=limit),
+            output_format,
+            title="✅ Completed Tasks:",
+            header=f"{'ID':<5} {'Title':<30} {'Completed At':<20}",
+            format_row=format_row,
+            empty_message="📭 No completed tasks!"
+        )
             
     finally:
         db.close()
 
 
-def handle_tasks_overdue():
+def handle_tasks_overdue(args=()):
     """Display overdue tasks."""
-    db = SessionLocal()
+    skip, limit, output_format = parse_list_options(args)
+    db = open_session()
     try:
-        service = TaskService(db)
-        tasks = service.get_overdue_tasks()
-        
-        if not tasks:
-            print("✅ No overdue tasks!")
-            return
-        
-        print(f"\n⚠️  Overdue Tasks ({len(tasks)}):\n")
-        print(f"{'ID':<5} {'Title':<30} {'Due Date':<20} {'Priority':<10}")
-        print("=" * 70)
-        
-        for task in tasks:
-            priority_map = {1: "🟢 Low", 2: "🟡 Medium", 3: "🔴 High"}
-            priority = priority_map.get(task.priority, "Unknown")
-            due = task.due_date.strftime("%Y-%m-%d %H:%M")
-            
-            title = task.title[:27] + "..." if len(task.title) > 30 else task.title
-            print(f"{task.id:<5} {title:<30} {due:<20} {priority:<10}")
+        service = task_service(db)
+
+        def format_row(task):
+            priority = PRIORITY_LABELS.get(task.priority, "Unknown")
+            return f"{task.id:<5} {short_title(task):<30} {format_due(task):<20} {priority:<10}"
+
+        print_tasks(
+            service.iter_tasks(status="overdue", skip=skip, limit=limit),
+            output_format,
+            title="⚠️  Overdue Tasks:",
+            header=f"{'ID':<5} {'Title':<30} {'Due Date':<20} {'Priority':<10}",
+            format_row=format_row,
+            empty_message="✅ No overdue tasks!"
+        )
             
     finally:
         db.close()
 
 
+def handle_categories_rebuild_stats():
+    """Recompute the cached per-category task counts."""
+    from src.todolist.rollups import rebuild_category_counts
+    db = open_session(write=True)
+    try:
+        count = rebuild_category_counts(db)
+        print(f"✅ Rebuilt task counts for {count} categories")
+    finally:
+        db.close()
+
+
+def handle_analytics_backfill():
+    """Rebuild the daily created/completed rollups from the tasks table."""
+    from src.todolist.rollups import backfill_daily_stats
+    db = open_session(write=True)
+    try:
+        count = backfill_daily_stats(db)
+        print(f"✅ Rebuilt {count} daily analytics rows")
+    finally:
+        db.close()
+
+
+def handle_projects_rebuild_counts():
+    """Recompute the per-project task counters behind the task quota."""
+    from src.todolist.rollups import rebuild_project_counts
+    db = open_session(write=True)
+    try:
+        count = rebuild_project_counts(db)
+        print(f"✅ Rebuilt task counts for {count} projects")
+    finally:
+        db.close()
+
+
+def handle_tasks_purge_deleted():
+    """Physically remove soft-deleted tasks now, ignoring PURGE_QUIET_HOURS."""
+    from src.todolist.scheduler.tasks import purge_deleted_tasks
+    purged = purge_deleted_tasks(any_time=True)
+    print(f"✅ Purged {purged} deleted task(s)")
+
+
 def main():
     """Main application entry point."""
     if len(sys.argv) < 2:
@@ -399,6 +562,7 @@ def main():
     try:
         # Database check command
         if command == "db:check":
+            from src.todolist.db.session import check_database_connection
             check_database_connection()
         
         # Help command
@@ -407,7 +571,7 @@ def main():
         
         # Task commands
         elif command == "tasks:list":
-            handle_tasks_list()
+            handle_tasks_list(sys.argv[2:])
         
         elif command == "tasks:create":
             handle_tasks_create()
@@ -446,18 +610,41 @@ def main():
             handle_tasks_stats()
         
         elif command == "tasks:pending":
-            handle_tasks_pending()
+            handle_tasks_pending(sys.argv[2:])
         
         elif command == "tasks:completed":
-            handle_tasks_completed()
+            handle_tasks_completed(sys.argv[2:])
         
         elif command == "tasks:overdue":
-            handle_tasks_overdue()
+            handle_tasks_overdue(sys.argv[2:])
+        
+        elif command == "categories:rebuild-stats":
+            handle_categories_rebuild_stats()
+        
+        elif command == "analytics:backfill":
+            handle_analytics_backfill()
+        
+        elif command == "projects:rebuild-counts":
+            handle_projects_rebuild_counts()
+        
+        elif command == "tasks:purge-deleted":
+            handle_tasks_purge_deleted()
         
         # Scheduler command
         elif command == "tasks:autoclose-overdue":
+            from src.todolist.cli.scheduler_cli import handle_autoclose_command
             handle_autoclose_command(sys.argv[2:])
         
+        # Webhook outbox command
+        elif command == "outbox:dispatch":
+            from src.todolist.cli.outbox_cli import handle_outbox_command
+            handle_outbox_command(sys.argv[2:])
+        
+        # Batch (pipe) mode
+        elif command == "batch":
+            from src.todolist.cli.batch_cli import handle_batch_command
+            handle_batch_command(sys.argv[2:])
+        
         else:
             print(f"❌ Unknown command: {command}")
             print("Run 'python main.py help' for usage information.")
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from ..config import Config
+
+# Paths whose requests use a database connection; everything else
+# (docs, root, the SSE feed) is only rate limited
+LIMITED_PREFIXES = ("/tasks", "/categories", "/projects")
+UNLIMITED_PATHS = ("/tasks/stream",)
+
+# Idle client buckets kept for rate limiting (least recently seen dropped first)
+MAX_TRACKED_CLIENTS = 10_000
+
+
+class ConcurrencyLimiter:
+    """
+    Admits at most `limit` requests at once. Up to `queue_size` more wait
+    (FIFO) for at most `timeout` seconds; anything beyond is refused.
+    Used from the event loop only, so it needs no lock.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        """Take a slot; False if the queue is full or the wait timed out."""
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        if len(self.waiters) >= self.queue_size:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            # A slot may have been handed over just as the wait timed out
+            return waiter.done() and not waiter.cancelled()
+        except asyncio.CancelledError:
+            # Client went away; pass on a slot that was already handed to us
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+        return True
+
+    def release(self):
+        """Free a slot, handing it straight to the oldest waiter if any."""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `burst`."""
+
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, burst: float):
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def take(self, rate: float, burst: float) -> float:
+        """
+        Take a token.
+
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        self.tokens = min(burst, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / rate
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware shedding load before requests reach the connection pool.
+
+    Reads (GET/HEAD) and writes each get a concurrency limit and a bounded
+    wait queue. Waiting is capped at the pool checkout timeout: a request
+    that waited longer would time out on the pool anyway. Requests that
+    can't be queued get 503 with Retry-After at once. Clients are also rate
+    limited with a token bucket per client address (429).
+
+    Limits are per process; divide them by the number of workers.
+    """
+
+    def __init__(
+        self,
+        app,
+        read_limit: int = Config.ADMISSION_READ_LIMIT,
+        write_limit: int = Config.ADMISSION_WRITE_LIMIT,
+        queue_size: int = Config.ADMISSION_QUEUE_SIZE,
+        queue_timeout: float = Config.DB_POOL_TIMEOUT_SECONDS,
+        rate_limit: float = Config.RATE_LIMIT_PER_SECOND,
+        rate_burst: float = Config.RATE_LIMIT_BURST,
+    ):
+        self.app = app
+        self.limiters: Dict[str, ConcurrencyLimiter] = {
+            "read": ConcurrencyLimiter(read_limit, queue_size, queue_timeout),
+            "write": ConcurrencyLimiter(write_limit, queue_size, queue_timeout),
+        }
+        self.retry_after = max(1, math.ceil(queue_timeout))
+        self.rate_limit = rate_limit
+        self.rate_burst = max(1.0, rate_burst)
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limit > 0:
+            wait = self._take_token(self._client_key(scope))
+            if wait:
+                await self._reject(send, 429, "Too many requests", math.ceil(wait))
+                return
+
+        limiter = self.limiters.get(self._route_class(scope))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            await self._reject(send, 503, "Server busy, retry later", self.retry_after)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    @staticmethod
+    def _route_class(scope) -> Optional[str]:
+        path = scope["path"]
+        if path in UNLIMITED_PATHS or not path.startswith(LIMITED_PREFIXES):
+            return None
+        return "read" if scope["method"] in ("GET", "HEAD") else "write"
+
+    @staticmethod
+    def _client_key(scope) -> str:
+        client: Optional[Tuple[str, int]] = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _take_token(self, key: str) -> float:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.rate_burst)
+            if len(self.buckets) > MAX_TRACKED_CLIENTS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket.take(self.rate_limit, self.rate_burst)
+
+    @staticmethod
+    async def _reject(send, status: int, detail: str, retry_after: int):
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,9 +1,55 @@
+from fastapi import HTTPException, Request
 from sqlalchemy.orm import Session
-from ..db.session import SessionLocal
+from ..config import Config
+from ..db.session import SessionLocal, WriteSessionLocal
+from ..services.project_service import ProjectService
+from ..services.task_service import TaskService
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
+    finally:
+        db.close()
+
+def _open_session(request: Request) -> Session:
+    """
+    Open a read session for GET/HEAD requests and a write session otherwise
+    (on SQLite only writes take the write lock, see WriteSessionLocal).
+    """
+    writes = request.method not in ("GET", "HEAD") or (
+        # GET /tasks/next?claim=true claims tasks
+        request.query_params.get("claim", "").lower() in ("1", "true", "yes", "on")
+    )
+    return WriteSessionLocal() if writes else SessionLocal()
+
+def get_task_service(request: Request):
+    """Yield a TaskService on the configured storage backend (STORAGE_BACKEND)."""
+    if Config.STORAGE_BACKEND == "memory":
+        from ..infrastructure.memory_backend import (
+            InMemoryCategoryRepository, InMemoryTaskRepository, get_memory_store
+        )
+        store = get_memory_store()
+        yield TaskService(
+            None,
+            task_repo=InMemoryTaskRepository(store),
+            category_repo=InMemoryCategoryRepository(store)
+        )
+        return
+
+    db = _open_session(request)
+    try:
+        yield TaskService(db)
+    finally:
+        db.close()
+
+def get_project_service(request: Request):
+    """Yield a ProjectService (projects are only stored by the SQL backend)."""
+    if Config.STORAGE_BACKEND == "memory":
+        raise HTTPException(status_code=501, detail="Projects require STORAGE_BACKEND=sql")
+
+    db = _open_session(request)
+    try:
+        yield ProjectService(db)
     finally:
         db.close()
\ No newline at end of file
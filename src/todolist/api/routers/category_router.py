@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from typing import List
+
+from ..dependencies import get_task_service
+from ..schemas import CategoryStats
+from ...services.task_service import TaskService
+
+router = APIRouter(prefix="/categories", tags=["Categories"])
+
+@router.get("/stats", response_model=List[CategoryStats])
+def get_category_statistics(service: TaskService = Depends(get_task_service)):
+    """
+    Total, completed, pending and overdue task counts per category.
+    Served from the rollup cache when CATEGORY_STATS_CACHE is enabled.
+    """
+    return service.get_category_statistics()
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Literal, Optional
+
+from ..dependencies import get_project_service
+from ..schemas import ProjectCreate, ProjectResponse, TaskCreate, TaskResponse
+from ...repositories.base import QuotaExceededError
+from ...services.project_service import ProjectService
+
+router = APIRouter(prefix="/projects", tags=["Projects"])
+
+def _get_project_or_404(project_id: int, service: ProjectService):
+    project = service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+@router.get("/", response_model=List[ProjectResponse])
+def list_projects(service: ProjectService = Depends(get_project_service)):
+    return service.get_projects()
+
+@router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
+def create_project(project_in: ProjectCreate, service: ProjectService = Depends(get_project_service)):
+    """Create a project; 409 if the name is taken or MAX_PROJECTS is reached."""
+    try:
+        return service.create_project(name=project_in.name, description=project_in.description)
+    except (ValueError, QuotaExceededError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/{project_id}", response_model=ProjectResponse)
+def get_project(project_id: int, service: ProjectService = Depends(get_project_service)):
+    return _get_project_or_404(project_id, service)
+
+@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_project(project_id: int, service: ProjectService = Depends(get_project_service)):
+    success = service.delete_project(project_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+@router.get("/{project_id}/tasks", response_model=List[TaskResponse])
+def list_project_tasks(
+    project_id: int,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    completed: Optional[bool] = None,
+    q: Optional[str] = None,
+    overdue: Optional[bool] = None,
+    sort: Literal["default", "overdue"] = "default",
+    count: Literal["exact", "estimated", "none"] = "none",
+    service: ProjectService = Depends(get_project_service),
+):
+    """
+    List a project's tasks, with the same filters as GET /tasks.
+    `count=estimated` without filters returns the project's maintained
+    task count in `X-Total-Count`.
+    """
+    _get_project_or_404(project_id, service)
+    total = service.tasks.count_tasks(
+        completed=completed, search=q, overdue=overdue, mode=count, project_id=project_id
+    )
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return service.get_project_tasks(
+        project_id, skip=skip, limit=limit, completed=completed, search=q, overdue=overdue, sort=sort
+    )
+
+@router.post("/{project_id}/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+def create_project_task(
+    project_id: int,
+    task_in: TaskCreate,
+    response: Response,
+    service: ProjectService = Depends(get_project_service),
+):
+    """Create a task in a project; 409 once it holds MAX_TASKS_PER_PROJECT tasks."""
+    _get_project_or_404(project_id, service)
+    try:
+        task = service.create_project_task(
+            project_id,
+            title=task_in.title,
+            description=task_in.description,
+            due_date=task_in.due_date,
+            priority=task_in.priority,
+            category_name=task_in.category_name,
+        )
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    response.headers["ETag"] = f'"{task.version}"'
+    return task
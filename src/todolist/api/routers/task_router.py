@@ -1,66 +1,210 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from datetime import date
+from typing import List, Literal, Optional
 
-from ..dependencies import get_db
-from ..schemas import TaskCreate, TaskUpdate, TaskResponse, TaskStats
+from ..dependencies import get_task_service
+from ..schemas import TaskCreate, TaskUpdate, TaskResponse, TaskStats, TaskAnalytics, TaskHistoryEntry
+from ...config import Config
+from ...events.broker import broker
+from ...repositories.base import StaleVersionError
+from ...services.completion_batcher import CompletionTimeoutError
 from ...services.task_service import TaskService
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
-def get_task_service(db: Session = Depends(get_db)) -> TaskService:
-    return TaskService(db)
+def _set_etag(response: Response, task):
+    # The task version identifies its state; send it back in If-Match
+    response.headers["ETag"] = f'"{task.version}"'
+
+def _parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Version required by an If-Match header (None: no header or `*`)."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        # Not one of our ETags, so it can't match the current one
+        raise HTTPException(status_code=412, detail="Task has been modified")
+    return int(tag)
 
 @router.get("/", response_model=List[TaskResponse])
 def list_tasks(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     completed: Optional[bool] = None,
     q: Optional[str] = None,
+    overdue: Optional[bool] = None,
+    sort: Literal["default", "overdue"] = "default",
+    count: Literal["exact", "estimated", "none"] = "none",
     service: TaskService = Depends(get_task_service),
 ):
-    return service.get_tasks(skip=skip, limit=limit, completed=completed, search=q)
+    """
+    List tasks. With `count=estimated` (cheap, approximate) or `count=exact`
+    (a full COUNT with the same filters) the total number of matching tasks
+    is sent in the `X-Total-Count` header.
+    """
+    total = service.count_tasks(completed=completed, search=q, overdue=overdue, mode=count)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return service.get_tasks(
+        skip=skip, limit=limit, completed=completed, search=q, overdue=overdue, sort=sort
+    )
 
 @router.get("/stats", response_model=TaskStats)
 def get_statistics(service: TaskService = Depends(get_task_service)):
     return service.get_statistics()
 
+@router.get("/analytics", response_model=List[TaskAnalytics])
+def get_analytics(
+    bucket: Literal["day", "week"] = "day",
+    from_: Optional[date] = Query(None, alias="from"),
+    to: Optional[date] = None,
+    category_id: Optional[int] = None,
+    priority: Optional[int] = Query(None, ge=1, le=3),
+    service: TaskService = Depends(get_task_service),
+):
+    """
+    Tasks created and completed per day or week (UTC), category and priority.
+    `from`/`to` are inclusive and default to the last 30 days. Read from
+    incrementally maintained rollups (run analytics:backfill once for history).
+    """
+    if from_ and to and from_ > to:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+    return service.get_analytics(
+        bucket=bucket, start=from_, end=to, category_id=category_id, priority=priority
+    )
+
+@router.get("/next", response_model=List[TaskResponse])
+def get_next_tasks(
+    n: int = Query(1, ge=1, le=100),
+    claim: bool = False,
+    worker: Optional[str] = Query(None, max_length=100),
+    service: TaskService = Depends(get_task_service),
+):
+    """
+    Next open tasks to work on: highest priority first, then earliest due date.
+    With `claim=true` the tasks are claimed for `worker` (TASK_CLAIM_SECONDS) and
+    skipped by other callers until then, so concurrent workers get distinct tasks.
+    """
+    return service.get_next_tasks(n=n, claim=claim, worker=worker)
+
+@router.get("/stream")
+async def stream_task_events(request: Request):
+    """
+    Server-Sent Events feed of task changes (created, updated, completed, deleted),
+    including scheduler auto-closes. Slow consumers receive a `dropped` event
+    and are disconnected; they should reconnect and refetch.
+    """
+    subscription = broker.subscribe()
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if subscription.dropped:
+                    yield "event: dropped\ndata: {}\n\n"
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=Config.EVENT_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, service: TaskService = Depends(get_task_service)):
+def get_task(task_id: int, response: Response, service: TaskService = Depends(get_task_service)):
     task = service.get_task_by_id(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    _set_etag(response, task)
     return task
 
+@router.get("/{task_id}/history", response_model=List[TaskHistoryEntry])
+def get_task_history(
+    task_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    service: TaskService = Depends(get_task_service),
+):
+    """
+    Field-level change history of a task, newest first. Kept after the
+    task is deleted. Recorded asynchronously (AUDIT_LOG): an entry from
+    another process may show up a moment after its change.
+    """
+    history = service.get_task_history(task_id, limit=limit)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return history
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(task_in: TaskCreate, service: TaskService = Depends(get_task_service)):
-    return service.create_task(
+def create_task(task_in: TaskCreate, response: Response, service: TaskService = Depends(get_task_service)):
+    task = service.create_task(
         title=task_in.title,
         description=task_in.description,
         due_date=task_in.due_date,
         priority=task_in.priority,
         category_name=task_in.category_name,
     )
+    _set_etag(response, task)
+    return task
 
 @router.patch("/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, task_in: TaskUpdate, service: TaskService = Depends(get_task_service)):
-    task = service.update_task(
-        task_id=task_id,
-        title=task_in.title,
-        description=task_in.description,
-        due_date=task_in.due_date,
-        priority=task_in.priority,
-        category_name=task_in.category_name,
-    )
+def update_task(
+    task_id: int,
+    task_in: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: TaskService = Depends(get_task_service),
+):
+    """
+    Partial update. Send the ETag from a previous response as `If-Match`
+    to update only if nobody changed the task since (412 otherwise).
+    The check is part of the UPDATE itself; the task isn't read first.
+    """
+    try:
+        task = service.update_task(
+            task_id=task_id,
+            title=task_in.title,
+            description=task_in.description,
+            due_date=task_in.due_date,
+            priority=task_in.priority,
+            category_name=task_in.category_name,
+            expected_version=_parse_if_match(if_match),
+        )
+    except StaleVersionError:
+        raise HTTPException(status_code=412, detail="Task has been modified")
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    _set_etag(response, task)
     return task
 
 @router.patch("/{task_id}/complete", response_model=TaskResponse)
-def complete_task(task_id: int, service: TaskService = Depends(get_task_service)):
-    task = service.complete_task(task_id)
+def complete_task(task_id: int, response: Response, service: TaskService = Depends(get_task_service)):
+    try:
+        task = service.complete_task(task_id)
+    except CompletionTimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Completion is taking too long, retry later",
+            headers={"Retry-After": "1"}
+        )
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    _set_etag(response, task)
     return task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
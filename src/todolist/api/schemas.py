@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 class CategoryResponse(BaseModel):
@@ -29,16 +29,57 @@ class TaskUpdate(BaseModel):
 class TaskResponse(TaskBase):
     id: int
     is_completed: bool
+    is_overdue: bool = False
     created_at: datetime
     updated_at: Optional[datetime]
     completed_at: Optional[datetime] = None
+    claimed_by: Optional[str] = None
+    claimed_until: Optional[datetime] = None
+    version: int = 1
+    project_id: Optional[int] = None
     category: Optional[CategoryResponse] = None
 
     class Config:
         from_attributes = True
 
+class TaskHistoryEntry(BaseModel):
+    changed_at: datetime
+    version: Optional[int] = None
+    kind: str
+    source: str
+    changes: Dict[str, List[Any]] = Field(..., description="Changed fields as [old, new]")
+
+class ProjectCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    description: Optional[str] = Field(None, max_length=1000)
+
+class ProjectResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    task_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class TaskStats(BaseModel):
     total: int
     completed: int
     pending: int
-    overdue: int
\ No newline at end of file
+    overdue: int
+
+class CategoryStats(BaseModel):
+    id: int
+    name: str
+    total: int
+    completed: int
+    pending: int
+    overdue: int
+
+class TaskAnalytics(BaseModel):
+    bucket: date
+    category_id: Optional[int] = None
+    priority: int
+    created: int
+    completed: int
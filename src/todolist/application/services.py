@@ -1,7 +1,7 @@
 from typing import List, Optional
 from datetime import datetime
-from todolist.domain.models import Project, Task
-from todolist.infrastructure.repository import InMemoryRepository
+from src.todolist.infrastructure.records import Project, Task
+from src.todolist.infrastructure.repository import InMemoryRepository
 
 
 class ProjectService:
@@ -0,0 +1,4 @@
+from .log import AuditLog, audit_log
+from .writer import record_task_history
+
+__all__ = ['AuditLog', 'audit_log', 'record_task_history']
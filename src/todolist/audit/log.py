@@ -0,0 +1,206 @@
+import atexit
+import json
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Deque, Dict, List, Optional, Set
+from sqlalchemy import insert, text
+from sqlalchemy.exc import SQLAlchemyError
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.domain.models import TaskHistory
+
+# Pause before retrying a batch that couldn't be written
+RETRY_SECONDS = 1
+
+
+class AuditLog:
+    """
+    Buffers task history entries in memory and writes them to task_history
+    in batches from a background thread, so requests never wait for the
+    history INSERT.
+
+    The buffer is bounded: when it is full (the database is slow or down)
+    writers wait up to `enqueue_timeout` seconds for room, then the entry
+    is dropped and counted. Buffered entries are written on close(), which
+    also runs at interpreter exit.
+    """
+
+    def __init__(self, flush_ms: float, batch_size: int, buffer_size: int, enqueue_timeout: float):
+        """
+        Initialize the log (the writer thread starts with the first entry).
+
+        Args:
+            flush_ms: How long to collect entries before writing a batch
+            batch_size: Write as soon as this many entries are buffered
+            buffer_size: Maximum number of buffered entries
+            enqueue_timeout: How long add() waits for room in a full buffer
+        """
+        self.flush_seconds = flush_ms / 1000
+        self.batch_size = max(1, batch_size)
+        self.buffer_size = max(self.batch_size, buffer_size)
+        self.enqueue_timeout = enqueue_timeout
+        self.written = 0
+        self.dropped = 0
+        self._cond = threading.Condition()
+        self._buffer: Deque[dict] = deque()
+        self._writing: List[dict] = []
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._partitions: Set[date] = set()
+
+    def add(self, entries: List[dict]):
+        """
+        Queue history entries for writing.
+
+        Args:
+            entries: task_history rows
+        """
+        if not entries:
+            return
+        with self._cond:
+            closed = self._closed
+            if not closed:
+                self._enqueue(entries)
+        if closed:
+            # Shutting down: nobody will flush the buffer any more (written
+            # outside the lock, like every other database write)
+            self._write_now(entries)
+
+    def _enqueue(self, entries: List[dict]):
+        # Called with self._cond held
+        deadline = None
+        for entry in entries:
+            while len(self._buffer) >= self.buffer_size:
+                deadline = deadline or time.monotonic() + self.enqueue_timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                continue
+            self._buffer.append(entry)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        self._cond.notify_all()
+
+    def pending(self, task_id: int) -> List[dict]:
+        """Entries of a task that are not written yet."""
+        with self._cond:
+            return [
+                entry for entry in (*self._writing, *self._buffer)
+                if entry["task_id"] == task_id
+            ]
+
+    def stats(self) -> Dict[str, int]:
+        """Written, dropped and currently buffered entries."""
+        with self._cond:
+            return {
+                "written": self.written,
+                "dropped": self.dropped,
+                "buffered": len(self._buffer) + len(self._writing),
+            }
+
+    def close(self, timeout: float = 10):
+        """Write out buffered entries and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                if not self._buffer:
+                    return
+                deadline = time.monotonic() + self.flush_seconds
+                while len(self._buffer) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                count = min(self.batch_size, len(self._buffer))
+                self._writing = [self._buffer.popleft() for _ in range(count)]
+                # Room for writers waiting on a full buffer
+                self._cond.notify_all()
+                closed = self._closed
+
+            try:
+                self._write(self._writing)
+                written = len(self._writing)
+            except SQLAlchemyError as e:
+                timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{timestamp}] ❌ Error writing task history: {e}")
+                written = 0
+                if not closed:
+                    time.sleep(RETRY_SECONDS)
+
+            with self._cond:
+                if written:
+                    self.written += written
+                elif closed:
+                    self.dropped += len(self._writing)
+                else:
+                    # Keep the entries (in order) for the next attempt
+                    self._buffer.extendleft(reversed(self._writing))
+                self._writing = []
+
+    def _write_now(self, entries: List[dict]):
+        try:
+            self._write(entries)
+            written, dropped = len(entries), 0
+        except SQLAlchemyError:
+            written, dropped = 0, len(entries)
+        with self._cond:
+            self.written += written
+            self.dropped += dropped
+
+    def _write(self, entries: List[dict]):
+        db = WriteSessionLocal()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                self._ensure_partitions(db, {entry["changed_at"].date().replace(day=1) for entry in entries})
+            db.execute(insert(TaskHistory), entries)
+            db.commit()
+        finally:
+            db.close()
+
+    def _ensure_partitions(self, db, months: Set[date]):
+        """Create the monthly partitions of task_history the entries go to."""
+        for month in sorted(months - self._partitions):
+            next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+            try:
+                db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS task_history_{month:%Y_%m} "
+                    f"PARTITION OF task_history FOR VALUES FROM ('{month}') TO ('{next_month}')"
+                ))
+                db.commit()
+            except SQLAlchemyError:
+                # Another process created it concurrently
+                db.rollback()
+            self._partitions.add(month)
+
+
+def serialize_changes(changes: dict) -> str:
+    """JSON for TaskHistory.changes (datetimes as ISO strings)."""
+    return json.dumps(
+        changes,
+        default=lambda value: value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+    )
+
+
+# Shared by all sessions of the process
+audit_log = AuditLog(
+    Config.AUDIT_FLUSH_MS,
+    Config.AUDIT_BATCH_SIZE,
+    Config.AUDIT_BUFFER_SIZE,
+    Config.AUDIT_ENQUEUE_TIMEOUT_SECONDS
+)
@@ -0,0 +1,50 @@
+import uuid
+from datetime import datetime
+from typing import List
+from sqlalchemy.orm import Session
+from src.todolist.config import Config
+from src.todolist.events.changes import DIFF_IGNORED_ATTRIBUTES, TaskChange, on_commit
+from .log import audit_log, serialize_changes
+
+# Snapshot fields that aren't part of a created/deleted diff
+SNAPSHOT_IGNORED_FIELDS = ("id",) + DIFF_IGNORED_ATTRIBUTES
+
+
+def _diff(change: TaskChange) -> dict:
+    """{field: [old, new]} of a change."""
+    if change.kind in ("created", "deleted"):
+        fields = {
+            name: value for name, value in change.data.items()
+            if name not in SNAPSHOT_IGNORED_FIELDS and value is not None
+        }
+        if change.kind == "created":
+            return {name: [None, value] for name, value in fields.items()}
+        return {name: [value, None] for name, value in fields.items()}
+    if change.diff:
+        return change.diff
+    # Bulk statements only report the previous values of what they changed
+    return {name: [old, change.data.get(name)] for name, old in change.previous.items()}
+
+
+@on_commit
+def record_task_history(session: Session, changes: List[TaskChange]):
+    """
+    Hand committed task changes to the audit log. Only buffers them:
+    the history rows are written later, off the request path.
+    """
+    if not Config.AUDIT_LOG:
+        return
+
+    now = datetime.utcnow()
+    audit_log.add([
+        {
+            "id": uuid.uuid4().hex,
+            "changed_at": now,
+            "task_id": change.task_id,
+            "version": change.data.get("version"),
+            "kind": change.kind,
+            "source": change.source,
+            "changes": serialize_changes(_diff(change)),
+        }
+        for change in changes
+    ])
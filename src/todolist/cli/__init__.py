@@ -1,3 +1,17 @@
-from .scheduler_cli import handle_autoclose_command
+# Handlers are imported on access, so importing one CLI module doesn't
+# load the dependencies of all the others
+_HANDLERS = {
+    'handle_autoclose_command': '.scheduler_cli',
+    'handle_outbox_command': '.outbox_cli',
+    'handle_batch_command': '.batch_cli',
+}
 
-__all__ = ['handle_autoclose_command']
+
+def __getattr__(name):
+    if name in _HANDLERS:
+        from importlib import import_module
+        return getattr(import_module(_HANDLERS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['handle_autoclose_command', 'handle_outbox_command', 'handle_batch_command']
@@ -0,0 +1,178 @@
+import json
+import sys
+from typing import Iterable, List, Optional, TextIO
+from pydantic import ValidationError
+from src.todolist.api.schemas import TaskCreate, TaskResponse, TaskUpdate
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.repositories.base import DEFER_COMMIT_KEY
+from src.todolist.services.task_service import TaskService
+
+DEFAULT_COMMIT_EVERY = 100
+
+# Operations that need an existing task id
+ID_OPERATIONS = ("update", "complete", "delete", "show")
+
+
+class BatchRunner:
+    """
+    Runs JSON Lines task commands over a single session.
+
+    Each command runs in its own SAVEPOINT, so a failing command is rolled
+    back alone. The transaction is committed every `commit_every` commands;
+    results are written once the commands they describe are committed.
+    """
+
+    def __init__(self, db, output: TextIO, commit_every: int = DEFAULT_COMMIT_EVERY):
+        """
+        Initialize runner.
+
+        Args:
+            db: Database session (the runner owns its transaction)
+            output: Stream receiving one JSON result per command
+            commit_every: Number of commands per transaction
+        """
+        self.db = db
+        self.output = output
+        self.commit_every = max(1, commit_every)
+        self.service = TaskService(db)
+        self.pending: List[dict] = []
+        self.failed = 0
+
+        # Repositories flush instead of committing; commits happen per batch
+        self.db.info[DEFER_COMMIT_KEY] = True
+
+    def run(self, lines: Iterable[str]) -> int:
+        """
+        Run all commands.
+
+        Returns:
+            Number of failed commands
+        """
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            self.pending.append(self._execute(line_number, line))
+            if len(self.pending) >= self.commit_every:
+                self._commit()
+        self._commit()
+        return self.failed
+
+    def _execute(self, line_number: int, line: str) -> dict:
+        result = {"line": line_number}
+        try:
+            command = json.loads(line)
+            if not isinstance(command, dict):
+                raise ValueError("Command must be a JSON object")
+            result["op"] = command.get("op")
+            with self.db.begin_nested():
+                result.update(self._apply(command))
+            result["ok"] = True
+        except ValidationError as e:
+            result.update(ok=False, error=json.loads(e.json(include_url=False)))
+        except Exception as e:
+            result.update(ok=False, error=str(e) or e.__class__.__name__)
+        return result
+
+    def _apply(self, command: dict) -> dict:
+        op = command.get("op")
+        fields = {k: v for k, v in command.items() if k not in ("op", "id")}
+
+        if op == "create":
+            task = self.service.create_task(**TaskCreate(**fields).model_dump())
+            return {"task": self._serialize(task)}
+
+        if op not in ID_OPERATIONS:
+            raise ValueError(f"Unknown op: {op!r} (expected create, {', '.join(ID_OPERATIONS)})")
+        task_id = command.get("id")
+        if not isinstance(task_id, int):
+            raise ValueError(f"'{op}' requires an integer 'id'")
+
+        if op == "update":
+            update = TaskUpdate(**fields).model_dump(exclude_unset=True)
+            task = self.service.update_task(task_id, **update)
+        elif op == "complete":
+            task = self.service.complete_task(task_id)
+        elif op == "delete":
+            if not self.service.delete_task(task_id):
+                raise LookupError(f"Task {task_id} not found")
+            return {"id": task_id}
+        else:
+            task = self.service.get_task_by_id(task_id)
+
+        if task is None:
+            raise LookupError(f"Task {task_id} not found")
+        return {"task": self._serialize(task)}
+
+    @staticmethod
+    def _serialize(task) -> dict:
+        return TaskResponse.model_validate(task).model_dump(mode="json")
+
+    def _commit(self):
+        if not self.pending:
+            return
+        try:
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            # Nothing of this batch was stored
+            error = f"Batch commit failed: {e}"
+            for result in self.pending:
+                if result["ok"]:
+                    result.update(ok=False, error=error)
+                    result.pop("task", None)
+
+        for result in self.pending:
+            if not result["ok"]:
+                self.failed += 1
+            self.output.write(json.dumps(result) + "\n")
+        self.output.flush()
+        self.pending = []
+
+
+def handle_batch_command(args):
+    """
+    Handle the batch command.
+
+    Reads one JSON command per line and writes one JSON result per line:
+        {"op": "create", "title": "Write report", "priority": 3, "category_name": "work"}
+        {"op": "update", "id": 5, "due_date": "2025-01-31T18:00:00"}
+        {"op": "complete", "id": 5}
+        {"op": "delete", "id": 6}
+        {"op": "show", "id": 5}
+
+    Usage:
+        todolist batch [file]                     # Read commands from file (default: stdin)
+        todolist batch [file] --commit-every 500  # Commands per transaction (default: 100)
+
+    Args:
+        args: Command-line arguments
+    """
+    path: Optional[str] = None
+    commit_every = DEFAULT_COMMIT_EVERY
+
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == "--commit-every":
+            if not args or not args[0].isdigit() or int(args[0]) < 1:
+                print("❌ Usage: python main.py batch [file] --commit-every <n>", file=sys.stderr)
+                sys.exit(1)
+            commit_every = int(args.pop(0))
+        elif path is None:
+            path = arg
+        else:
+            print("❌ Usage: python main.py batch [file] [--commit-every <n>]", file=sys.stderr)
+            sys.exit(1)
+
+    source = sys.stdin if path in (None, "-") else open(path, encoding="utf-8")
+    db = WriteSessionLocal()
+    try:
+        failed = BatchRunner(db, sys.stdout, commit_every).run(source)
+    finally:
+        db.close()
+        if source is not sys.stdin:
+            source.close()
+
+    if failed:
+        print(f"⚠️  {failed} command(s) failed", file=sys.stderr)
+        sys.exit(1)
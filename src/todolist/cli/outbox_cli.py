@@ -0,0 +1,30 @@
+import sys
+from src.todolist.config import Config
+from src.todolist.outbox.dispatcher import OutboxDispatcher, run_dispatcher
+
+
+def handle_outbox_command(args):
+    """
+    Handle the outbox dispatch command.
+    
+    Usage:
+        todolist outbox:dispatch           # Deliver pending events once
+        todolist outbox:dispatch --daemon  # Deliver continuously
+        todolist outbox:dispatch -d        # Deliver continuously (short form)
+    
+    Args:
+        args: Command-line arguments
+    """
+    if not Config.WEBHOOK_URL:
+        print("❌ WEBHOOK_URL is not configured!")
+        sys.exit(1)
+    
+    if '--daemon' in args or '-d' in args:
+        try:
+            run_dispatcher()
+        except KeyboardInterrupt:
+            print("\n\n⏹️  Outbox dispatcher stopped by user.")
+            sys.exit(0)
+    else:
+        claimed = OutboxDispatcher().dispatch_once()
+        print(f"📮 Processed {claimed} outbox event(s)")
@@ -1,5 +1,5 @@
 import sys
-from src.todolist.db.session import SessionLocal
+from src.todolist.db.session import WriteSessionLocal
 from src.todolist.repositories.task_repository import TaskRepository
 from src.todolist.scheduler.tasks import run_scheduler, close_overdue_tasks
 
@@ -11,7 +11,7 @@ def run_autoclose_once():
     """
     print("🔍 Checking for overdue tasks...")
     
-    db = SessionLocal()
+    db = WriteSessionLocal()
     try:
         repo = TaskRepository(db)
         overdue_tasks = repo.get_overdue_tasks()
@@ -24,6 +24,9 @@ def run_autoclose_once():
         for task in overdue_tasks:
             print(f"  - [{task.id}] {task.title} (Due: {task.due_date})")
         
+        # Don't hold the (SQLite) write lock while waiting for the user
+        db.rollback()
+        
         # Ask for user confirmation
         confirm = input("\n❓ Do you want to close these tasks? (y/n): ")
         
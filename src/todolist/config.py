@@ -9,3 +9,87 @@ class Config:
 
     MAX_PROJECTS: int = int(os.getenv("MAX_NUMBER_OF_PROJECT", "5"))
     MAX_TASKS_PER_PROJECT: int = int(os.getenv("MAX_NUMBER_OF_TASK", "10"))
+
+    # Scheduler leader election (multi-replica daemons)
+    SCHEDULER_POLL_SECONDS: int = int(os.getenv("SCHEDULER_POLL_SECONDS", "5"))
+    SCHEDULER_LEASE_SECONDS: int = int(os.getenv("SCHEDULER_LEASE_SECONDS", "15"))
+
+    # Overdue auto-close schedule
+    AUTOCLOSE_INTERVAL_MINUTES: int = int(os.getenv("AUTOCLOSE_INTERVAL_MINUTES", "15"))
+    RUN_SCHEDULER_IN_API: bool = os.getenv("RUN_SCHEDULER_IN_API", "False").lower() in ("1", "true", "yes")
+
+    # Live task change feed (GET /tasks/stream)
+    EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+    EVENT_HEARTBEAT_SECONDS: int = int(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+    # Webhook delivery through the transactional outbox
+    WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")
+    WEBHOOK_TIMEOUT_SECONDS: int = int(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10"))
+    OUTBOX_ENABLED: bool = os.getenv("OUTBOX_ENABLED", str(bool(WEBHOOK_URL))).lower() in ("1", "true", "yes")
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+    OUTBOX_CONCURRENCY: int = int(os.getenv("OUTBOX_CONCURRENCY", "4"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    OUTBOX_BACKOFF_SECONDS: float = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "2"))
+    OUTBOX_MAX_BACKOFF_SECONDS: float = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "600"))
+    OUTBOX_POLL_SECONDS: float = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+    # How long a dispatcher owns the events it claimed (keep above WEBHOOK_TIMEOUT_SECONDS)
+    OUTBOX_LEASE_SECONDS: float = float(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+
+    # Purge of soft-deleted tasks (scheduler job): rows deleted more than
+    # PURGE_RETENTION_MINUTES ago are removed PURGE_BATCH_SIZE at a time, at most
+    # PURGE_ROWS_PER_SECOND (0 = no limit), only during PURGE_QUIET_HOURS
+    # (default "1-5" = 01:00-04:59 UTC, may wrap midnight; empty = any time)
+    PURGE_INTERVAL_MINUTES: int = int(os.getenv("PURGE_INTERVAL_MINUTES", "60"))
+    PURGE_RETENTION_MINUTES: int = int(os.getenv("PURGE_RETENTION_MINUTES", "1440"))
+    PURGE_BATCH_SIZE: int = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+    PURGE_ROWS_PER_SECOND: float = float(os.getenv("PURGE_ROWS_PER_SECOND", "1000"))
+    PURGE_QUIET_HOURS: str = os.getenv("PURGE_QUIET_HOURS", "1-5")
+    PURGE_MAX_RUN_SECONDS: float = float(os.getenv("PURGE_MAX_RUN_SECONDS", "60"))
+
+    # Work queue (GET /tasks/next?claim=true): how long a claim lasts
+    TASK_CLAIM_SECONDS: int = int(os.getenv("TASK_CLAIM_SECONDS", "300"))
+
+    # Per-category counts (GET /categories/stats) from an incrementally
+    # maintained rollup table; run categories:rebuild-stats after enabling
+    CATEGORY_STATS_CACHE: bool = os.getenv("CATEGORY_STATS_CACHE", "False").lower() in ("1", "true", "yes")
+
+    # Daily created/completed rollups behind GET /tasks/analytics;
+    # run analytics:backfill once to build the history
+    ANALYTICS_ROLLUPS: bool = os.getenv("ANALYTICS_ROLLUPS", "True").lower() in ("1", "true", "yes")
+
+    # Admission control (per process): concurrent reads/writes admitted, how many
+    # more may queue, and the pool checkout timeout that also caps the queue wait
+    ADMISSION_CONTROL: bool = os.getenv("ADMISSION_CONTROL", "True").lower() in ("1", "true", "yes")
+    ADMISSION_READ_LIMIT: int = int(os.getenv("ADMISSION_READ_LIMIT", "10"))
+    ADMISSION_WRITE_LIMIT: int = int(os.getenv("ADMISSION_WRITE_LIMIT", "5"))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "50"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+
+    # Per-client token bucket (0 = no rate limit)
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "20"))
+
+    # Share one execution among concurrent identical stats/list reads
+    SINGLE_FLIGHT: bool = os.getenv("SINGLE_FLIGHT", "True").lower() in ("1", "true", "yes")
+
+    # Group commit for task completions (0 = commit each request on its own)
+    COMPLETION_BATCH_MS: float = float(os.getenv("COMPLETION_BATCH_MS", "0"))
+    COMPLETION_BATCH_MAX: int = int(os.getenv("COMPLETION_BATCH_MAX", "500"))
+    # How long a request waits for its batch before answering 503
+    COMPLETION_BATCH_TIMEOUT_SECONDS: float = float(os.getenv("COMPLETION_BATCH_TIMEOUT_SECONDS", "5"))
+
+    # Task history (GET /tasks/{id}/history): changes are buffered in memory
+    # (at most AUDIT_BUFFER_SIZE entries) and written in batches off the request path
+    AUDIT_LOG: bool = os.getenv("AUDIT_LOG", "True").lower() in ("1", "true", "yes")
+    AUDIT_FLUSH_MS: float = float(os.getenv("AUDIT_FLUSH_MS", "500"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_BUFFER_SIZE: int = int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT_SECONDS", "1"))
+
+    # Storage backend: "sql" (SQLAlchemy) or "memory" (process-local, no database)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "sql").lower()
+
+    # Persistence of the in-memory backend (empty MEMORY_DATA_DIR = not persisted)
+    MEMORY_DATA_DIR: str = os.getenv("MEMORY_DATA_DIR", "")
+    MEMORY_SNAPSHOT_INTERVAL_SECONDS: float = float(os.getenv("MEMORY_SNAPSHOT_INTERVAL_SECONDS", "300"))
+    MEMORY_GROUP_COMMIT_MS: float = float(os.getenv("MEMORY_GROUP_COMMIT_MS", "2"))
@@ -1,8 +1,19 @@
-from .session import SessionLocal, engine, Base, get_db, check_database_connection
+from .session import SessionLocal, WriteSessionLocal, Base, get_db, get_engine, get_write_engine, check_database_connection
+
+
+def __getattr__(name):
+    # The engine is created on first access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'SessionLocal',
+    'WriteSessionLocal',
     'engine',
+    'get_engine',
+    'get_write_engine',
     'Base',
     'get_db',
     'check_database_connection'
@@ -1,40 +1,212 @@
+import itertools
 import os
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Database connection parameters with default values
-DB_USER = os.getenv("DB_USER", "postgres")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_NAME = os.getenv("DB_NAME", "todolist_db")
-
-# Construct database URL
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-# Create SQLAlchemy engine
-# echo=True: Print all SQL statements (useful for debugging)
-# pool_pre_ping=True: Verify connections before using them
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10
-)
+import threading
+from sqlalchemy import create_engine, event, func, text
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+
+# The engine is created on first use (see get_engine), so importing this
+# module - e.g. for the models - doesn't read .env or load a DB driver.
+_engine = None
+_write_engine = None
+_engine_lock = threading.Lock()
+
+# Execution option with the BEGIN mode of a SQLite transaction (set on the
+# engine used by write sessions, see WriteSessionLocal)
+SQLITE_BEGIN_MODE_OPTION = "sqlite_begin_mode"
+
+# Name of the SQL function that hands the values of a row, as an UPDATE's
+# WHERE clause sees them (before the change), back to Python on SQLite,
+# whose RETURNING only sees the new values. See capture_old_values.
+SQLITE_CAPTURE_FUNCTION = "capture_old_values"
+_captured_values = {}
+_capture_tokens = itertools.count()
+
+
+def _capture(token, *values):
+    _captured_values[token] = values
+    return 1
+
+
+def capture_old_values(*columns):
+    """
+    Return (token, condition): add the condition to a SQLite UPDATE's WHERE
+    clause, and after running it, pop_captured_values(token) returns the
+    values `columns` had before the update (None if no row matched).
+    """
+    token = next(_capture_tokens)
+    return token, getattr(func, SQLITE_CAPTURE_FUNCTION)(token, *columns) == 1
+
+
+def pop_captured_values(token):
+    """Return (and forget) the raw values captured under `token`, or None."""
+    return _captured_values.pop(token, None)
+
+
+def _load_environment():
+    # Load environment variables from .env file
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def get_database_url() -> str:
+    """
+    Return the database URL.
+    DATABASE_URL (e.g. sqlite:///todolist.db) overrides the DB_* parameters.
+    """
+    _load_environment()
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        return database_url
+
+    # Database connection parameters with default values
+    db_user = os.getenv("DB_USER", "postgres")
+    db_password = os.getenv("DB_PASSWORD", "postgres")
+    db_host = os.getenv("DB_HOST", "localhost")
+    db_port = os.getenv("DB_PORT", "5432")
+    db_name = os.getenv("DB_NAME", "todolist_db")
+    return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+
+def _configure_sqlite(engine, busy_timeout_ms: int):
+    """
+    Apply single-node tuning to every new SQLite connection.
+
+    WAL lets readers run concurrently with the (single) writer, and
+    synchronous=NORMAL only fsyncs at checkpoints, which is still safe
+    against corruption in WAL mode. pysqlite's own transaction handling is
+    turned off so SQLAlchemy emits BEGIN itself (needed for SAVEPOINTs and
+    for the configurable BEGIN mode).
+    """
+    cache_size_kb = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+        cursor.execute(f"PRAGMA cache_size=-{cache_size_kb}")
+        cursor.execute(f"PRAGMA mmap_size={mmap_size}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+        dbapi_connection.create_function(SQLITE_CAPTURE_FUNCTION, -1, _capture)
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        # Reads begin DEFERRED and so never take the write lock; write
+        # sessions carry their mode as an execution option
+        begin_mode = connection.get_execution_options().get(SQLITE_BEGIN_MODE_OPTION, "DEFERRED")
+        connection.exec_driver_sql(f"BEGIN {begin_mode}")
+
+
+def _create_engine():
+    database_url = get_database_url()
+    # Compiled SQL cache entries; each lambda-statement variant of the
+    # repositories' queries takes one (see SQLALCHEMY_QUERY_CACHE_SIZE)
+    query_cache_size = int(os.getenv("SQLALCHEMY_QUERY_CACHE_SIZE", "1200"))
+
+    # Create SQLAlchemy engine
+    # echo=True: Print all SQL statements (useful for debugging)
+    # pool_pre_ping=True: Verify connections before using them
+    if database_url.startswith("sqlite"):
+        busy_timeout_ms = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+        # Connections are shared across threadpool workers; the pool hands each
+        # one to a single thread at a time
+        engine = create_engine(
+            database_url,
+            echo=False,
+            query_cache_size=query_cache_size,
+            connect_args={"check_same_thread": False, "timeout": busy_timeout_ms / 1000}
+        )
+        _configure_sqlite(engine, busy_timeout_ms)
+        return engine
+
+    # pool_timeout: how long a request waits for a connection (the API's
+    # admission queue gives up after the same time, see api/admission.py)
+    return create_engine(
+        database_url,
+        echo=False,
+        query_cache_size=query_cache_size,
+        pool_pre_ping=True,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+    )
+
+
+def get_engine():
+    """
+    Return the application engine, creating it on first use.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine()
+    return _engine
+
+
+def get_write_engine():
+    """
+    Return the engine for sessions that write: the application engine
+    (same pool), with SQLite transactions beginning in SQLITE_BEGIN_MODE.
+
+    SQLite has a single writer, and a transaction that read before writing
+    can't be upgraded once another writer committed ("database is locked",
+    busy_timeout doesn't help). IMMEDIATE (the default) takes the write lock
+    at BEGIN, so writers queue on busy_timeout instead. DEFERRED suits a
+    single writer process.
+    """
+    global _write_engine
+    if _write_engine is None:
+        engine = get_engine()
+        with _engine_lock:
+            if _write_engine is None:
+                begin_mode = os.getenv("SQLITE_BEGIN_MODE", "IMMEDIATE").upper()
+                _write_engine = engine.execution_options(**{SQLITE_BEGIN_MODE_OPTION: begin_mode})
+    return _write_engine
+
+
+def __getattr__(name):
+    # `from src.todolist.db.session import engine` keeps working, lazily
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySession(Session):
+    """Session bound to the application engine unless told otherwise."""
+
+    def __init__(self, bind=None, **kwargs):
+        super().__init__(bind=bind or get_engine(), **kwargs)
+
+
+class LazyWriteSession(Session):
+    """Session bound to the write engine unless told otherwise."""
+
+    def __init__(self, bind=None, **kwargs):
+        super().__init__(bind=bind or get_write_engine(), **kwargs)
+
 
 # Create session factory
 # autocommit=False: Don't auto-commit transactions
 # autoflush=False: Don't auto-flush changes
-# bind=engine: Bind session to our database engine
+# class_=LazySession: Bind sessions to the engine, created with the first one
 SessionLocal = sessionmaker(
+    class_=LazySession,
+    autocommit=False,
+    autoflush=False
+)
+
+# Session factory for code paths that write (API writes, CLI, background jobs);
+# on SQLite their transactions take the write lock up front (SQLITE_BEGIN_MODE)
+WriteSessionLocal = sessionmaker(
+    class_=LazyWriteSession,
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
 )
 
 # Base class for all SQLAlchemy models
@@ -67,14 +239,24 @@ def check_database_connection():
     Prints connection status and database information.
     """
     try:
+        engine = get_engine()
         with engine.connect() as connection:
             # Execute a simple query to test connection
+            if engine.dialect.name == "sqlite":
+                version = connection.execute(text("SELECT sqlite_version();")).scalar()
+                journal_mode = connection.execute(text("PRAGMA journal_mode;")).scalar()
+
+                print("✅ Database connection successful!")
+                print(f"📊 Database: {engine.url.database}")
+                print(f"🔧 SQLite version: {version} (journal mode: {journal_mode})")
+                return
+
             result = connection.execute(text("SELECT version();"))
             version = result.fetchone()[0]
             
             print("✅ Database connection successful!")
-            print(f"📊 Database: {DB_NAME}")
-            print(f"🖥️  Host: {DB_HOST}:{DB_PORT}")
+            print(f"📊 Database: {engine.url.database}")
+            print(f"🖥️  Host: {engine.url.host}:{engine.url.port}")
             print(f"🔧 PostgreSQL version: {version.split(',')[0]}")
             
     except Exception as e:
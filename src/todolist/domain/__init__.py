@@ -1,3 +1,3 @@
-from .models import Task, Category
+from .models import Task, Category, Project, CategoryTaskCounts, TaskDailyStats, RollupBackfill, TaskHistory, SchedulerLease, OutboxEvent
 
-__all__ = ['Task', 'Category']
+__all__ = ['Task', 'Category', 'Project', 'CategoryTaskCounts', 'TaskDailyStats', 'RollupBackfill', 'TaskHistory', 'SchedulerLease', 'OutboxEvent']
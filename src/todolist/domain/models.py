@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, Boolean, Date, DateTime, ForeignKey, Index, and_
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from src.todolist.db.session import Base
 
@@ -33,6 +34,43 @@ class Category(Base):
         return f"<Category(id={self.id}, name='{self.name}')>"
 
 
+class Project(Base):
+    """
+    Project grouping tasks, with quotas (MAX_PROJECTS projects,
+    MAX_TASKS_PER_PROJECT tasks each).
+    """
+    __tablename__ = 'projects'
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    
+    # Project attributes
+    name = Column(String(100), unique=True, nullable=False, index=True)
+    description = Column(Text, nullable=True)
+    
+    # Number of tasks, maintained from task change events; the task quota is
+    # enforced by a conditional UPDATE of this counter, never by COUNT(*)
+    task_count = Column(Integer, default=0, server_default='0', nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    tasks = relationship(
+        "Task",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        # Tasks are never loaded to delete a project: ON DELETE CASCADE
+        # removes them (see ProjectRepository.delete for the rollups)
+        passive_deletes=True,
+        lazy="dynamic"
+    )
+    
+    def __repr__(self):
+        return f"<Project(id={self.id}, name='{self.name}')>"
+
+
 class Task(Base):
     """
     Task model representing a todo item.
@@ -55,23 +93,196 @@ class Task(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Foreign key
-    category_id = Column(Integer, ForeignKey('categories.id', ondelete='SET NULL'), nullable=True)
+    category_id = Column(Integer, ForeignKey('categories.id', ondelete='SET NULL'), nullable=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=True)
+    
+    # Work-queue claim: a worker owns the task until claimed_until
+    claimed_by = Column(String(100), nullable=True)
+    claimed_until = Column(DateTime, nullable=True)
+    
+    # Optimistic concurrency: UPDATEs are issued WHERE version = <loaded version>
+    # and bump it; a concurrent writer makes the flush raise StaleDataError
+    version = Column(Integer, default=1, server_default='1', nullable=False)
+    
+    # Soft delete: deleted tasks are hidden from ORM queries (see
+    # repositories.soft_delete) and purged later by the scheduler
+    deleted_at = Column(DateTime, nullable=True)
     
     # Relationships
     category = relationship("Category", back_populates="tasks")
+    project = relationship("Project", back_populates="tasks")
     
     # Composite indexes for common queries
     __table_args__ = (
         Index('idx_task_status_priority', 'is_completed', 'priority'),
         Index('idx_task_due_date_status', 'due_date', 'is_completed'),
+        # Partial index backing overdue filters: only open, live tasks are indexed
+        Index(
+            'idx_task_open_due_date', due_date,
+            postgresql_where=and_(is_completed == False, deleted_at.is_(None)),
+            sqlite_where=and_(is_completed == False, deleted_at.is_(None))
+        ),
+        # Purge queue: only soft-deleted tasks are indexed
+        Index(
+            'idx_task_deleted_at', deleted_at,
+            postgresql_where=deleted_at.isnot(None),
+            sqlite_where=deleted_at.isnot(None)
+        ),
+        # "Next up" work queue: open tasks by priority, then due date
+        Index('idx_task_next_up', is_completed, priority.desc(), due_date),
+        # Per-project listing and filters (also serve project_id lookups)
+        Index('idx_task_project_listing', project_id, is_completed, due_date),
+        Index('idx_task_project_priority', project_id, is_completed, priority),
     )
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', completed={self.is_completed})>"
     
-    @property
+    @hybrid_property
     def is_overdue(self):
         """Check if task is overdue."""
         if self.due_date and not self.is_completed:
             return datetime.utcnow() > self.due_date
         return False
+    
+    @is_overdue.expression
+    def is_overdue(cls):
+        """SQL form of is_overdue, usable in filters and ORDER BY."""
+        return cls.overdue_at(datetime.utcnow())
+    
+    @classmethod
+    def overdue_at(cls, now: datetime):
+        """
+        SQL condition for tasks overdue at `now`.
+        Use inside lambda statements (with `now` as a closure variable), where
+        is_overdue's clock value would be cached with the statement.
+        """
+        return and_(
+            cls.is_completed == False,
+            cls.due_date.isnot(None),
+            cls.due_date < now
+        )
+
+
+
+class CategoryTaskCounts(Base):
+    """
+    Cached task counts per category (CATEGORY_STATS_CACHE).
+    Maintained incrementally from task change events; overdue counts
+    depend on the clock and are always computed live.
+    """
+    __tablename__ = 'category_task_counts'
+    
+    category_id = Column(Integer, ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True)
+    total = Column(Integer, default=0, nullable=False)
+    completed = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<CategoryTaskCounts(category_id={self.category_id}, total={self.total})>"
+
+
+class TaskDailyStats(Base):
+    """
+    Tasks created and completed per day (UTC), category and priority.
+    Maintained incrementally from task change events (GET /tasks/analytics);
+    history is built with analytics:backfill.
+    """
+    __tablename__ = 'task_daily_stats'
+    
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True)  # 0 = no category; no FK, rows are plain counters
+    priority = Column(Integer, primary_key=True)
+    created = Column(Integer, default=0, nullable=False)
+    completed = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<TaskDailyStats(day={self.day}, category_id={self.category_id}, priority={self.priority})>"
+
+
+class RollupBackfill(Base):
+    """
+    Rollup tables whose history has been built (e.g. task_daily_stats by
+    analytics:backfill). Until then a rollup only counts changes made
+    since it was added, so it can't stand in for the tasks table.
+    """
+    __tablename__ = 'rollup_backfills'
+    
+    name = Column(String(100), primary_key=True)  # Table name of the rollup
+    backfilled_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<RollupBackfill(name='{self.name}', backfilled_at={self.backfilled_at})>"
+
+
+class TaskHistory(Base):
+    """
+    Append-only audit log of task changes with field-level diffs.
+    Written in batches by the audit writer after the change committed;
+    on PostgreSQL the table is partitioned by month of changed_at
+    (old history is removed by dropping partitions).
+    """
+    __tablename__ = 'task_history'
+    
+    # The partition key must be part of the primary key
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    changed_at = Column(DateTime, primary_key=True)
+    
+    task_id = Column(Integer, nullable=False)  # No FK: history outlives the task
+    version = Column(Integer, nullable=True)
+    kind = Column(String(20), nullable=False)  # created, updated, completed or deleted
+    source = Column(String(20), nullable=False)
+    changes = Column(Text, nullable=False)  # JSON: {field: [old, new]}
+    
+    __table_args__ = (
+        Index('idx_task_history_task_changed_at', 'task_id', 'changed_at'),
+        {'postgresql_partition_by': 'RANGE (changed_at)'},
+    )
+    
+    def __repr__(self):
+        return f"<TaskHistory(task_id={self.task_id}, kind='{self.kind}', changed_at={self.changed_at})>"
+
+
+class SchedulerLease(Base):
+    """
+    Leader lease for scheduler replicas.
+    Used on databases without advisory locks (e.g. SQLite).
+    """
+    __tablename__ = 'scheduler_leases'
+    
+    name = Column(String(100), primary_key=True)
+    holder = Column(String(200), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<SchedulerLease(name='{self.name}', holder='{self.holder}')>"
+
+
+
+class OutboxEvent(Base):
+    """
+    Task event waiting for webhook delivery.
+    Written in the same transaction as the task change (transactional outbox).
+    """
+    __tablename__ = 'outbox_events'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    task_id = Column(Integer, nullable=False)  # No FK: the task may be deleted before delivery
+    payload = Column(Text, nullable=False)  # JSON
+    
+    # Delivery state: pending -> delivered, or dead after OUTBOX_MAX_ATTEMPTS
+    status = Column(String(20), default='pending', nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    delivered_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+    
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, type='{self.event_type}', status='{self.status}')>"
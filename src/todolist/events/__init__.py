@@ -0,0 +1,12 @@
+from .broker import EventBroker, Subscription, broker
+from .changes import TaskChange, dispatch_task_changes, on_flush, on_commit
+
+__all__ = [
+    'EventBroker',
+    'Subscription',
+    'broker',
+    'TaskChange',
+    'dispatch_task_changes',
+    'on_flush',
+    'on_commit'
+]
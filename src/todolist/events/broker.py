@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from src.todolist.config import Config
+
+
+class Subscription:
+    """
+    A single event stream consumer.
+    Events are delivered into a bounded asyncio queue on the consumer's loop.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class EventBroker:
+    """
+    In-process pub/sub for task change events.
+
+    publish() is thread-safe and never blocks: events are handed to each
+    subscriber's event loop. A subscriber whose queue is full is dropped
+    instead of buffering without limit; it should reconnect and refetch.
+    """
+
+    def __init__(self, queue_size: int = None):
+        """
+        Initialize broker.
+
+        Args:
+            queue_size: Max buffered events per subscriber (default: EVENT_QUEUE_SIZE)
+        """
+        self.queue_size = queue_size or Config.EVENT_QUEUE_SIZE
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """
+        Register a new subscriber. Must be called from a running event loop.
+
+        Returns:
+            Subscription with its own bounded queue
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a subscriber. Safe to call more than once.
+        """
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: dict):
+        """
+        Deliver an event to all subscribers. Callable from any thread.
+
+        Args:
+            event: JSON-serializable event payload
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(self._offer, subscription, event)
+            except RuntimeError:
+                # Subscriber's event loop is closed
+                self.unsubscribe(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _offer(self, subscription: Subscription, event: dict):
+        if subscription.dropped:
+            return
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop it rather than buffer without limit
+            subscription.dropped = True
+            self.unsubscribe(subscription)
+
+
+# Process-wide broker used by the API and the in-process scheduler
+broker = EventBroker()
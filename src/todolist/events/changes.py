@@ -0,0 +1,217 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+from src.todolist.domain.models import Task
+from .broker import broker
+
+# Postgres NOTIFY channel carrying task change events between processes
+NOTIFY_CHANNEL = "task_events"
+
+# session.info keys
+CHANGES_KEY = "task_changes"
+CHANGE_SOURCE_KEY = "change_source"
+SAVEPOINTS_KEY = "task_change_savepoints"
+
+
+# Attributes whose value before an update is reported in TaskChange.previous
+PREVIOUS_VALUE_ATTRIBUTES = ("is_completed", "category_id", "project_id", "priority", "due_date", "completed_at")
+
+# Bookkeeping columns left out of TaskChange.diff
+DIFF_IGNORED_ATTRIBUTES = ("updated_at", "version")
+
+
+@dataclass
+class TaskChange:
+    """
+    A single task change (created, updated, completed or deleted),
+    collected from a session flush or reported by a bulk statement.
+    For updates, `previous` holds the old values of the changed
+    PREVIOUS_VALUE_ATTRIBUTES (used by rollups to move counts around), and
+    `diff` maps every changed column to [old, new] (flushed updates only;
+    used by the audit log).
+    """
+    kind: str
+    task_id: int
+    source: str = "api"
+    data: dict = field(default_factory=dict)
+    previous: dict = field(default_factory=dict)
+    diff: dict = field(default_factory=dict)
+
+    def to_event(self) -> dict:
+        """Serialize as a JSON-compatible event payload."""
+        return {
+            "type": f"task.{self.kind}",
+            "task_id": self.task_id,
+            "source": self.source,
+            "task": self.data,
+        }
+
+
+def task_snapshot(task) -> dict:
+    """
+    Small JSON-compatible snapshot of a task, used as event payload.
+    """
+    def iso(value: datetime):
+        return value.isoformat() if value else None
+
+    return {
+        "id": task.id,
+        "title": task.title,
+        "priority": task.priority,
+        "is_completed": task.is_completed,
+        "due_date": iso(task.due_date),
+        "completed_at": iso(task.completed_at),
+        "category_id": task.category_id,
+        "project_id": getattr(task, "project_id", None),  # In-memory records have no project
+        "created_at": iso(task.created_at),
+        "updated_at": iso(task.updated_at),
+        "version": task.version,
+    }
+
+
+# Listeners called inside the transaction, right after the flush
+_flush_listeners: List[Callable[[Session, List[TaskChange]], None]] = []
+
+# Listeners called after the transaction has committed
+_commit_listeners: List[Callable[[Session, List[TaskChange]], None]] = []
+
+
+def on_flush(listener: Callable[[Session, List[TaskChange]], None]):
+    """Register a listener run inside the transaction (may emit SQL)."""
+    _flush_listeners.append(listener)
+    return listener
+
+
+def on_commit(listener: Callable[[Session, List[TaskChange]], None]):
+    """Register a listener run once the changes are committed (must not emit SQL)."""
+    _commit_listeners.append(listener)
+    return listener
+
+
+def dispatch_task_changes(session: Session, changes: List[TaskChange]):
+    """
+    Hand task changes to all listeners.
+    Called automatically on flush; bulk UPDATE/DELETE statements that bypass
+    the unit of work must call it themselves, before committing.
+
+    Args:
+        session: Session whose transaction contains the changes
+        changes: Changes to dispatch
+    """
+    if not changes:
+        return
+    for listener in _flush_listeners:
+        listener(session, changes)
+    session.info.setdefault(CHANGES_KEY, []).extend(changes)
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+# active_history: load the old value when these attributes are set, even if
+# it was expired, so the flush can always report it in TaskChange.previous
+for _name in PREVIOUS_VALUE_ATTRIBUTES:
+    event.listen(getattr(Task, _name), "set", _load_old_value, active_history=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_task_changes(session: Session, flush_context):
+    source = session.info.get(CHANGE_SOURCE_KEY, "api")
+    changes = []
+
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changes.append(TaskChange("created", obj.id, source, task_snapshot(obj)))
+
+    for obj in session.dirty:
+        if isinstance(obj, Task) and session.is_modified(obj, include_collections=False):
+            state = inspect(obj)
+            attrs = state.attrs
+            completed = attrs.is_completed.history.added
+            kind = "completed" if completed and completed[0] else "updated"
+            previous = {}
+            for name in PREVIOUS_VALUE_ATTRIBUTES:
+                history = attrs[name].history
+                if history.added and history.deleted:
+                    previous[name] = history.deleted[0]
+            diff = {}
+            for column in state.mapper.column_attrs:
+                if column.key in DIFF_IGNORED_ATTRIBUTES:
+                    continue
+                history = attrs[column.key].history
+                if history.added:
+                    old = history.deleted[0] if history.deleted else None
+                    if old != history.added[0]:
+                        diff[column.key] = [old, history.added[0]]
+            changes.append(TaskChange(kind, obj.id, source, task_snapshot(obj), previous, diff))
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            changes.append(TaskChange("deleted", obj.id, source, task_snapshot(obj)))
+
+    dispatch_task_changes(session, changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session: Session):
+    changes = session.info.pop(CHANGES_KEY, None)
+    if changes:
+        for listener in _commit_listeners:
+            listener(session, changes)
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _mark_savepoint(session: Session, transaction):
+    # Remember how many changes preceded a SAVEPOINT (begin_nested), so
+    # rolling back to it drops only the changes made since
+    if transaction.nested:
+        marks = session.info.setdefault(SAVEPOINTS_KEY, {})
+        marks[transaction] = len(session.info.get(CHANGES_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    savepoint = session.get_nested_transaction()
+    if savepoint is None:
+        session.info.pop(CHANGES_KEY, None)
+        session.info.pop(SAVEPOINTS_KEY, None)
+        return
+    mark = session.info.get(SAVEPOINTS_KEY, {}).pop(savepoint, None)
+    if mark is not None and CHANGES_KEY in session.info:
+        del session.info[CHANGES_KEY][mark:]
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_savepoint(session: Session, transaction):
+    if transaction.nested:
+        session.info.get(SAVEPOINTS_KEY, {}).pop(transaction, None)
+
+
+def _is_postgres(session: Session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+@on_flush
+def _notify_postgres(session: Session, changes: List[TaskChange]):
+    # NOTIFY is transactional: listeners in every process receive it on commit
+    if not _is_postgres(session):
+        return
+    connection = session.connection()
+    for change in changes:
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": json.dumps(change.to_event())}
+        )
+
+
+@on_commit
+def _publish_local(session: Session, changes: List[TaskChange]):
+    # Without LISTEN/NOTIFY, deliver to subscribers in this process only
+    if _is_postgres(session):
+        return
+    for change in changes:
+        broker.publish(change.to_event())
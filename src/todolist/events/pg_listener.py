@@ -0,0 +1,78 @@
+import json
+import select
+import threading
+import time
+from datetime import datetime
+from src.todolist.db.session import get_engine
+from .broker import EventBroker
+from .changes import NOTIFY_CHANNEL
+
+
+class PostgresListener:
+    """
+    Relays Postgres NOTIFY task events into an in-process broker.
+
+    Runs on a background thread with a dedicated connection, so events
+    written by any process (other API replicas, the scheduler daemon)
+    reach the subscribers of this one.
+    """
+
+    def __init__(self, broker: EventBroker, channel: str = NOTIFY_CHANNEL):
+        """
+        Initialize listener.
+
+        Args:
+            broker: Broker to publish received events to
+            channel: NOTIFY channel name
+        """
+        self.broker = broker
+        self.channel = channel
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start listening in a background thread."""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="task-events-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop listening and wait for the thread to exit."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                # Detach from the pool: this connection is switched to
+                # autocommit and kept busy with LISTEN for its whole life
+                connection = get_engine().raw_connection()
+                connection.detach()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"LISTEN {self.channel}")
+
+                while not self._stopping.is_set():
+                    readable, _, _ = select.select([dbapi_connection], [], [], 1.0)
+                    if not readable:
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notify = dbapi_connection.notifies.pop(0)
+                        self.broker.publish(json.loads(notify.payload))
+
+            except Exception as e:
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{timestamp}] ❌ Task event listener error: {e}")
+                time.sleep(1)  # Reconnect after a short pause
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
@@ -0,0 +1,479 @@
+import heapq
+import itertools
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.todolist.config import Config
+from src.todolist.events.broker import broker
+from src.todolist.events.changes import TaskChange, task_snapshot
+from src.todolist.infrastructure.persistence import StorePersistence
+from src.todolist.infrastructure.records import CategoryRecord, TaskRecord
+from src.todolist.repositories.base import StaleVersionError
+
+
+class InMemoryStore:
+    """Process-local storage for tasks and categories.
+
+    Shared by InMemoryTaskRepository and InMemoryCategoryRepository.
+    Writers serialize on `lock`; readers take no lock.
+
+    With a journal attached (see StorePersistence), writers log each change
+    while holding the lock and wait for it to be durable after releasing it,
+    so concurrent writers share group-committed fsyncs.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[int, TaskRecord] = {}
+        self.categories: Dict[int, CategoryRecord] = {}
+        self.categories_by_name: Dict[str, CategoryRecord] = {}
+        self.next_task_id: int = 1
+        self.next_category_id: int = 1
+        self.lock = threading.RLock()
+        self.journal = None
+
+    def persist_task(self, task: TaskRecord) -> int:
+        return self.journal.log_task(task) if self.journal else 0
+
+    def persist_task_deletion(self, task_id: int) -> int:
+        return self.journal.log_task_deletion(task_id) if self.journal else 0
+
+    def persist_category(self, category: CategoryRecord) -> int:
+        return self.journal.log_category(category) if self.journal else 0
+
+    def persist_category_deletion(self, category_id: int) -> int:
+        return self.journal.log_category_deletion(category_id) if self.journal else 0
+
+    def sync(self, lsn: int):
+        """Wait until the change logged as `lsn` is on disk."""
+        if self.journal and lsn:
+            self.journal.log.wait_durable(lsn)
+
+
+_store: Optional[InMemoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_memory_store() -> InMemoryStore:
+    """
+    Return the process-wide store used when STORAGE_BACKEND=memory.
+    Recovered from and persisted to MEMORY_DATA_DIR when it is set.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = InMemoryStore()
+                if Config.MEMORY_DATA_DIR:
+                    StorePersistence(store, Config.MEMORY_DATA_DIR).open()
+                _store = store
+    return _store
+
+
+def close_memory_store():
+    """Snapshot and close the process-wide store's journal, if any."""
+    if _store is not None and _store.journal is not None:
+        _store.journal.close()
+
+
+def _publish(kind: str, task: TaskRecord, source: str = "api"):
+    # No transactions here: a change is visible as soon as it is made
+    broker.publish(TaskChange(kind, task.id, source, task_snapshot(task)).to_event())
+
+
+class InMemoryTaskRepository:
+    """Drop-in replacement for TaskRepository backed by InMemoryStore."""
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    # BaseRepository interface
+
+    def get_by_id(self, id: int) -> Optional[TaskRecord]:
+        return self.store.tasks.get(id)
+
+    def get_all(self) -> List[TaskRecord]:
+        return list(self.store.tasks.values())
+
+    def create(self, **kwargs) -> TaskRecord:
+        """Create a task. Accepts the same fields as the Task model."""
+        with self.store.lock:
+            category_id = kwargs.pop("category_id", None)
+            kwargs.pop("project_id", None)  # No projects in this backend
+            category = self.store.categories.get(category_id) if category_id else None
+            task = TaskRecord(self.store.next_task_id, category=category, **kwargs)
+            self.store.tasks[task.id] = task
+            self.store.next_task_id += 1
+            lsn = self.store.persist_task(task)
+        self.store.sync(lsn)
+        _publish("created", task)
+        return task
+
+    def update(self, id: int, expected_version: Optional[int] = None, **kwargs) -> Optional[TaskRecord]:
+        with self.store.lock:
+            task = self.store.tasks.get(id)
+            if task is None:
+                return None
+            if expected_version is not None and task.version != expected_version:
+                raise StaleVersionError(f"Task {id} has changed")
+            completed = kwargs.get("is_completed") and not task.is_completed
+            for key, value in kwargs.items():
+                if hasattr(task, key):
+                    setattr(task, key, value)
+            if "category_id" in kwargs:
+                task.category = self.store.categories.get(task.category_id)
+            task.updated_at = datetime.utcnow()
+            task.version += 1
+            lsn = self.store.persist_task(task)
+        self.store.sync(lsn)
+        _publish("completed" if completed else "updated", task)
+        return task
+
+    def delete(self, id: int) -> bool:
+        with self.store.lock:
+            task = self.store.tasks.pop(id, None)
+            if task is None:
+                return False
+            lsn = self.store.persist_task_deletion(id)
+        self.store.sync(lsn)
+        _publish("deleted", task)
+        return True
+
+    def count(self) -> int:
+        return len(self.store.tasks)
+
+    # TaskRepository interface
+
+    def get_all_with_category(self) -> List[TaskRecord]:
+        return self.get_all()
+
+    def get_by_id_with_category(self, task_id: int) -> Optional[TaskRecord]:
+        return self.get_by_id(task_id)
+
+    def get_by_status(self, is_completed: bool) -> List[TaskRecord]:
+        return [t for t in self.get_all() if t.is_completed == is_completed]
+
+    def get_by_priority(self, priority: int) -> List[TaskRecord]:
+        return [t for t in self.get_all() if t.priority == priority]
+
+    def get_by_category(self, category_id: int) -> List[TaskRecord]:
+        return [t for t in self.get_all() if t.category_id == category_id]
+
+    def get_overdue_tasks(self) -> List[TaskRecord]:
+        return [t for t in self.get_all() if t.is_overdue]
+
+    def search_tasks(self, keyword: str) -> List[TaskRecord]:
+        return [t for t in self.get_all() if self._matches(t, keyword.lower())]
+
+    def mark_as_completed(self, task_id: int) -> Optional[TaskRecord]:
+        with self.store.lock:
+            task = self.store.tasks.get(task_id)
+            if task is None or task.is_completed:
+                return task
+            self._complete(task)
+            lsn = self.store.persist_task(task)
+        self.store.sync(lsn)
+        _publish("completed", task)
+        return task
+
+    def mark_overdue_as_closed(self) -> int:
+        with self.store.lock:
+            overdue_tasks = self.get_overdue_tasks()
+            lsn = 0
+            for task in overdue_tasks:
+                self._complete(task)
+                lsn = self.store.persist_task(task)
+        self.store.sync(lsn)
+        for task in overdue_tasks:
+            _publish("completed", task, source="scheduler")
+        return len(overdue_tasks)
+
+    def get_statistics(self) -> dict:
+        tasks = self.get_all()
+        completed = sum(1 for t in tasks if t.is_completed)
+        return {
+            'total': len(tasks),
+            'completed': completed,
+            'pending': len(tasks) - completed,
+            'overdue': sum(1 for t in tasks if t.is_overdue)
+        }
+
+    def get_tasks(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        completed: Optional[bool] = None,
+        search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        sort: str = "default",
+        project_id: Optional[int] = None,
+    ) -> List[TaskRecord]:
+        """Same filters and ordering as TaskRepository.get_tasks."""
+        if project_id is not None:
+            return []  # No projects in this backend
+        keyword = search.lower() if search else None
+        tasks = (
+            t for t in self.get_all()
+            if (completed is None or t.is_completed == completed)
+            and (overdue is None or t.is_overdue == overdue)
+            and (keyword is None or self._matches(t, keyword))
+        )
+
+        def order(t: TaskRecord) -> Tuple:
+            return (
+                not t.is_overdue if sort == "overdue" else False,
+                t.is_completed,
+                t.due_date is None,
+                t.due_date or datetime.min,
+                -t.id,
+            )
+
+        # Partial sort: only the first skip+limit rows are ever ordered
+        return heapq.nsmallest(skip + limit, tasks, key=order)[skip:]
+
+    def count_tasks(
+        self,
+        completed: Optional[bool] = None,
+        search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        project_id: Optional[int] = None,
+    ) -> int:
+        """Same filters as get_tasks."""
+        if project_id is not None:
+            return 0
+        keyword = search.lower() if search else None
+        return sum(
+            1 for t in self.get_all()
+            if (completed is None or t.is_completed == completed)
+            and (overdue is None or t.is_overdue == overdue)
+            and (keyword is None or self._matches(t, keyword))
+        )
+
+    def estimate_task_count(
+        self,
+        completed: Optional[bool] = None,
+        search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        project_id: Optional[int] = None,
+    ) -> int:
+        """Counting in memory is cheap, so the estimate is exact."""
+        return self.count_tasks(completed=completed, search=search, overdue=overdue, project_id=project_id)
+
+    def get_next_tasks(
+        self,
+        n: int,
+        claim_by: Optional[str] = None,
+        claim_seconds: int = 300,
+    ) -> List[TaskRecord]:
+        """Same ordering and claim semantics as TaskRepository.get_next_tasks."""
+        if claim_by is None:
+            return self._next_open(n, datetime.utcnow())
+
+        with self.store.lock:
+            now = datetime.utcnow()
+            tasks = self._next_open(n, now)
+            for task in tasks:
+                task.claimed_by = claim_by
+                task.claimed_until = now + timedelta(seconds=claim_seconds)
+                task.version += 1
+        for task in tasks:
+            _publish("updated", task)
+        return tasks
+
+    def _next_open(self, n: int, now: datetime) -> List[TaskRecord]:
+        return heapq.nsmallest(
+            n,
+            (
+                t for t in self.get_all()
+                if not t.is_completed and (t.claimed_until is None or t.claimed_until <= now)
+            ),
+            key=lambda t: (-t.priority, t.due_date is None, t.due_date or datetime.min)
+        )
+
+    def iter_tasks(
+        self,
+        status: Optional[str] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> Iterator[TaskRecord]:
+        """Same filters and ID ordering as TaskRepository.iter_tasks."""
+        tasks = (
+            t for t in sorted(self.get_all(), key=lambda t: t.id)
+            if status is None
+            or (status == "pending" and not t.is_completed)
+            or (status == "completed" and t.is_completed)
+            or (status == "overdue" and t.is_overdue)
+        )
+        return itertools.islice(tasks, skip, None if limit is None else skip + limit)
+
+    def get_history(self, task_id: int, limit: int = 100) -> List[dict]:
+        """Task history isn't recorded by this backend."""
+        return []
+
+    def get_daily_stats(
+        self,
+        start: date,
+        end: date,
+        category_id: Optional[int] = None,
+        priority: Optional[int] = None,
+    ) -> List[dict]:
+        """Same result as TaskRepository.get_daily_stats, counted live (no rollup to maintain)."""
+        counts: Dict[Tuple[date, int, int], List[int]] = {}
+
+        def add(moment: Optional[datetime], task: TaskRecord, index: int):
+            if moment is None or not start <= moment.date() <= end:
+                return
+            key = (moment.date(), task.category_id or 0, task.priority)
+            counts.setdefault(key, [0, 0])[index] += 1
+
+        for task in self.get_all():
+            if category_id is not None and task.category_id != category_id:
+                continue
+            if priority is not None and task.priority != priority:
+                continue
+            add(task.created_at, task, 0)
+            if task.is_completed:
+                add(task.completed_at, task, 1)
+
+        return [
+            {
+                'day': day,
+                'category_id': category or None,
+                'priority': task_priority,
+                'created': created,
+                'completed': completed
+            }
+            for (day, category, task_priority), (created, completed) in sorted(counts.items())
+        ]
+
+    @staticmethod
+    def _matches(task: TaskRecord, keyword: str) -> bool:
+        return keyword in task.title.lower() or (
+            task.description is not None and keyword in task.description.lower()
+        )
+
+    @staticmethod
+    def _complete(task: TaskRecord):
+        now = datetime.utcnow()
+        task.is_completed = True
+        task.completed_at = now
+        task.updated_at = now
+        task.version += 1
+
+
+class InMemoryCategoryRepository:
+    """Drop-in replacement for CategoryRepository backed by InMemoryStore."""
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def get_by_id(self, id: int) -> Optional[CategoryRecord]:
+        return self.store.categories.get(id)
+
+    def get_all(self) -> List[CategoryRecord]:
+        return list(self.store.categories.values())
+
+    def create(self, name: str, description: str = None) -> CategoryRecord:
+        """
+        Raises:
+            ValueError: If the category name already exists
+        """
+        with self.store.lock:
+            if name in self.store.categories_by_name:
+                raise ValueError("Category name already exists")
+            category, lsn = self._add(name, description)
+        self.store.sync(lsn)
+        return category
+
+    def _add(self, name: str, description: str = None):
+        """Add a new category; the caller holds the store lock and syncs the returned LSN."""
+        category = CategoryRecord(self.store.next_category_id, name, description)
+        self.store.categories[category.id] = category
+        self.store.categories_by_name[name] = category
+        self.store.next_category_id += 1
+        return category, self.store.persist_category(category)
+
+    def update(self, id: int, **kwargs) -> Optional[CategoryRecord]:
+        """
+        Raises:
+            ValueError: If the new name already exists
+        """
+        with self.store.lock:
+            category = self.store.categories.get(id)
+            if category is None:
+                return None
+            name = kwargs.get("name")
+            if name is not None and name != category.name:
+                if name in self.store.categories_by_name:
+                    raise ValueError("Category name already exists")
+                del self.store.categories_by_name[category.name]
+                self.store.categories_by_name[name] = category
+            for key, value in kwargs.items():
+                if hasattr(category, key):
+                    setattr(category, key, value)
+            category.updated_at = datetime.utcnow()
+            lsn = self.store.persist_category(category)
+        self.store.sync(lsn)
+        return category
+
+    def delete(self, id: int) -> bool:
+        """Delete a category and its tasks (same cascade as the Category model)."""
+        with self.store.lock:
+            category = self.store.categories.pop(id, None)
+            if category is None:
+                return False
+            del self.store.categories_by_name[category.name]
+            tasks = [t for t in self.store.tasks.values() if t.category_id == id]
+            for task in tasks:
+                del self.store.tasks[task.id]
+            lsn = self.store.persist_category_deletion(id)
+        self.store.sync(lsn)
+        for task in tasks:
+            _publish("deleted", task)
+        return True
+
+    def count(self) -> int:
+        return len(self.store.categories)
+
+    def get_by_name(self, name: str) -> Optional[CategoryRecord]:
+        return self.store.categories_by_name.get(name)
+
+    def get_or_create(self, name: str, description: str = None) -> CategoryRecord:
+        with self.store.lock:
+            category = self.get_by_name(name)
+            if category:
+                return category
+            category, lsn = self._add(name, description)
+        # Wait for the disk after releasing the lock, like every other write
+        self.store.sync(lsn)
+        return category
+
+    def get_statistics(self, cached: bool = False) -> List[dict]:
+        """Same result as CategoryRepository.get_statistics (there is nothing to cache)."""
+        counts: Dict[int, List[int]] = {}
+        for task in list(self.store.tasks.values()):
+            if task.category_id is None:
+                continue
+            row = counts.setdefault(task.category_id, [0, 0, 0])
+            row[0] += 1
+            row[1] += task.is_completed
+            row[2] += task.is_overdue
+        stats = []
+        for category in sorted(self.get_all(), key=lambda c: c.name):
+            total, completed, overdue = counts.get(category.id, (0, 0, 0))
+            stats.append({
+                'id': category.id,
+                'name': category.name,
+                'total': total,
+                'completed': completed,
+                'pending': total - completed,
+                'overdue': overdue
+            })
+        return stats
+
+    def get_with_task_count(self) -> List[Tuple[CategoryRecord, int]]:
+        counts: Dict[int, int] = {}
+        for task in list(self.store.tasks.values()):
+            if task.category_id is not None:
+                counts[task.category_id] = counts.get(task.category_id, 0) + 1
+        return [(c, counts.get(c.id, 0)) for c in self.get_all()]
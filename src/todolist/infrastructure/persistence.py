@@ -0,0 +1,580 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+from src.todolist.config import Config
+from src.todolist.infrastructure.records import CategoryRecord, TaskRecord
+
+# Datetimes are stored as microseconds since the Unix epoch (naive UTC)
+EPOCH = datetime(1970, 1, 1)
+NULL_TS = -(2 ** 63)
+
+# Log record: lsn, payload length, crc32(payload), then the JSON payload
+LOG_RECORD = struct.Struct("<QII")
+
+# Snapshot: header, fixed-size category and task tables, then a string heap
+SNAPSHOT_MAGIC = b"TDSNAP02"
+SNAPSHOT_MAGIC_V1 = b"TDSNAP01"
+SNAPSHOT_HEADER = struct.Struct("<8sQQQQQQ")
+# id, created_at, updated_at, name (offset, length), description (offset, length or -1)
+CATEGORY_ROW = struct.Struct("<IqqQIQi")
+# id, priority, is_completed, category_id (0 = none), due_date, completed_at,
+# created_at, updated_at, title (offset, length), description (offset, length or -1), version
+TASK_ROW = struct.Struct("<IBBIqqqqQIQiI")
+# Version 1 snapshots: the same without version
+TASK_ROW_V1 = struct.Struct("<IBBIqqqqQIQi")
+
+
+def _to_ts(value: Optional[datetime]) -> int:
+    if value is None:
+        return NULL_TS
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_ts(value: int) -> Optional[datetime]:
+    # Positional timedelta(days, seconds, microseconds) is the fastest form
+    return None if value == NULL_TS else EPOCH + timedelta(0, 0, value)
+
+
+def encode_task(task: TaskRecord) -> list:
+    return [
+        task.id, task.title, task.description, task.priority, task.is_completed,
+        task.category_id, _to_ts(task.due_date), _to_ts(task.completed_at),
+        _to_ts(task.created_at), _to_ts(task.updated_at), task.version,
+    ]
+
+
+def encode_category(category: CategoryRecord) -> list:
+    return [
+        category.id, category.name, category.description,
+        _to_ts(category.created_at), _to_ts(category.updated_at),
+    ]
+
+
+def _new_task(id, title, description, priority, is_completed, category, due, completed, created, updated,
+              version=1):
+    # Bypass __init__: restored records keep their stored timestamps
+    task = TaskRecord.__new__(TaskRecord)
+    task.id = id
+    task.title = title
+    task.description = description
+    task.priority = priority
+    task.is_completed = bool(is_completed)
+    task.category = category
+    task.category_id = category.id if category else None
+    task.due_date = _from_ts(due)
+    task.completed_at = _from_ts(completed)
+    task.created_at = _from_ts(created)
+    task.updated_at = _from_ts(updated)
+    # Work-queue claims are short leases and are not persisted
+    task.claimed_by = None
+    task.claimed_until = None
+    task.version = version
+    return task
+
+
+def _new_category(id, name, description, created, updated):
+    category = CategoryRecord.__new__(CategoryRecord)
+    category.id = id
+    category.name = name
+    category.description = description
+    category.created_at = _from_ts(created)
+    category.updated_at = _from_ts(updated)
+    return category
+
+
+class OperationLog:
+    """Append-only operation log with group commit.
+
+    append() writes a record and returns its LSN without waiting for disk.
+    A background thread fsyncs at most once per `group_commit_ms`, so all
+    writers that wait_durable() in the same window share a single fsync.
+    The fsync runs without holding the log's condition, so appends (made
+    under the store lock) never wait for the disk.
+    The log is split into segments named by their first LSN; rotate()
+    starts a new one so older segments can be dropped after a snapshot.
+    """
+
+    def __init__(self, directory: str, last_lsn: int, group_commit_ms: float):
+        self.directory = directory
+        self.lsn = last_lsn
+        self.durable_lsn = last_lsn
+        self.group_commit_seconds = group_commit_ms / 1000
+        self._cond = threading.Condition()
+        # Serializes fsyncs; taken before _cond, never while holding it
+        self._sync_lock = threading.Lock()
+        self._closed = False
+        self._file = self._open_segment(last_lsn + 1)
+        # Segments replaced by rotate(), fsynced and closed by the next _sync()
+        self._retired = []
+        self._thread = threading.Thread(target=self._run, name="oplog-group-commit", daemon=True)
+        self._thread.start()
+
+    def append(self, op: dict) -> int:
+        """Append an operation; returns its LSN."""
+        payload = json.dumps(op, separators=(",", ":")).encode("utf-8")
+        with self._cond:
+            self.lsn += 1
+            self._file.write(LOG_RECORD.pack(self.lsn, len(payload), zlib.crc32(payload)) + payload)
+            self._cond.notify_all()
+            return self.lsn
+
+    def wait_durable(self, lsn: int):
+        """Block until the record with this LSN is fsynced."""
+        with self._cond:
+            while self.durable_lsn < lsn and not self._closed:
+                self._cond.wait()
+
+    def rotate(self) -> int:
+        """
+        Start a new segment; returns the last LSN of the previous ones.
+        The previous segment is fsynced by the next group commit.
+        """
+        with self._cond:
+            self._retired.append(self._file)
+            self._file = self._open_segment(self.lsn + 1)
+            self._cond.notify_all()
+            return self.lsn
+
+    def close(self):
+        self._sync()
+        with self._sync_lock, self._cond:
+            self._closed = True
+            for f in self._retired:
+                f.close()
+            self._file.close()
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+
+    def _open_segment(self, first_lsn: int):
+        return open(os.path.join(self.directory, f"oplog.{first_lsn:020d}.log"), "ab")
+
+    def _sync(self):
+        with self._sync_lock:
+            with self._cond:
+                if self._closed or (self.durable_lsn == self.lsn and not self._retired):
+                    return
+                lsn = self.lsn
+                files = self._retired + [self._file]
+                self._retired = []
+                for f in files:
+                    f.flush()
+            # Appends carry on into the current segment meanwhile
+            for f in files:
+                os.fsync(f.fileno())
+            for f in files[:-1]:
+                f.close()
+            with self._cond:
+                self.durable_lsn = max(self.durable_lsn, lsn)
+                self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self.durable_lsn == self.lsn and not self._retired and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            # Let concurrent writers join this commit
+            time.sleep(self.group_commit_seconds)
+            self._sync()
+
+    @staticmethod
+    def segments(directory: str) -> List[Tuple[int, str]]:
+        """List (first_lsn, path) of all log segments, oldest first."""
+        result = []
+        for name in os.listdir(directory):
+            if name.startswith("oplog.") and name.endswith(".log"):
+                result.append((int(name.split(".")[1]), os.path.join(directory, name)))
+        return sorted(result)
+
+    @staticmethod
+    def replay(directory: str, after_lsn: int) -> Iterator[Tuple[int, dict]]:
+        """
+        Yield (lsn, op) for every logged operation after `after_lsn`.
+        A torn record at the end of a segment (crash mid-write) ends that
+        segment and is truncated away.
+        """
+        for _, path in OperationLog.segments(directory):
+            with open(path, "rb") as f:
+                data = f.read()
+            pos = 0
+            while pos + LOG_RECORD.size <= len(data):
+                lsn, length, crc = LOG_RECORD.unpack_from(data, pos)
+                payload = data[pos + LOG_RECORD.size:pos + LOG_RECORD.size + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                pos += LOG_RECORD.size + length
+                if lsn > after_lsn:
+                    yield lsn, json.loads(payload)
+            if pos < len(data):
+                os.truncate(path, pos)
+
+
+def write_snapshot(path: str, last_lsn: int, next_task_id: int, next_category_id: int,
+                   categories: List[CategoryRecord], tasks: List[TaskRecord]):
+    """Write a compact binary snapshot atomically (temp file + rename)."""
+    heap = bytearray()
+
+    def put_text(value: Optional[str]) -> Tuple[int, int]:
+        if value is None:
+            return 0, -1
+        data = value.encode("utf-8")
+        offset = len(heap)
+        heap.extend(data)
+        return offset, len(data)
+
+    category_rows = bytearray()
+    for c in categories:
+        name_off, name_len = put_text(c.name)
+        desc_off, desc_len = put_text(c.description)
+        category_rows += CATEGORY_ROW.pack(
+            c.id, _to_ts(c.created_at), _to_ts(c.updated_at), name_off, name_len, desc_off, desc_len
+        )
+
+    task_rows = bytearray()
+    for t in tasks:
+        title_off, title_len = put_text(t.title)
+        desc_off, desc_len = put_text(t.description)
+        task_rows += TASK_ROW.pack(
+            t.id, t.priority, t.is_completed, t.category_id or 0,
+            _to_ts(t.due_date), _to_ts(t.completed_at), _to_ts(t.created_at), _to_ts(t.updated_at),
+            title_off, title_len, desc_off, desc_len, t.version
+        )
+
+    heap_offset = SNAPSHOT_HEADER.size + len(category_rows) + len(task_rows)
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, last_lsn, next_task_id, next_category_id,
+        len(categories), len(tasks), heap_offset
+    )
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(category_rows)
+        f.write(task_rows)
+        f.write(heap)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SnapshotTasks(dict):
+    """
+    Task table restored from a snapshot.
+
+    Loading reads only the task IDs; each TaskRecord (its strings and
+    timestamps) is built from the memory-mapped row the first time it is
+    looked up, so a restart doesn't pay for records nobody has read yet.
+    Iterating the table builds the remaining records; the map is then
+    released and the table behaves like a plain dict.
+
+    Records are built under an internal lock, so the store's readers can
+    keep reading without the store lock. A full build takes the lock for
+    BUILD_CHUNK_ROWS rows at a time, so writers aren't stalled meanwhile.
+    """
+
+    BUILD_CHUNK_ROWS = 10_000
+
+    def __init__(self, mm: mmap.mmap, rows_offset: int, row: struct.Struct, heap_offset: int,
+                 categories: dict, pending: dict):
+        super().__init__()
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._rows_offset = rows_offset
+        self._row = row
+        self._heap_offset = heap_offset
+        self._categories = categories
+        # ID -> row number of the records not built yet
+        self._pending = pending
+        self._row_count = len(pending)
+        self._lock = threading.Lock()
+        if not pending:
+            self._release()
+
+    def _text(self, offset: int, length: int) -> Optional[str]:
+        if length < 0:
+            return None
+        start = self._heap_offset + offset
+        return str(self._view[start:start + length], "utf-8")
+
+    def _build(self, row: tuple) -> TaskRecord:
+        (tid, priority, is_completed, category_id, due, completed, created, updated,
+         title_off, title_len, desc_off, desc_len, *version) = row
+        return _new_task(
+            tid, self._text(title_off, title_len), self._text(desc_off, desc_len), priority, is_completed,
+            self._categories.get(category_id) if category_id else None, due, completed, created, updated,
+            *version
+        )
+
+    def _build_one(self, tid: int):
+        with self._lock:
+            row_number = self._pending.pop(tid, None)
+            if row_number is not None:
+                row = self._row.unpack_from(self._view, self._rows_offset + row_number * self._row.size)
+                dict.__setitem__(self, tid, self._build(row))
+                if not self._pending:
+                    self._release()
+
+    def _build_all(self):
+        size = self._row.size
+        for first in range(0, self._row_count, self.BUILD_CHUNK_ROWS):
+            with self._lock:
+                if not self._pending:
+                    return
+                last = min(first + self.BUILD_CHUNK_ROWS, self._row_count)
+                rows = self._view[self._rows_offset + first * size:self._rows_offset + last * size]
+                for row in self._row.iter_unpack(rows):
+                    if self._pending.pop(row[0], None) is not None:
+                        dict.__setitem__(self, row[0], self._build(row))
+                rows.release()
+                if not self._pending:
+                    self._release()
+
+    def _release(self):
+        if self._mm is not None:
+            self._view.release()
+            self._mm.close()
+            self._mm = self._view = None
+
+    def __missing__(self, tid):
+        if self._pending:
+            self._build_one(tid)
+            if dict.__contains__(self, tid):
+                return dict.__getitem__(self, tid)
+        raise KeyError(tid)
+
+    def get(self, tid, default=None):
+        record = dict.get(self, tid)
+        if record is None and self._pending:
+            self._build_one(tid)
+            record = dict.get(self, tid)
+        return default if record is None else record
+
+    def __contains__(self, tid) -> bool:
+        return dict.__contains__(self, tid) or tid in self._pending
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._pending)
+
+    def __setitem__(self, tid, record):
+        if self._pending:
+            with self._lock:
+                dict.__setitem__(self, tid, record)
+                if self._pending.pop(tid, None) is not None and not self._pending:
+                    self._release()
+        else:
+            dict.__setitem__(self, tid, record)
+
+    def __delitem__(self, tid):
+        if self._pending:
+            self._build_one(tid)
+        dict.__delitem__(self, tid)
+
+    def pop(self, tid, *default):
+        if self._pending:
+            self._build_one(tid)
+        return dict.pop(self, tid, *default)
+
+    def __iter__(self):
+        if self._pending:
+            self._build_all()
+        return dict.__iter__(self)
+
+    def keys(self):
+        if self._pending:
+            self._build_all()
+        return dict.keys(self)
+
+    def values(self):
+        if self._pending:
+            self._build_all()
+        return dict.values(self)
+
+    def items(self):
+        if self._pending:
+            self._build_all()
+        return dict.items(self)
+
+
+def load_snapshot(path: str, store) -> int:
+    """
+    Load a snapshot into an empty store through a read-only memory map.
+    Categories are loaded at once; tasks are built on first use (see
+    SnapshotTasks), so loading only reads the task IDs.
+
+    Returns:
+        LSN of the last operation contained in the snapshot
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    try:
+        magic, last_lsn, next_task_id, next_category_id, n_categories, n_tasks, heap = \
+            SNAPSHOT_HEADER.unpack_from(view, 0)
+        if magic not in (SNAPSHOT_MAGIC, SNAPSHOT_MAGIC_V1):
+            raise ValueError(f"Not a task store snapshot: {path}")
+        task_row = TASK_ROW if magic == SNAPSHOT_MAGIC else TASK_ROW_V1
+
+        def text(offset: int, length: int) -> Optional[str]:
+            if length < 0:
+                return None
+            return str(view[heap + offset:heap + offset + length], "utf-8")
+
+        pos = SNAPSHOT_HEADER.size
+        end = pos + n_categories * CATEGORY_ROW.size
+        categories = store.categories
+        for cid, created, updated, name_off, name_len, desc_off, desc_len in CATEGORY_ROW.iter_unpack(view[pos:end]):
+            category = _new_category(cid, text(name_off, name_len), text(desc_off, desc_len), created, updated)
+            categories[cid] = category
+            store.categories_by_name[category.name] = category
+
+        pos, end = end, end + n_tasks * task_row.size
+        # Only the leading ID of each row is unpacked here
+        task_ids = struct.Struct(f"<I{task_row.size - 4}x")
+        pending = {tid: row_number for row_number, (tid,) in enumerate(task_ids.iter_unpack(view[pos:end]))}
+    except BaseException:
+        view.release()
+        mm.close()
+        raise
+    view.release()
+    store.tasks = SnapshotTasks(mm, pos, task_row, heap, store.categories, pending)
+
+    store.next_task_id = next_task_id
+    store.next_category_id = next_category_id
+    return last_lsn
+
+
+def apply_operation(store, op: dict):
+    """Re-apply a logged operation. Operations are idempotent full-state upserts/deletes."""
+    kind = op["o"]
+    if kind == "t":
+        # Records logged before versioning have no trailing version
+        tid, title, description, priority, is_completed, category_id, due, completed, created, updated, \
+            *version = op["r"]
+        category = store.categories.get(category_id) if category_id else None
+        store.tasks[tid] = _new_task(
+            tid, title, description, priority, is_completed, category, due, completed, created, updated,
+            *version
+        )
+        store.next_task_id = max(store.next_task_id, tid + 1)
+    elif kind == "td":
+        store.tasks.pop(op["id"], None)
+    elif kind == "c":
+        cid, name, description, created, updated = op["r"]
+        previous = store.categories.get(cid)
+        category = _new_category(cid, name, description, created, updated)
+        store.categories[cid] = category
+        if previous is not None:
+            # Category update: re-link its tasks to the new record
+            store.categories_by_name.pop(previous.name, None)
+            for task in store.tasks.values():
+                if task.category_id == cid:
+                    task.category = category
+        store.categories_by_name[name] = category
+        store.next_category_id = max(store.next_category_id, cid + 1)
+    elif kind == "cd":
+        category = store.categories.pop(op["id"], None)
+        if category is not None:
+            store.categories_by_name.pop(category.name, None)
+            # Same cascade as InMemoryCategoryRepository.delete
+            for tid in [t.id for t in store.tasks.values() if t.category_id == category.id]:
+                del store.tasks[tid]
+
+
+class StorePersistence:
+    """Makes an InMemoryStore durable.
+
+    Every write is appended to an operation log (group-committed fsync).
+    A background thread periodically writes a binary snapshot and drops the
+    log segments it covers. Recovery loads the latest snapshot through a
+    memory map and replays only the log tail after it.
+
+    Snapshots are fuzzy: the state is captured without blocking writers
+    for the whole write-out, which is safe because every logged operation
+    is an idempotent full-state upsert or delete that is replayed anyway.
+    """
+
+    SNAPSHOT_FILE = "snapshot.bin"
+
+    def __init__(self, store, directory: str, snapshot_interval_seconds: float = None,
+                 group_commit_ms: float = None):
+        self.store = store
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval_seconds or Config.MEMORY_SNAPSHOT_INTERVAL_SECONDS
+        self.group_commit_ms = group_commit_ms if group_commit_ms is not None else Config.MEMORY_GROUP_COMMIT_MS
+        self.log: Optional[OperationLog] = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, self.SNAPSHOT_FILE)
+
+    def open(self):
+        """Recover the store from disk and start logging."""
+        os.makedirs(self.directory, exist_ok=True)
+        last_lsn = 0
+        if os.path.exists(self.snapshot_path):
+            last_lsn = load_snapshot(self.snapshot_path, self.store)
+        for lsn, op in OperationLog.replay(self.directory, last_lsn):
+            apply_operation(self.store, op)
+            last_lsn = lsn
+
+        self.log = OperationLog(self.directory, last_lsn, self.group_commit_ms)
+        self.store.journal = self
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="store-snapshots", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Write a final snapshot and close the log."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.snapshot()
+        self.log.close()
+        self.store.journal = None
+
+    def snapshot(self):
+        """Write a snapshot and drop the log segments it covers."""
+        # Every operation up to last_lsn was applied before it was logged,
+        # so the state captured next contains them all
+        last_lsn = self.log.rotate()
+        with self.store.lock:
+            categories = list(self.store.categories.values())
+            tasks = list(self.store.tasks.values())
+            next_task_id = self.store.next_task_id
+            next_category_id = self.store.next_category_id
+
+        write_snapshot(self.snapshot_path, last_lsn, next_task_id, next_category_id, categories, tasks)
+
+        for first_lsn, path in OperationLog.segments(self.directory):
+            if first_lsn <= last_lsn:
+                os.remove(path)
+
+    def log_task(self, task: TaskRecord) -> int:
+        return self.log.append({"o": "t", "r": encode_task(task)})
+
+    def log_task_deletion(self, task_id: int) -> int:
+        return self.log.append({"o": "td", "id": task_id})
+
+    def log_category(self, category: CategoryRecord) -> int:
+        return self.log.append({"o": "c", "r": encode_category(category)})
+
+    def log_category_deletion(self, category_id: int) -> int:
+        return self.log.append({"o": "cd", "id": category_id})
+
+    def _run(self):
+        while not self._stopping.wait(self.snapshot_interval):
+            try:
+                self.snapshot()
+            except OSError as e:
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{timestamp}] ❌ Snapshot failed: {e}")
@@ -0,0 +1,119 @@
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Optional
+
+
+class TaskStatus(str, Enum):
+    """Status of a task in a project."""
+
+    TODO = "todo"
+    DOING = "doing"
+    DONE = "done"
+
+
+class Task:
+    """In-memory task record belonging to a project."""
+
+    __slots__ = ("id", "title", "description", "status", "deadline")
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        description: str = "",
+        status: TaskStatus = TaskStatus.TODO,
+        deadline: Optional[datetime] = None,
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.deadline = deadline
+
+    def __repr__(self):
+        return f"<Task(id={self.id}, title='{self.title}', status={self.status.value})>"
+
+
+class Project:
+    """In-memory project record.
+
+    Tasks are kept in a dict keyed by task ID. IDs are never reused, so
+    insertion order is ID order and listing needs no sort.
+    """
+
+    __slots__ = ("id", "name", "description", "tasks")
+
+    def __init__(self, id: int, name: str, description: str = ""):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.tasks: Dict[int, Task] = {}
+
+    def __repr__(self):
+        return f"<Project(id={self.id}, name='{self.name}')>"
+
+
+class CategoryRecord:
+    """In-memory counterpart of the Category model."""
+
+    __slots__ = ("id", "name", "description", "created_at", "updated_at")
+
+    def __init__(self, id: int, name: str, description: Optional[str] = None):
+        now = datetime.utcnow()
+        self.id = id
+        self.name = name
+        self.description = description
+        self.created_at = now
+        self.updated_at = now
+
+    def __repr__(self):
+        return f"<Category(id={self.id}, name='{self.name}')>"
+
+
+class TaskRecord:
+    """In-memory counterpart of the Task model.
+
+    Exposes the same attributes as the SQLAlchemy model, so services,
+    API schemas and the CLI work on either backend.
+    """
+
+    __slots__ = (
+        "id", "title", "description", "priority", "is_completed",
+        "due_date", "completed_at", "created_at", "updated_at",
+        "category_id", "category", "claimed_by", "claimed_until", "version",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        description: Optional[str] = None,
+        priority: int = 2,
+        due_date: Optional[datetime] = None,
+        category: Optional[CategoryRecord] = None,
+    ):
+        now = datetime.utcnow()
+        self.id = id
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.is_completed = False
+        self.due_date = due_date
+        self.completed_at = None
+        self.created_at = now
+        self.updated_at = now
+        self.category = category
+        self.category_id = category.id if category else None
+        self.claimed_by = None
+        self.claimed_until = None
+        self.version = 1
+
+    @property
+    def is_overdue(self) -> bool:
+        """Check if task is overdue."""
+        if self.due_date and not self.is_completed:
+            return datetime.utcnow() > self.due_date
+        return False
+
+    def __repr__(self):
+        return f"<Task(id={self.id}, title='{self.title}', completed={self.is_completed})>"
@@ -1,16 +1,26 @@
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from src.todolist.domain.models import Project, Task, TaskStatus
+from src.todolist.infrastructure.records import Project, Task, TaskStatus
 from src.todolist.config import Config
 
 
 class InMemoryRepository:
-    """In-memory storage implementation for projects and tasks."""
+    """In-memory storage implementation for projects and tasks.
+
+    Every lookup goes through a dict index, so operations are O(1)
+    (or O(k) in the number of tasks of one project for cascades and
+    listing). IDs are never reused, so insertion-ordered dicts keep
+    projects and tasks in ID order without sorting.
+    """
 
     def __init__(self):
         self.projects: Dict[int, Project] = {}
         self.next_project_id: int = 1
         self.next_task_id: int = 1
+        # Secondary indexes
+        self._projects_by_name: Dict[str, Project] = {}
+        self._tasks_by_id: Dict[int, Tuple[Project, Task]] = {}
 
     def create_project(self, name: str, description: str = "") -> Project:
         """Create a new project.
@@ -27,10 +37,11 @@ class InMemoryRepository:
         """
         if len(self.projects) >= Config.MAX_PROJECTS:
             raise ValueError("Max projects limit reached")
-        if any(p.name == name for p in self.projects.values()):
+        if name in self._projects_by_name:
             raise ValueError("Project name already exists")
         project = Project(self.next_project_id, name, description)
-        self.projects[self.next_project_id] = project
+        self.projects[project.id] = project
+        self._projects_by_name[name] = project
         self.next_project_id += 1
         return project
 
@@ -70,10 +81,11 @@ class InMemoryRepository:
         if name:
             if len(name.split()) > 30:
                 raise ValueError("Name exceeds 30 words")
-            if any(
-                p.name == name and p.id != project_id for p in self.projects.values()
-            ):
+            existing = self._projects_by_name.get(name)
+            if existing is not None and existing.id != project_id:
                 raise ValueError("Project name already exists")
+            del self._projects_by_name[project.name]
+            self._projects_by_name[name] = project
             project.name = name
         if description:
             if len(description.split()) > 150:
@@ -90,10 +102,13 @@ class InMemoryRepository:
         Returns:
             True if deleted, False otherwise.
         """
-        if project_id in self.projects:
-            del self.projects[project_id]
-            return True
-        return False
+        project = self.projects.pop(project_id, None)
+        if project is None:
+            return False
+        del self._projects_by_name[project.name]
+        for task_id in project.tasks:
+            del self._tasks_by_id[task_id]
+        return True
 
     def list_projects(self) -> List[Project]:
         """List all projects.
@@ -101,7 +116,7 @@ class InMemoryRepository:
         Returns:
             List of all projects.
         """
-        return sorted(list(self.projects.values()), key=lambda p: p.id)
+        return list(self.projects.values())
 
     def add_task_to_project(
         self,
@@ -136,7 +151,8 @@ class InMemoryRepository:
         except ValueError:
             raise ValueError("Invalid task status")
         task = Task(self.next_task_id, title, description, task_status, deadline)
-        project.tasks.append(task)
+        project.tasks[task.id] = task
+        self._tasks_by_id[task.id] = (project, task)
         self.next_task_id += 1
         return task
 
@@ -150,10 +166,10 @@ class InMemoryRepository:
         Returns:
             The task if found, else None.
         """
-        project = self.get_project(project_id)
-        if not project:
+        entry = self._tasks_by_id.get(task_id)
+        if entry is None or entry[0].id != project_id:
             return None
-        return next((t for t in project.tasks if t.id == task_id), None)
+        return entry[1]
 
     def update_task(
         self,
@@ -212,14 +228,13 @@ class InMemoryRepository:
         Returns:
             True if deleted, False otherwise.
         """
-        project = self.get_project(project_id)
-        if not project:
+        entry = self._tasks_by_id.get(task_id)
+        if entry is None or entry[0].id != project_id:
             return False
-        task = self.get_task(project_id, task_id)
-        if task:
-            project.tasks.remove(task)
-            return True
-        return False
+        project, _ = entry
+        del project.tasks[task_id]
+        del self._tasks_by_id[task_id]
+        return True
 
     def list_tasks(self, project_id: int) -> List[Task]:
         """List all tasks for a project.
@@ -231,4 +246,146 @@ class InMemoryRepository:
             List of tasks if project found, else empty list.
         """
         project = self.get_project(project_id)
-        return sorted(project.tasks, key=lambda t: t.id) if project else []
+        return list(project.tasks.values()) if project else []
+
+
+def _copy_values(mapping: dict) -> list:
+    # list(dict.values()) copies in a single C call, so under the GIL no
+    # writer runs in the middle of it. A garbage-collector finalizer can
+    # still switch threads mid-copy; a resize is then detected and retried.
+    while True:
+        try:
+            return list(mapping.values())
+        except RuntimeError:
+            continue
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """Thread-safe InMemoryRepository, e.g. for use behind a thread pool.
+
+    Writers lock one of `stripes` locks chosen by project ID, so writes to
+    different projects run in parallel; project create/rename/delete also
+    take a global lock (always before a stripe lock). Dicts are mutated in
+    place, so a write is O(1). Reads never lock: single-entry reads are one
+    dict operation, listings copy a dict in one call (see _copy_values),
+    and updated tasks are replaced rather than mutated, so a reader never
+    sees a half-applied update.
+    """
+
+    def __init__(self, stripes: int = 16):
+        super().__init__()
+        self._global_lock = threading.Lock()
+        self._id_lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+
+    def _stripe(self, project_id: int) -> threading.Lock:
+        return self._stripes[project_id % len(self._stripes)]
+
+    def _allocate_task_id(self) -> int:
+        with self._id_lock:
+            task_id = self.next_task_id
+            self.next_task_id += 1
+        return task_id
+
+    def create_project(self, name: str, description: str = "") -> Project:
+        """See InMemoryRepository.create_project."""
+        with self._global_lock:
+            return super().create_project(name, description)
+
+    def update_project(
+        self,
+        project_id: int,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> Optional[Project]:
+        """See InMemoryRepository.update_project."""
+        if name and len(name.split()) > 30:
+            raise ValueError("Name exceeds 30 words")
+        if description and len(description.split()) > 150:
+            raise ValueError("Description exceeds 150 words")
+        with self._global_lock:
+            return super().update_project(project_id, name, description)
+
+    def delete_project(self, project_id: int) -> bool:
+        """See InMemoryRepository.delete_project."""
+        with self._global_lock, self._stripe(project_id):
+            return super().delete_project(project_id)
+
+    def list_projects(self) -> List[Project]:
+        """See InMemoryRepository.list_projects. Never waits for writers."""
+        return _copy_values(self.projects)
+
+    def add_task_to_project(
+        self,
+        project_id: int,
+        title: str,
+        description: str = "",
+        status: str = "todo",
+        deadline: Optional[datetime] = None,
+    ) -> Optional[Task]:
+        """See InMemoryRepository.add_task_to_project."""
+        try:
+            task_status = TaskStatus(status)
+        except ValueError:
+            raise ValueError("Invalid task status")
+        with self._stripe(project_id):
+            project = self.projects.get(project_id)
+            if not project:
+                return None
+            if len(project.tasks) >= Config.MAX_TASKS_PER_PROJECT:
+                raise ValueError("Max tasks limit reached for project")
+            task = Task(self._allocate_task_id(), title, description, task_status, deadline)
+            project.tasks[task.id] = task
+            self._tasks_by_id[task.id] = (project, task)
+        return task
+
+    def update_task(
+        self,
+        project_id: int,
+        task_id: int,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[str] = None,
+        deadline: Optional[datetime] = None,
+    ) -> Optional[Task]:
+        """See InMemoryRepository.update_task.
+
+        Validation happens before any change, and the task is replaced by
+        an updated copy, so readers never see a half-applied update.
+        """
+        if title and len(title.split()) > 30:
+            raise ValueError("Title exceeds 30 words")
+        if description and len(description.split()) > 150:
+            raise ValueError("Description exceeds 150 words")
+        try:
+            task_status = TaskStatus(status) if status else None
+        except ValueError:
+            raise ValueError("Invalid task status")
+        if deadline is not None and deadline and deadline < datetime.now():
+            raise ValueError("Deadline must be in the future")
+
+        with self._stripe(project_id):
+            task = self.get_task(project_id, task_id)
+            if not task:
+                return None
+            project = self.projects[project_id]
+            updated = Task(
+                task.id,
+                title or task.title,
+                description or task.description,
+                task_status or task.status,
+                deadline if deadline is not None else task.deadline,
+            )
+            project.tasks[task_id] = updated
+            self._tasks_by_id[task_id] = (project, updated)
+        return updated
+
+    def delete_task(self, project_id: int, task_id: int) -> bool:
+        """See InMemoryRepository.delete_task."""
+        with self._stripe(project_id):
+            return super().delete_task(project_id, task_id)
+
+    def list_tasks(self, project_id: int) -> List[Task]:
+        """See InMemoryRepository.list_tasks. Never waits for writers."""
+        project = self.projects.get(project_id)
+        return _copy_values(project.tasks) if project else []
@@ -0,0 +1,4 @@
+from .writer import write_outbox_events
+from .dispatcher import OutboxDispatcher, WebhookSender, run_dispatcher
+
+__all__ = ['write_outbox_events', 'OutboxDispatcher', 'WebhookSender', 'run_dispatcher']
@@ -0,0 +1,214 @@
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.domain.models import OutboxEvent
+
+
+class WebhookSender:
+    """
+    Delivers a batch of events as one JSON POST: {"events": [...]}.
+    Any non-2xx response or network error fails the whole batch.
+    """
+
+    def __init__(self, url: str = None, timeout: float = None):
+        """
+        Initialize sender.
+
+        Args:
+            url: Webhook URL (default: WEBHOOK_URL)
+            timeout: Request timeout in seconds (default: WEBHOOK_TIMEOUT_SECONDS)
+        """
+        self.url = url or Config.WEBHOOK_URL
+        self.timeout = timeout or Config.WEBHOOK_TIMEOUT_SECONDS
+
+    def send(self, events: List[dict]):
+        """
+        POST events to the webhook.
+
+        Raises:
+            Exception: If delivery failed
+        """
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"events": events}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise RuntimeError(f"Webhook responded with HTTP {response.status}")
+
+
+class OutboxDispatcher:
+    """
+    Delivers pending outbox events in batches.
+
+    Each pass claims due events (FOR UPDATE SKIP LOCKED, so several dispatchers
+    can share the table) by leasing them: their next_attempt_at moves
+    OUTBOX_LEASE_SECONDS ahead and the claim commits right away. Delivery runs
+    outside any transaction, up to `concurrency` batches in parallel, and the
+    outcomes are recorded in a second short transaction. Events of a
+    dispatcher that died mid-pass become due again when the lease expires.
+    Failed events are retried with exponential backoff and marked 'dead'
+    after `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        sender: WebhookSender = None,
+        batch_size: int = None,
+        concurrency: int = None,
+        max_attempts: int = None,
+        session_factory=WriteSessionLocal
+    ):
+        self.sender = sender or WebhookSender()
+        self.batch_size = batch_size or Config.OUTBOX_BATCH_SIZE
+        self.concurrency = concurrency or Config.OUTBOX_CONCURRENCY
+        self.max_attempts = max_attempts or Config.OUTBOX_MAX_ATTEMPTS
+        self.session_factory = session_factory
+
+    def dispatch_once(self) -> int:
+        """
+        Run one delivery pass.
+
+        Returns:
+            Number of events claimed in this pass
+        """
+        lease_until, claimed = self._claim()
+        if not claimed:
+            return 0
+
+        ids = [event_id for event_id, _ in claimed]
+        batches = [claimed[i:i + self.batch_size] for i in range(0, len(claimed), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            errors = list(pool.map(self._deliver, [[payload for _, payload in batch] for batch in batches]))
+
+        outcomes = {
+            event_id: error
+            for batch, error in zip(batches, errors)
+            for event_id, _ in batch
+        }
+        self._record(ids, lease_until, outcomes)
+        return len(claimed)
+
+    def _claim(self) -> Tuple[datetime, List[Tuple[int, dict]]]:
+        """
+        Lease due events in a short transaction.
+
+        Returns:
+            Lease expiry and the (id, payload) of the claimed events
+        """
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=Config.OUTBOX_LEASE_SECONDS)
+        db = self.session_factory()
+        try:
+            events = list(db.scalars(
+                select(OutboxEvent)
+                .where(
+                    OutboxEvent.status == 'pending',
+                    OutboxEvent.next_attempt_at <= now
+                )
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size * self.concurrency)
+                .with_for_update(skip_locked=True)
+            ))
+            claimed = []
+            for event in events:
+                event.next_attempt_at = lease_until
+                # Worker threads only see plain payloads, never ORM objects
+                claimed.append((event.id, json.loads(event.payload)))
+            db.commit()
+            return lease_until, claimed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _record(self, ids: List[int], lease_until: datetime, outcomes: Dict[int, Optional[str]]):
+        """
+        Record delivery outcomes in a short transaction. Events whose lease
+        expired and were claimed again by another pass are left alone.
+        """
+        db = self.session_factory()
+        try:
+            events = db.scalars(
+                select(OutboxEvent)
+                .where(
+                    OutboxEvent.id.in_(ids),
+                    OutboxEvent.status == 'pending',
+                    OutboxEvent.next_attempt_at == lease_until
+                )
+                .with_for_update()
+            )
+            now = datetime.utcnow()
+            for event in events:
+                error = outcomes[event.id]
+                if error is None:
+                    event.status = 'delivered'
+                    event.delivered_at = now
+                    event.last_error = None
+                else:
+                    self._schedule_retry(event, error, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _deliver(self, events: List[dict]) -> Optional[str]:
+        try:
+            self.sender.send(events)
+            return None
+        except Exception as e:
+            return str(e) or e.__class__.__name__
+
+    def _schedule_retry(self, event: OutboxEvent, error: str, now: datetime):
+        event.attempts += 1
+        event.last_error = error[:1000]
+
+        if event.attempts >= self.max_attempts:
+            event.status = 'dead'
+            return
+
+        # Exponential backoff with jitter: base * 2^(attempts-1), capped
+        delay = min(
+            Config.OUTBOX_BACKOFF_SECONDS * 2 ** (event.attempts - 1),
+            Config.OUTBOX_MAX_BACKOFF_SECONDS
+        )
+        delay += random.uniform(0, Config.OUTBOX_BACKOFF_SECONDS)
+        event.next_attempt_at = now + timedelta(seconds=delay)
+
+
+def run_dispatcher():
+    """
+    Run the outbox dispatcher continuously.
+    Passes run back to back while there is a backlog, otherwise every OUTBOX_POLL_SECONDS.
+    """
+    print("🚀 Outbox dispatcher started...")
+    print(f"📮 Webhook: {Config.WEBHOOK_URL}")
+    print("=" * 50)
+
+    dispatcher = OutboxDispatcher()
+    while True:
+        try:
+            claimed = dispatcher.dispatch_once()
+        except Exception as e:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{timestamp}] ❌ Error in outbox dispatcher: {e}")
+            claimed = 0
+
+        if claimed > 0:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{timestamp}] 📮 Processed {claimed} outbox event(s)")
+
+        if claimed < dispatcher.batch_size * dispatcher.concurrency:
+            time.sleep(Config.OUTBOX_POLL_SECONDS)
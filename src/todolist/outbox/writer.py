@@ -0,0 +1,40 @@
+import json
+from datetime import datetime
+from typing import List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from src.todolist.config import Config
+from src.todolist.domain.models import OutboxEvent
+from src.todolist.events.changes import TaskChange, on_flush
+
+# Outbox event type per (change kind, change source)
+EVENT_TYPES = {
+    ("completed", "api"): "task.completed",
+    ("completed", "scheduler"): "task.auto_closed",
+}
+
+
+@on_flush
+def write_outbox_events(session: Session, changes: List[TaskChange]):
+    """
+    Record completions and auto-closes in the outbox, inside the same
+    transaction as the task change. Delivery happens later in OutboxDispatcher.
+    """
+    if not Config.OUTBOX_ENABLED:
+        return
+
+    now = datetime.utcnow()
+    rows = []
+    for change in changes:
+        event_type = EVENT_TYPES.get((change.kind, change.source))
+        if event_type is None:
+            continue
+        payload = dict(change.to_event(), type=event_type, occurred_at=now.isoformat())
+        rows.append({
+            "event_type": event_type,
+            "task_id": change.task_id,
+            "payload": json.dumps(payload),
+        })
+
+    if rows:
+        session.connection().execute(insert(OutboxEvent), rows)
@@ -1,5 +1,6 @@
 from .base import BaseRepository
 from .task_repository import TaskRepository
 from .category_repository import CategoryRepository
+from .project_repository import ProjectRepository
 
-__all__ = ['BaseRepository', 'TaskRepository', 'CategoryRepository']
+__all__ = ['BaseRepository', 'TaskRepository', 'CategoryRepository', 'ProjectRepository']
@@ -1,10 +1,23 @@
 from typing import Generic, TypeVar, Type, List, Optional
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from src.todolist.db.session import Base
 
 # Generic type for model
 ModelType = TypeVar("ModelType", bound=Base)
 
+# session.info key: when set, repositories flush instead of committing and
+# leave the transaction to the caller (e.g. CLI batch mode)
+DEFER_COMMIT_KEY = "defer_commit"
+
+
+class StaleVersionError(Exception):
+    """The entity's version differs from the one the caller expected (If-Match)."""
+
+
+class QuotaExceededError(Exception):
+    """Creating the entity would exceed a configured quota (MAX_PROJECTS, MAX_TASKS_PER_PROJECT)."""
+
 
 class BaseRepository(Generic[ModelType]):
     """
@@ -32,7 +45,8 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Entity or None if not found
         """
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        # Served from the identity map when the entity is already loaded
+        return self.db.get(self.model, id)
     
     def get_all(self) -> List[ModelType]:
         """
@@ -41,7 +55,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             List of all entities
         """
-        return self.db.query(self.model).all()
+        return list(self.db.scalars(select(self.model)))
     
     def create(self, **kwargs) -> ModelType:
         """
@@ -55,13 +69,15 @@ class BaseRepository(Generic[ModelType]):
         """
         entity = self.model(**kwargs)
         self.db.add(entity)
-        self.db.commit()
+        self._commit()
         self.db.refresh(entity)
         return entity
     
     def update(self, id: int, **kwargs) -> Optional[ModelType]:
         """
         Update entity by ID.
+        On versioned models the UPDATE only matches the version that was
+        read, so a concurrent change makes the commit raise StaleDataError.
         
         Args:
             id: Entity ID
@@ -75,7 +91,7 @@ class BaseRepository(Generic[ModelType]):
             for key, value in kwargs.items():
                 if hasattr(entity, key):
                     setattr(entity, key, value)
-            self.db.commit()
+            self._commit()
             self.db.refresh(entity)
         return entity
     
@@ -92,7 +108,7 @@ class BaseRepository(Generic[ModelType]):
         entity = self.get_by_id(id)
         if entity:
             self.db.delete(entity)
-            self.db.commit()
+            self._commit()
             return True
         return False
     
@@ -103,4 +119,14 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Total count
         """
-        return self.db.query(self.model).count()
+        return self.db.scalar(select(func.count()).select_from(self.model))
+    
+    def _commit(self):
+        """
+        Commit the session, or only flush it if the caller owns the
+        transaction (DEFER_COMMIT_KEY set in session.info).
+        """
+        if self.db.info.get(DEFER_COMMIT_KEY):
+            self.db.flush()
+        else:
+            self.db.commit()
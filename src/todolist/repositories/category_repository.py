@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import List, Optional
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.orm import Session
-from src.todolist.domain.models import Category
+from src.todolist.domain.models import Category, CategoryTaskCounts, Task
 from .base import BaseRepository
 
 
@@ -28,7 +29,9 @@ class CategoryRepository(BaseRepository[Category]):
         Returns:
             Category or None if not found
         """
-        return self.db.query(Category).filter(Category.name == name).first()
+        return self.db.scalars(
+            lambda_stmt(lambda: select(Category).where(Category.name == name))
+        ).first()
     
     def get_or_create(self, name: str, description: str = None) -> Category:
         """
@@ -55,12 +58,69 @@ class CategoryRepository(BaseRepository[Category]):
         Returns:
             List of tuples (category, task_count)
         """
-        from sqlalchemy import func
-        from app.domain.models import Task
-        
-        result = self.db.query(
-            Category,
-            func.count(Task.id).label('task_count')
-        ).outerjoin(Task).group_by(Category.id).all()
+        result = self.db.execute(
+            select(Category, func.count(Task.id).label('task_count'))
+            .outerjoin(Task)
+            .group_by(Category.id)
+        ).all()
         
         return result
+    
+    def get_statistics(self, cached: bool = False) -> List[dict]:
+        """
+        Get total, completed, pending and overdue task counts per category.
+        
+        Live mode is a single GROUP BY with FILTER clauses. Cached mode reads
+        total/completed from category_task_counts (CATEGORY_STATS_CACHE) and
+        counts only the overdue tasks live, through the open-tasks index.
+        
+        Args:
+            cached: Read from the rollup cache
+            
+        Returns:
+            List of dicts ordered by category name
+        """
+        if not cached:
+            rows = self.db.execute(
+                select(
+                    Category.id,
+                    Category.name,
+                    func.count(Task.id),
+                    func.count(Task.id).filter(Task.is_completed == True),
+                    func.count(Task.id).filter(Task.is_overdue),
+                )
+                .outerjoin(Task, Task.category_id == Category.id)
+                .group_by(Category.id, Category.name)
+                .order_by(Category.name)
+            ).all()
+        else:
+            overdue = dict(self.db.execute(
+                select(Task.category_id, func.count(Task.id))
+                .where(Task.is_overdue, Task.category_id.isnot(None))
+                .group_by(Task.category_id)
+            ).all())
+            rows = [
+                (id, name, total, completed, overdue.get(id, 0))
+                for id, name, total, completed in self.db.execute(
+                    select(
+                        Category.id,
+                        Category.name,
+                        func.coalesce(CategoryTaskCounts.total, 0),
+                        func.coalesce(CategoryTaskCounts.completed, 0),
+                    )
+                    .outerjoin(CategoryTaskCounts, CategoryTaskCounts.category_id == Category.id)
+                    .order_by(Category.name)
+                )
+            ]
+        
+        return [
+            {
+                'id': id,
+                'name': name,
+                'total': total,
+                'completed': completed,
+                'pending': total - completed,
+                'overdue': overdue_count
+            }
+            for id, name, total, completed, overdue_count in rows
+        ]
@@ -0,0 +1,109 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import delete, lambda_stmt, select, text, update
+from sqlalchemy.orm import Session
+from src.todolist.config import Config
+from src.todolist.domain.models import Project, Task
+from src.todolist.events.changes import CHANGE_SOURCE_KEY, TaskChange, dispatch_task_changes, task_snapshot
+from .base import BaseRepository, QuotaExceededError
+from .task_repository import SNAPSHOT_COLUMNS
+
+
+class ProjectRepository(BaseRepository[Project]):
+    """
+    Repository for Project entity.
+    The per-project task quota is enforced on task changes
+    (see rollups.project_counts).
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize project repository.
+        
+        Args:
+            db: Database session
+        """
+        super().__init__(Project, db)
+    
+    def get_by_name(self, name: str) -> Optional[Project]:
+        """
+        Get project by name.
+        
+        Args:
+            name: Project name
+            
+        Returns:
+            Project or None if not found
+        """
+        return self.db.scalars(
+            lambda_stmt(lambda: select(Project).where(Project.name == name))
+        ).first()
+    
+    def get_projects(self) -> List[Project]:
+        """
+        Get all projects in creation order.
+        
+        Returns:
+            List of projects
+        """
+        return list(self.db.scalars(select(Project).order_by(Project.id)))
+    
+    def create_project(self, name: str, description: Optional[str] = None) -> Project:
+        """
+        Create a project unless MAX_PROJECTS is reached.
+        
+        Projects are few, so they are counted; on PostgreSQL the table is
+        locked against concurrent inserts first, so two requests can't both
+        take the last free slot (SQLite serializes writers anyway).
+        
+        Args:
+            name: Project name
+            description: Project description (optional)
+            
+        Returns:
+            Created project
+            
+        Raises:
+            QuotaExceededError: If MAX_PROJECTS projects already exist
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(text("LOCK TABLE projects IN SHARE ROW EXCLUSIVE MODE"))
+        if self.count() >= Config.MAX_PROJECTS:
+            raise QuotaExceededError(f"Can't have more than {Config.MAX_PROJECTS} projects")
+        return self.create(name=name, description=description)
+    
+    def delete(self, id: int) -> bool:
+        """
+        Delete a project and its tasks without loading them.
+        
+        The live tasks are soft-deleted with one UPDATE ... RETURNING, so
+        rollups, history and subscribers see them go like any deleted
+        task; deleting the project row then removes all its task rows
+        (ON DELETE CASCADE).
+        
+        Args:
+            id: Project ID
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        now = datetime.utcnow()
+        rows = self.db.execute(
+            update(Task)
+            .where(Task.project_id == id, Task.deleted_at.is_(None))
+            .values(deleted_at=now, updated_at=now, version=Task.version + 1)
+            .returning(*SNAPSHOT_COLUMNS),
+            execution_options={"synchronize_session": False}
+        ).all()
+
+        source = self.db.info.get(CHANGE_SOURCE_KEY, "api")
+        dispatch_task_changes(self.db, [
+            TaskChange("deleted", row.id, source, task_snapshot(row)) for row in rows
+        ])
+
+        deleted = self.db.execute(
+            delete(Project).where(Project.id == id),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        self._commit()
+        return bool(deleted)
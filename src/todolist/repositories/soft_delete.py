@@ -0,0 +1,23 @@
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+from src.todolist.domain.models import Task
+
+# Execution option: include soft-deleted tasks in an ORM statement
+INCLUDE_DELETED = "include_deleted"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted_tasks(state: ORMExecuteState):
+    """
+    Add `deleted_at IS NULL` to every ORM SELECT and UPDATE touching tasks
+    (including joins, relationship loads and Session.get), so soft-deleted
+    tasks behave as gone. Refreshes of already loaded objects are left alone.
+    """
+    if (
+        (state.is_select or state.is_update)
+        and not state.is_column_load
+        and not state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(Task, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
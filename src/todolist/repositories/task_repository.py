@@ -1,9 +1,29 @@
-from typing import List, Optional
-from datetime import datetime
-from sqlalchemy import or_
+import json
+from typing import Iterable, Iterator, List, Optional, Set
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, func, inspect, lambda_stmt, not_, or_, select, update
 from sqlalchemy.orm import Session, joinedload
-from src.todolist.domain.models import Task
-from .base import BaseRepository
+from src.todolist.config import Config
+from src.todolist.db.session import capture_old_values, pop_captured_values
+from src.todolist.domain.models import Project, RollupBackfill, Task, TaskDailyStats, TaskHistory
+from src.todolist.events.changes import (
+    CHANGE_SOURCE_KEY, DIFF_IGNORED_ATTRIBUTES, PREVIOUS_VALUE_ATTRIBUTES, TaskChange,
+    dispatch_task_changes, task_snapshot
+)
+from src.todolist.audit import writer as _audit_writer  # noqa: F401 (registers the task history commit listener)
+from src.todolist.outbox import writer as _outbox_writer  # noqa: F401 (registers the outbox flush listener)
+from src.todolist.rollups import category_counts as _category_counts  # noqa: F401 (registers the rollup flush listener)
+from src.todolist.rollups import daily_stats as _daily_stats  # noqa: F401 (registers the analytics flush listener)
+from src.todolist.rollups import project_counts as _project_counts  # noqa: F401 (registers the project quota flush listener)
+from .base import BaseRepository, StaleVersionError
+from .soft_delete import INCLUDE_DELETED
+
+# Columns returned by bulk UPDATEs, enough for task_snapshot
+SNAPSHOT_COLUMNS = (
+    Task.id, Task.title, Task.priority, Task.is_completed, Task.due_date,
+    Task.completed_at, Task.category_id, Task.project_id, Task.created_at,
+    Task.updated_at, Task.version
+)
 
 
 class TaskRepository(BaseRepository[Task]):
@@ -27,7 +47,7 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             List of tasks with categories
         """
-        return self.db.query(Task).options(joinedload(Task.category)).all()
+        return list(self.db.scalars(select(Task).options(joinedload(Task.category))))
     
     def get_by_status(self, is_completed: bool) -> List[Task]:
         """
@@ -39,7 +59,7 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             List of filtered tasks
         """
-        return self.db.query(Task).filter(Task.is_completed == is_completed).all()
+        return list(self.db.scalars(select(Task).where(Task.is_completed == is_completed)))
     
     def get_by_priority(self, priority: int) -> List[Task]:
         """
@@ -51,7 +71,7 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             List of tasks with specified priority
         """
-        return self.db.query(Task).filter(Task.priority == priority).all()
+        return list(self.db.scalars(select(Task).where(Task.priority == priority)))
     
     def get_by_category(self, category_id: int) -> List[Task]:
         """
@@ -63,7 +83,7 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             List of tasks in category
         """
-        return self.db.query(Task).filter(Task.category_id == category_id).all()
+        return list(self.db.scalars(select(Task).where(Task.category_id == category_id)))
     
     def get_overdue_tasks(self) -> List[Task]:
         """
@@ -72,11 +92,7 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             List of overdue tasks
         """
-        now = datetime.utcnow()
-        return self.db.query(Task).filter(
-            Task.is_completed == False,
-            Task.due_date < now
-        ).all()
+        return list(self.db.scalars(select(Task).where(Task.is_overdue)))
     
     def search_tasks(self, keyword: str) -> List[Task]:
         """
@@ -89,12 +105,14 @@ class TaskRepository(BaseRepository[Task]):
             List of matching tasks
         """
         search_pattern = f"%{keyword}%"
-        return self.db.query(Task).filter(
-            or_(
-                Task.title.ilike(search_pattern),
-                Task.description.ilike(search_pattern)
+        return list(self.db.scalars(
+            select(Task).where(
+                or_(
+                    Task.title.ilike(search_pattern),
+                    Task.description.ilike(search_pattern)
+                )
             )
-        ).all()
+        ))
     
     def mark_as_completed(self, task_id: int) -> Optional[Task]:
         """
@@ -110,10 +128,194 @@ class TaskRepository(BaseRepository[Task]):
         if task and not task.is_completed:
             task.is_completed = True
             task.completed_at = datetime.utcnow()
-            self.db.commit()
+            self._commit()
             self.db.refresh(task)
         return task
     
+    def mark_many_as_completed(self, task_ids: Iterable[int]) -> Set[int]:
+        """
+        Mark several tasks as completed with one set-based UPDATE.
+        Used by the completion batcher (COMPLETION_BATCH_MS); change events
+        are dispatched explicitly since the statement bypasses the unit of work.
+        
+        Args:
+            task_ids: Task IDs
+            
+        Returns:
+            IDs of the tasks that exist (now completed, or already were)
+        """
+        task_ids = set(task_ids)
+        now = datetime.utcnow()
+        rows = self.db.execute(
+            update(Task)
+            .where(Task.id.in_(task_ids), Task.is_completed == False)
+            .values(
+                is_completed=True,
+                completed_at=now,
+                updated_at=now,
+                version=Task.version + 1
+            )
+            .returning(*SNAPSHOT_COLUMNS),
+            execution_options={"synchronize_session": False}
+        ).all()
+
+        source = self.db.info.get(CHANGE_SOURCE_KEY, "api")
+        dispatch_task_changes(self.db, [
+            TaskChange(
+                "completed", row.id, source, task_snapshot(row),
+                {"is_completed": False, "completed_at": None}
+            )
+            for row in rows
+        ])
+
+        found = {row.id for row in rows}
+        missing = task_ids - found
+        if missing:
+            # Already completed tasks still count as found
+            found.update(self.db.scalars(select(Task.id).where(Task.id.in_(missing))))
+        self._commit()
+        return found
+    
+    def update(self, id: int, expected_version: Optional[int] = None, **kwargs) -> Optional[Task]:
+        """
+        Update a task with one UPDATE ... RETURNING, without reading it
+        first. With expected_version (If-Match) the UPDATE only matches that
+        version. The same statement hands back the old values of the updated
+        columns for the change events: on PostgreSQL from a locked self-join,
+        on SQLite (whose RETURNING only sees new values) through
+        capture_old_values. Only an UPDATE that matched nothing is followed
+        by a SELECT, to tell a stale version from a missing task.
+        
+        Args:
+            id: Task ID
+            expected_version: Version the caller last saw (None to skip the check)
+            **kwargs: Attributes to update
+            
+        Returns:
+            Updated task or None if not found
+            
+        Raises:
+            StaleVersionError: If the task isn't at expected_version
+        """
+        columns = inspect(Task).column_attrs
+        values = {key: value for key, value in kwargs.items() if key in columns}
+        keys = list(values)
+        statement = (
+            update(Task)
+            .where(Task.id == id)
+            .values(**values, updated_at=datetime.utcnow(), version=Task.version + 1)
+        )
+        if expected_version is not None:
+            statement = statement.where(Task.version == expected_version)
+        execution_options = {"synchronize_session": False, "populate_existing": True}
+
+        dialect = self.db.get_bind().dialect
+        if dialect.name == "sqlite":
+            token, capture = capture_old_values(*(getattr(Task, key) for key in keys))
+            try:
+                updated = self.db.scalars(
+                    statement.where(capture).returning(Task), execution_options=execution_options
+                ).first()
+            finally:
+                raw = pop_captured_values(token)
+            if updated is not None:
+                old_values = []
+                for key, value in zip(keys, raw):
+                    process = getattr(Task, key).type.dialect_impl(dialect).result_processor(dialect, None)
+                    old_values.append(process(value) if process else value)
+        else:
+            old = (
+                select(Task.id, *(getattr(Task, key) for key in keys))
+                .where(Task.id == id)
+                .with_for_update()
+                .subquery("old")
+            )
+            row = self.db.execute(
+                statement.where(Task.id == old.c.id).returning(Task, *(old.c[key] for key in keys)),
+                execution_options=execution_options
+            ).first()
+            updated, old_values = (row[0], row[1:]) if row is not None else (None, None)
+
+        if updated is None:
+            if expected_version is None or self.db.scalar(select(Task.version).where(Task.id == id)) is None:
+                return None
+            raise StaleVersionError(f"Task {id} has changed")
+
+        previous, diff = {}, {}
+        for key, old_value in zip(keys, old_values):
+            new_value = getattr(updated, key)
+            if old_value == new_value:
+                continue
+            if key in PREVIOUS_VALUE_ATTRIBUTES:
+                previous[key] = old_value
+            if key not in DIFF_IGNORED_ATTRIBUTES:
+                diff[key] = [old_value, new_value]
+        kind = "completed" if updated.is_completed and previous.get("is_completed") is False else "updated"
+        source = self.db.info.get(CHANGE_SOURCE_KEY, "api")
+        dispatch_task_changes(self.db, [
+            TaskChange(kind, id, source, task_snapshot(updated), previous, diff)
+        ])
+        self._commit()
+        return updated
+    
+    def delete(self, id: int) -> bool:
+        """
+        Soft-delete a task: one conditional UPDATE setting deleted_at,
+        without loading the task first. The row is removed later, in
+        small batches, by purge_deleted.
+        
+        Args:
+            id: Task ID
+            
+        Returns:
+            True if deleted, False if not found (or already deleted)
+        """
+        now = datetime.utcnow()
+        row = self.db.execute(
+            update(Task)
+            .where(Task.id == id, Task.deleted_at.is_(None))
+            .values(deleted_at=now, updated_at=now, version=Task.version + 1)
+            .returning(*SNAPSHOT_COLUMNS),
+            execution_options={"synchronize_session": False}
+        ).first()
+        if row is None:
+            return False
+
+        # For rollups, quotas and subscribers the task is gone now
+        source = self.db.info.get(CHANGE_SOURCE_KEY, "api")
+        dispatch_task_changes(self.db, [TaskChange("deleted", row.id, source, task_snapshot(row))])
+        self._commit()
+        return True
+    
+    def purge_deleted(self, deleted_before: datetime, batch_size: int) -> int:
+        """
+        Physically delete one batch of tasks soft-deleted before `deleted_before`
+        (oldest first, through idx_task_deleted_at) and commit.
+        On PostgreSQL rows locked by another purger are skipped.
+        
+        Args:
+            deleted_before: Only purge tasks deleted before this time
+            batch_size: Maximum number of rows to delete
+            
+        Returns:
+            Number of tasks purged
+        """
+        batch = (
+            select(Task.id)
+            .where(Task.deleted_at.isnot(None), Task.deleted_at < deleted_before)
+            .order_by(Task.deleted_at)
+            .limit(batch_size)
+        )
+        if self.db.get_bind().dialect.name == "postgresql":
+            batch = batch.with_for_update(skip_locked=True)
+
+        result = self.db.execute(
+            delete(Task).where(Task.id.in_(batch.scalar_subquery())),
+            execution_options={"synchronize_session": False, INCLUDE_DELETED: True}
+        )
+        self._commit()
+        return result.rowcount
+    
     def mark_overdue_as_closed(self) -> int:
         """
         Mark all overdue tasks as completed.
@@ -131,7 +333,12 @@ class TaskRepository(BaseRepository[Task]):
             count += 1
         
         if count > 0:
-            self.db.commit()
+            # Tag the resulting change events as scheduler auto-closes
+            self.db.info[CHANGE_SOURCE_KEY] = "scheduler"
+            try:
+                self._commit()
+            finally:
+                self.db.info.pop(CHANGE_SOURCE_KEY, None)
         
         return count
     
@@ -142,10 +349,15 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             Dictionary with task counts
         """
-        total = self.count()
-        completed = self.db.query(Task).filter(Task.is_completed == True).count()
+        now = datetime.utcnow()
+        total, completed, overdue = self.db.execute(lambda_stmt(
+            lambda: select(
+                func.count(Task.id),
+                func.count(Task.id).filter(Task.is_completed == True),
+                func.count(Task.id).filter(Task.overdue_at(now)),
+            )
+        )).one()
         pending = total - completed
-        overdue = len(self.get_overdue_tasks())
         
         return {
             'total': total,
@@ -159,40 +371,308 @@ class TaskRepository(BaseRepository[Task]):
         limit: int = 100,
         completed: Optional[bool] = None,
         search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        sort: str = "default",
+        project_id: Optional[int] = None,
     ) -> List[Task]:
         """
         Get tasks with pagination, filtering and search (for API layer).
         Category is eagerly loaded.
+        sort="overdue" lists overdue tasks first.
+        project_id limits the list to one project (idx_task_project_listing).
         """
-        query = self.db.query(self.model).options(joinedload(Task.category))
+        stmt = (
+            select(Task)
+            .options(joinedload(Task.category))
+            .where(*self._task_filters(completed, search, overdue, project_id))
+        )
 
-        if completed is not None:
-            query = query.filter(Task.is_completed == completed)
+        if sort == "overdue":
+            stmt = stmt.order_by(Task.is_overdue.desc())
 
+        stmt = stmt.order_by(
+            Task.is_completed.asc(),
+            Task.due_date.asc().nulls_last(),
+            Task.id.desc()
+        ).offset(skip).limit(limit)
+
+        return list(self.db.scalars(stmt))
+
+    def count_tasks(
+        self,
+        completed: Optional[bool] = None,
+        search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        project_id: Optional[int] = None,
+    ) -> int:
+        """
+        Exact number of tasks matching the get_tasks filters.
+        As expensive as the listing itself; prefer estimate_task_count.
+        """
+        return self.db.scalar(
+            select(func.count(Task.id))
+            .where(*self._task_filters(completed, search, overdue, project_id))
+        )
+
+    def estimate_task_count(
+        self,
+        completed: Optional[bool] = None,
+        search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        project_id: Optional[int] = None,
+    ) -> int:
+        """
+        Approximate number of tasks matching the get_tasks filters.
+        
+        A whole project is counted by its maintained task_count. Without
+        text/overdue filters the totals come from the daily rollup
+        (ANALYTICS_ROLLUPS), once analytics:backfill has run: before that it
+        lacks older tasks. Otherwise PostgreSQL's planner estimate is used;
+        other databases count exactly.
+        
+        Args:
+            completed: Completion filter
+            search: Keyword filter
+            overdue: Overdue filter
+            project_id: Project filter
+            
+        Returns:
+            Estimated count
+        """
+        unfiltered = not search and overdue is None
+        if project_id is not None and unfiltered and completed is None:
+            return self.db.scalar(
+                select(Project.task_count).where(Project.id == project_id)
+            ) or 0
+
+        if project_id is None and unfiltered and Config.ANALYTICS_ROLLUPS:
+            backfilled = (
+                select(RollupBackfill.name)
+                .where(RollupBackfill.name == TaskDailyStats.__tablename__)
+                .exists()
+            )
+            created, done, is_backfilled = self.db.execute(
+                select(
+                    func.coalesce(func.sum(TaskDailyStats.created), 0),
+                    func.coalesce(func.sum(TaskDailyStats.completed), 0),
+                    backfilled,
+                )
+            ).one()
+            if is_backfilled:
+                if completed is None:
+                    return created
+                return done if completed else created - done
+
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self.count_tasks(completed, search, overdue, project_id)
+
+        compiled = (
+            select(Task.id)
+            .where(Task.deleted_at.is_(None), *self._task_filters(completed, search, overdue, project_id))
+            .compile(dialect=self.db.get_bind().dialect)
+        )
+        plan = self.db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _task_filters(
+        completed: Optional[bool],
+        search: Optional[str],
+        overdue: Optional[bool],
+        project_id: Optional[int] = None,
+    ) -> list:
+        """WHERE conditions shared by get_tasks and the counts."""
+        filters = []
+        if project_id is not None:
+            filters.append(Task.project_id == project_id)
+        if completed is not None:
+            filters.append(Task.is_completed == completed)
+        if overdue is not None:
+            filters.append(Task.is_overdue if overdue else not_(Task.is_overdue))
         if search:
             pattern = f"%{search}%"
-            query = query.filter(
+            filters.append(
                 or_(
                     Task.title.ilike(pattern),
                     Task.description.ilike(pattern)
                 )
             )
+        return filters
 
-        query = query.order_by(
-            Task.is_completed.asc(),
-            Task.due_date.asc().nulls_last(),
-            Task.id.desc()
+    def iter_tasks(
+        self,
+        status: Optional[str] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Task]:
+        """
+        Stream tasks in ID order, with categories eagerly loaded.
+        Rows are fetched `batch_size` at a time through a server-side
+        cursor, so memory use doesn't grow with the number of tasks.
+        
+        Args:
+            status: "pending", "completed", "overdue" or None for all tasks
+            skip: Number of tasks to skip
+            limit: Maximum number of tasks (None for no limit)
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator over tasks
+        """
+        stmt = select(Task).options(joinedload(Task.category))
+
+        if status == "pending":
+            stmt = stmt.where(Task.is_completed == False)
+        elif status == "completed":
+            stmt = stmt.where(Task.is_completed == True)
+        elif status == "overdue":
+            stmt = stmt.where(Task.is_overdue)
+
+        stmt = stmt.order_by(Task.id).offset(skip)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return iter(self.db.scalars(stmt.execution_options(yield_per=batch_size)))
+
+    def get_next_tasks(
+        self,
+        n: int,
+        claim_by: Optional[str] = None,
+        claim_seconds: int = 300,
+    ) -> List[Task]:
+        """
+        Get the next open tasks to work on: highest priority first, then
+        earliest due date (tasks without one last). Tasks claimed by a
+        worker are skipped until their claim expires.
+        Served by idx_task_next_up (is_completed, priority DESC, due_date).
+        
+        Args:
+            n: Number of tasks
+            claim_by: Worker claiming the returned tasks (None to only peek)
+            claim_seconds: How long a claim lasts
+            
+        Returns:
+            List of up to n tasks with categories loaded
+        """
+        now = datetime.utcnow()
+        stmt = (
+            select(Task)
+            .where(
+                Task.is_completed == False,
+                or_(Task.claimed_until.is_(None), Task.claimed_until <= now)
+            )
+            .order_by(Task.priority.desc(), Task.due_date.asc().nulls_last())
+            .limit(n)
         )
 
-        return query.offset(skip).limit(limit).all()
+        if claim_by is None:
+            return list(self.db.scalars(stmt.options(joinedload(Task.category))))
+
+        # Rows locked by other claimers are skipped, not waited for, so
+        # concurrent workers each get a distinct set of tasks
+        tasks = list(self.db.scalars(stmt.with_for_update(skip_locked=True, of=Task)))
+        if not tasks:
+            return tasks
+        for task in tasks:
+            task.claimed_by = claim_by
+            task.claimed_until = now + timedelta(seconds=claim_seconds)
+        ids = [task.id for task in tasks]
+        self._commit()
+
+        # The commit expired the claimed tasks; reload them with their
+        # categories in one query instead of one refresh per task
+        claimed = {
+            task.id: task
+            for task in self.db.scalars(
+                select(Task)
+                .where(Task.id.in_(ids))
+                .options(joinedload(Task.category))
+                .execution_options(populate_existing=True)
+            )
+        }
+        return [claimed[id] for id in ids if id in claimed]
+
+    def get_daily_stats(
+        self,
+        start: date,
+        end: date,
+        category_id: Optional[int] = None,
+        priority: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Get tasks created and completed per day, category and priority,
+        read from the task_daily_stats rollup only.
+        
+        Args:
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            category_id: Only this category (None for all)
+            priority: Only this priority (None for all)
+            
+        Returns:
+            List of dicts ordered by day, category and priority
+        """
+        stmt = select(TaskDailyStats).where(
+            TaskDailyStats.day >= start,
+            TaskDailyStats.day <= end,
+            or_(TaskDailyStats.created != 0, TaskDailyStats.completed != 0)
+        )
+        if category_id is not None:
+            stmt = stmt.where(TaskDailyStats.category_id == category_id)
+        if priority is not None:
+            stmt = stmt.where(TaskDailyStats.priority == priority)
+
+        rows = self.db.scalars(stmt.order_by(
+            TaskDailyStats.day, TaskDailyStats.category_id, TaskDailyStats.priority
+        ))
+        return [
+            {
+                'day': row.day,
+                'category_id': row.category_id or None,
+                'priority': row.priority,
+                'created': row.created,
+                'completed': row.completed
+            }
+            for row in rows
+        ]
+
+    def get_history(self, task_id: int, limit: int = 100) -> List[dict]:
+        """
+        Get the written history of a task, newest first.
+        Entries still buffered by the audit log are not included.
+        
+        Args:
+            task_id: Task ID (deleted tasks keep their history)
+            limit: Maximum number of entries
+            
+        Returns:
+            List of dicts with changes decoded
+        """
+        rows = self.db.scalars(
+            select(TaskHistory)
+            .where(TaskHistory.task_id == task_id)
+            .order_by(TaskHistory.changed_at.desc(), TaskHistory.version.desc())
+            .limit(limit)
+        )
+        return [
+            {
+                'id': row.id,
+                'changed_at': row.changed_at,
+                'version': row.version,
+                'kind': row.kind,
+                'source': row.source,
+                'changes': json.loads(row.changes)
+            }
+            for row in rows
+        ]
 
     def get_by_id_with_category(self, task_id: int) -> Optional[Task]:
         """
         Get single task with category eagerly loaded.
         """
-        return (
-            self.db.query(self.model)
-            .options(joinedload(Task.category))
-            .filter(Task.id == task_id)
-            .first()
-        )
\ No newline at end of file
+        return self.db.scalars(lambda_stmt(
+            lambda: select(Task).options(joinedload(Task.category)).where(Task.id == task_id)
+        )).first()
\ No newline at end of file
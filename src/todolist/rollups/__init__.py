@@ -0,0 +1,8 @@
+from .category_counts import rebuild_category_counts, update_category_counts
+from .daily_stats import backfill_daily_stats, update_daily_stats
+from .project_counts import rebuild_project_counts, update_project_task_counts
+
+__all__ = [
+    'rebuild_category_counts', 'update_category_counts', 'backfill_daily_stats', 'update_daily_stats',
+    'rebuild_project_counts', 'update_project_task_counts'
+]
@@ -0,0 +1,129 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+from src.todolist.config import Config
+from src.todolist.domain.models import Category, CategoryTaskCounts, Task
+from src.todolist.events.changes import TaskChange, on_flush
+from .upsert import dialect_insert as get_dialect_insert
+
+
+def _count_deltas(changes: List[TaskChange]) -> Dict[int, List[int]]:
+    """Net [total, completed] change per category id."""
+    deltas: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+
+    def add(category_id: Optional[int], is_completed: bool, sign: int):
+        if category_id is not None:
+            deltas[category_id][0] += sign
+            deltas[category_id][1] += sign if is_completed else 0
+
+    for change in changes:
+        category_id = change.data.get("category_id")
+        is_completed = bool(change.data.get("is_completed"))
+        if change.kind == "created":
+            add(category_id, is_completed, 1)
+        elif change.kind == "deleted":
+            add(category_id, is_completed, -1)
+        else:
+            old_category_id = change.previous.get("category_id", category_id)
+            was_completed = bool(change.previous.get("is_completed", is_completed))
+            if (old_category_id, was_completed) != (category_id, is_completed):
+                add(old_category_id, was_completed, -1)
+                add(category_id, is_completed, 1)
+
+    return {cid: delta for cid, delta in deltas.items() if delta != [0, 0]}
+
+
+def _recount_statement(category_id: int):
+    """SELECT a category's current counts (nothing if the category is gone)."""
+    # Executed on the Core connection, so soft-deleted tasks are excluded explicitly
+    live = Task.deleted_at.is_(None)
+    return select(
+        Category.id,
+        select(func.count(Task.id)).where(Task.category_id == category_id, live).scalar_subquery(),
+        select(func.count(Task.id))
+        .where(Task.category_id == category_id, Task.is_completed == True, live)
+        .scalar_subquery(),
+    ).where(Category.id == category_id)
+
+
+@on_flush
+def update_category_counts(session: Session, changes: List[TaskChange]):
+    """
+    Apply task changes to the cached per-category counts, in the same
+    transaction as the changes themselves.
+
+    Counters are moved by deltas. A category without a row yet gets one
+    computed from scratch (which already includes this flush).
+    """
+    if not Config.CATEGORY_STATS_CACHE:
+        return
+
+    connection = session.connection()
+    dialect_insert = get_dialect_insert(session)
+
+    # Fixed order: concurrent transactions lock the rows in the same order
+    for category_id, (total, completed) in sorted(_count_deltas(changes).items()):
+        result = connection.execute(
+            update(CategoryTaskCounts)
+            .where(CategoryTaskCounts.category_id == category_id)
+            .values(
+                total=CategoryTaskCounts.total + total,
+                completed=CategoryTaskCounts.completed + completed
+            )
+        )
+        if result.rowcount:
+            continue
+
+        columns = ["category_id", "total", "completed"]
+        if dialect_insert is None:
+            connection.execute(
+                insert(CategoryTaskCounts).from_select(columns, _recount_statement(category_id))
+            )
+            continue
+
+        inserted = connection.execute(
+            dialect_insert(CategoryTaskCounts)
+            .from_select(columns, _recount_statement(category_id))
+            .on_conflict_do_nothing(index_elements=["category_id"])
+        )
+        if not inserted.rowcount:
+            # Another transaction created the row meanwhile; its count
+            # doesn't include our changes, so apply them as a delta
+            connection.execute(
+                update(CategoryTaskCounts)
+                .where(CategoryTaskCounts.category_id == category_id)
+                .values(
+                    total=CategoryTaskCounts.total + total,
+                    completed=CategoryTaskCounts.completed + completed
+                )
+            )
+
+
+def rebuild_category_counts(session: Session) -> int:
+    """
+    Recompute all cached category counts from the tasks table.
+    Use after enabling CATEGORY_STATS_CACHE on an existing database.
+
+    Returns:
+        Number of categories with tasks
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # Hold back concurrent delta updates until the rebuilt rows are committed
+        session.execute(text("LOCK TABLE category_task_counts IN EXCLUSIVE MODE"))
+
+    session.execute(delete(CategoryTaskCounts))
+    result = session.execute(
+        insert(CategoryTaskCounts).from_select(
+            ["category_id", "total", "completed"],
+            select(
+                Task.category_id,
+                func.count(Task.id),
+                func.count(Task.id).filter(Task.is_completed == True),
+            )
+            .where(Task.category_id.isnot(None), Task.deleted_at.is_(None))
+            .group_by(Task.category_id)
+        )
+    )
+    session.commit()
+    return result.rowcount
@@ -0,0 +1,154 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+from src.todolist.config import Config
+from src.todolist.domain.models import RollupBackfill, Task, TaskDailyStats
+from src.todolist.events.changes import TaskChange, on_flush
+from .upsert import dialect_insert as get_dialect_insert
+
+# Rollup key: (day, category_id or 0, priority)
+StatsKey = Tuple[date, int, int]
+
+NO_CATEGORY = 0
+
+
+def _day(value) -> Optional[date]:
+    """UTC day of a datetime, ISO string (event snapshot) or date."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _stats_deltas(changes: List[TaskChange]) -> Dict[StatsKey, List[int]]:
+    """Net [created, completed] change per rollup key."""
+    deltas: Dict[StatsKey, List[int]] = defaultdict(lambda: [0, 0])
+
+    def add(state: dict, sign: int):
+        category_id = state.get("category_id") or NO_CATEGORY
+        priority = state.get("priority")
+        created_day = _day(state.get("created_at"))
+        if created_day is not None:
+            deltas[(created_day, category_id, priority)][0] += sign
+        completed_day = _day(state.get("completed_at"))
+        if state.get("is_completed") and completed_day is not None:
+            deltas[(completed_day, category_id, priority)][1] += sign
+
+    for change in changes:
+        if change.kind == "created":
+            add(change.data, 1)
+        elif change.kind == "deleted":
+            add(change.data, -1)
+        elif change.previous:
+            add({**change.data, **change.previous}, -1)
+            add(change.data, 1)
+
+    return {key: delta for key, delta in deltas.items() if delta != [0, 0]}
+
+
+@on_flush
+def update_daily_stats(session: Session, changes: List[TaskChange]):
+    """
+    Apply task changes to the daily created/completed rollup, in the same
+    transaction as the changes themselves.
+
+    The rollup mirrors the current tasks table: deleting a task or moving
+    it to another category or priority moves its counts too, so a backfill
+    always yields the same numbers.
+    """
+    if not Config.ANALYTICS_ROLLUPS:
+        return
+
+    deltas = _stats_deltas(changes)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    dialect_insert = get_dialect_insert(session)
+
+    # Fixed order: concurrent transactions lock the rows in the same order
+    rows = [
+        {"day": day, "category_id": category_id, "priority": priority,
+         "created": created, "completed": completed}
+        for (day, category_id, priority), (created, completed) in sorted(deltas.items())
+    ]
+
+    if dialect_insert is not None:
+        statement = dialect_insert(TaskDailyStats).values(rows)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=["day", "category_id", "priority"],
+                set_={
+                    "created": TaskDailyStats.created + statement.excluded.created,
+                    "completed": TaskDailyStats.completed + statement.excluded.completed,
+                }
+            )
+        )
+        return
+
+    for row in rows:
+        result = connection.execute(
+            update(TaskDailyStats)
+            .where(
+                TaskDailyStats.day == row["day"],
+                TaskDailyStats.category_id == row["category_id"],
+                TaskDailyStats.priority == row["priority"]
+            )
+            .values(
+                created=TaskDailyStats.created + row["created"],
+                completed=TaskDailyStats.completed + row["completed"]
+            )
+        )
+        if not result.rowcount:
+            connection.execute(insert(TaskDailyStats).values(row))
+
+
+def backfill_daily_stats(session: Session) -> int:
+    """
+    Rebuild the daily rollup from the tasks table and mark it backfilled
+    (see RollupBackfill). Use once after upgrading, or to repair drift.
+
+    Returns:
+        Number of rollup rows written
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # Hold back concurrent delta updates until the rebuilt rows are committed
+        session.execute(text("LOCK TABLE task_daily_stats IN EXCLUSIVE MODE"))
+
+    category_id = func.coalesce(Task.category_id, NO_CATEGORY)
+    counts: Dict[StatsKey, List[int]] = defaultdict(lambda: [0, 0])
+
+    created_day = func.date(Task.created_at)
+    for day, category, priority, count in session.execute(
+        select(created_day, category_id, Task.priority, func.count(Task.id))
+        .where(Task.deleted_at.is_(None))
+        .group_by(created_day, category_id, Task.priority)
+    ):
+        counts[(_day(day), category, priority)][0] += count
+
+    completed_day = func.date(Task.completed_at)
+    for day, category, priority, count in session.execute(
+        select(completed_day, category_id, Task.priority, func.count(Task.id))
+        .where(Task.is_completed == True, Task.completed_at.isnot(None), Task.deleted_at.is_(None))
+        .group_by(completed_day, category_id, Task.priority)
+    ):
+        counts[(_day(day), category, priority)][1] += count
+
+    session.execute(delete(TaskDailyStats))
+    if counts:
+        session.execute(
+            insert(TaskDailyStats),
+            [
+                {"day": day, "category_id": category, "priority": priority,
+                 "created": created, "completed": completed}
+                for (day, category, priority), (created, completed) in sorted(counts.items())
+            ]
+        )
+    session.merge(RollupBackfill(name=TaskDailyStats.__tablename__, backfilled_at=datetime.utcnow()))
+    session.commit()
+    return len(counts)
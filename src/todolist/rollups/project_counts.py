@@ -0,0 +1,87 @@
+from collections import defaultdict
+from typing import Dict, List
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from src.todolist.config import Config
+from src.todolist.domain.models import Project, Task
+from src.todolist.events.changes import TaskChange, on_flush
+from src.todolist.repositories.base import QuotaExceededError
+
+
+def _project_deltas(changes: List[TaskChange]) -> Dict[int, int]:
+    """Net change of the task count per project id."""
+    deltas: Dict[int, int] = defaultdict(int)
+
+    for change in changes:
+        project_id = change.data.get("project_id")
+        if change.kind == "created":
+            old_project_id = None
+        elif change.kind == "deleted":
+            old_project_id, project_id = project_id, None
+        else:
+            old_project_id = change.previous.get("project_id", project_id)
+        if old_project_id != project_id:
+            if old_project_id is not None:
+                deltas[old_project_id] -= 1
+            if project_id is not None:
+                deltas[project_id] += 1
+
+    return {pid: delta for pid, delta in deltas.items() if delta}
+
+
+@on_flush
+def update_project_task_counts(session: Session, changes: List[TaskChange]):
+    """
+    Apply task changes to Project.task_count and enforce MAX_TASKS_PER_PROJECT,
+    in the same transaction as the changes themselves.
+
+    Growth is a conditional UPDATE (task_count + n <= quota): the row lock
+    it takes serializes concurrent inserts into the same project, and a
+    project that would go over quota makes the whole flush fail.
+
+    Raises:
+        QuotaExceededError: If a project would exceed MAX_TASKS_PER_PROJECT
+    """
+    deltas = _project_deltas(changes)
+    if not deltas:
+        return
+
+    connection = session.connection()
+
+    # Fixed order: concurrent transactions lock the rows in the same order
+    for project_id, delta in sorted(deltas.items()):
+        statement = (
+            update(Project)
+            .where(Project.id == project_id)
+            .values(task_count=Project.task_count + delta)
+        )
+        if delta < 0:
+            connection.execute(statement)
+            continue
+
+        result = connection.execute(
+            statement.where(Project.task_count + delta <= Config.MAX_TASKS_PER_PROJECT)
+        )
+        if not result.rowcount:
+            raise QuotaExceededError(
+                f"Project {project_id} can't have more than {Config.MAX_TASKS_PER_PROJECT} tasks"
+            )
+
+
+def rebuild_project_counts(session: Session) -> int:
+    """
+    Recompute Project.task_count from the tasks table.
+    Use to repair drift (e.g. after tasks were changed outside the application).
+
+    Returns:
+        Number of projects updated
+    """
+    result = session.execute(
+        update(Project).values(
+            task_count=select(func.count(Task.id))
+            .where(Task.project_id == Project.id, Task.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+    )
+    session.commit()
+    return result.rowcount
@@ -0,0 +1,16 @@
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(session: Session):
+    """
+    Return the dialect's insert() construct supporting ON CONFLICT
+    (PostgreSQL, SQLite), or None for other databases.
+    """
+    name = session.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
@@ -1,3 +1,5 @@
-from .tasks import close_overdue_tasks, run_scheduler
+from .tasks import close_overdue_tasks, purge_deleted_tasks, run_scheduler
+from .leader import LeaderElector
+from .background import BackgroundScheduler
 
-__all__ = ['close_overdue_tasks', 'run_scheduler']
+__all__ = ['close_overdue_tasks', 'purge_deleted_tasks', 'run_scheduler', 'LeaderElector', 'BackgroundScheduler']
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from src.todolist.config import Config
+from src.todolist.scheduler.leader import LeaderElector
+from src.todolist.scheduler.tasks import close_overdue_tasks, purge_deleted_tasks
+
+
+class BackgroundScheduler:
+    """
+    Runs the overdue task closer (and the purge of soft-deleted tasks)
+    inside the API process as an asyncio task.
+
+    Database work (leader election and the closer itself) is offloaded to
+    worker threads, so the event loop keeps serving requests. Takes part in
+    the same leader election as `tasks:autoclose-overdue --daemon`, so API
+    replicas and standalone daemons can be mixed freely.
+    """
+
+    def __init__(self, interval_minutes: int = None, poll_seconds: int = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            interval_minutes: Minutes between runs (default: AUTOCLOSE_INTERVAL_MINUTES)
+            poll_seconds: Seconds between leader checks (default: SCHEDULER_POLL_SECONDS)
+        """
+        self.interval_seconds = (interval_minutes or Config.AUTOCLOSE_INTERVAL_MINUTES) * 60
+        self.poll_seconds = poll_seconds or Config.SCHEDULER_POLL_SECONDS
+        self.purge_interval_seconds = Config.PURGE_INTERVAL_MINUTES * 60
+        # The in-memory backend is process-local: there is nobody to elect against
+        self._elector = None if Config.STORAGE_BACKEND == "memory" else LeaderElector("close_overdue_tasks")
+        self._stopping = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        """
+        Start the scheduler loop on the running event loop.
+        """
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="overdue-scheduler")
+
+    async def stop(self):
+        """
+        Stop the scheduler loop.
+        Waits for an in-flight run to finish, then releases leadership.
+        """
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self._elector is not None:
+            await asyncio.to_thread(self._elector.release)
+
+    def _run_job(self, job):
+        # Keep the lease renewed while the job runs (worker thread)
+        if self._elector is None:
+            job()
+        else:
+            with self._elector.heartbeat():
+                job()
+
+    async def _run(self):
+        last_run = None
+        last_purge = None
+
+        while not self._stopping.is_set():
+            is_leader = (
+                self._elector is None
+                or await asyncio.to_thread(self._elector.ensure_leadership)
+            )
+
+            if not is_leader:
+                # Run immediately if we take over later
+                last_run = last_purge = None
+            else:
+                if last_run is None or time.monotonic() - last_run >= self.interval_seconds:
+                    await asyncio.to_thread(self._run_job, close_overdue_tasks)
+                    last_run = time.monotonic()
+                if last_purge is None or time.monotonic() - last_purge >= self.purge_interval_seconds:
+                    await asyncio.to_thread(self._run_job, purge_deleted_tasks)
+                    last_purge = time.monotonic()
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,170 @@
+import os
+import socket
+import threading
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import text, update, or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal, get_engine
+from src.todolist.domain.models import SchedulerLease
+
+
+class LeaderElector:
+    """
+    Elects a single scheduler replica as leader, so that only one node
+    runs each scheduled job.
+
+    PostgreSQL: a session-level advisory lock held on a dedicated connection.
+    The server releases it as soon as the leader's connection dies, so a
+    standby takes over on its next poll.
+
+    Other databases (e.g. SQLite): a row in scheduler_leases that the leader
+    renews on every poll, and from heartbeat() while a job runs. A standby
+    takes over once the lease expires.
+    """
+
+    def __init__(self, name: str, lease_seconds: int = None):
+        """
+        Initialize elector.
+
+        Args:
+            name: Lock name, shared by all replicas running the same jobs
+            lease_seconds: Lease duration for the lease-table fallback
+        """
+        self.name = name
+        self.lease_seconds = lease_seconds or Config.SCHEDULER_LEASE_SECONDS
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lock_key = zlib.crc32(name.encode())
+        self.is_leader = False
+        self._connection = None
+
+    def ensure_leadership(self) -> bool:
+        """
+        Acquire leadership, or confirm it is still held.
+        Must be called at least once per lease period by the leader.
+
+        Returns:
+            True if this replica is the leader
+        """
+        try:
+            if get_engine().dialect.name == "postgresql":
+                self.is_leader = self._ensure_advisory_lock()
+            else:
+                self.is_leader = self._renew_lease()
+        except SQLAlchemyError as e:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{timestamp}] ❌ Leader election error: {e}")
+            self._close_connection()
+            self.is_leader = False
+        return self.is_leader
+
+    @contextmanager
+    def heartbeat(self):
+        """
+        Keep renewing leadership from a background thread while a job runs.
+        Without it a job that outlasts the lease (e.g. a large overdue
+        close) lets a standby take over and run the same job concurrently.
+        """
+        stopping = threading.Event()
+
+        def renew():
+            while not stopping.wait(self.lease_seconds / 3):
+                if not self.ensure_leadership():
+                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    print(f"[{timestamp}] ❌ Lost scheduler leadership during a job")
+
+        thread = threading.Thread(target=renew, name=f"{self.name}-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopping.set()
+            thread.join()
+
+    def release(self):
+        """
+        Give up leadership so a standby can take over immediately.
+        """
+        try:
+            if self.is_leader:
+                if get_engine().dialect.name == "postgresql":
+                    self._connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key}
+                    )
+                    self._connection.commit()
+                else:
+                    db = WriteSessionLocal()
+                    try:
+                        db.execute(
+                            update(SchedulerLease)
+                            .where(SchedulerLease.name == self.name)
+                            .where(SchedulerLease.holder == self.holder)
+                            .values(expires_at=datetime.utcnow())
+                        )
+                        db.commit()
+                    finally:
+                        db.close()
+        except SQLAlchemyError:
+            pass  # Lock/lease expires on its own
+        finally:
+            self.is_leader = False
+            self._close_connection()
+
+    def _ensure_advisory_lock(self) -> bool:
+        if self._connection is None:
+            self._connection = get_engine().connect()
+
+        if self.is_leader:
+            # The lock lives as long as this connection,
+            # so a liveness check is enough to confirm we still hold it
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+            return True
+
+        acquired = self._connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+        ).scalar()
+        self._connection.commit()
+        return bool(acquired)
+
+    def _renew_lease(self) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+
+        db = WriteSessionLocal()
+        try:
+            # Conditional UPDATE: renew our own lease or steal an expired one
+            result = db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name)
+                .where(or_(
+                    SchedulerLease.holder == self.holder,
+                    SchedulerLease.expires_at < now
+                ))
+                .values(holder=self.holder, expires_at=expires_at)
+            )
+
+            if result.rowcount == 0:
+                # Either the lease row doesn't exist yet or another replica holds it
+                try:
+                    db.add(SchedulerLease(name=self.name, holder=self.holder, expires_at=expires_at))
+                    db.flush()
+                except IntegrityError:
+                    db.rollback()
+                    return False
+
+            db.commit()
+            return True
+        finally:
+            db.close()
+
+    def _close_connection(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except SQLAlchemyError:
+                pass
+            self._connection = None
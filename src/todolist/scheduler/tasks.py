@@ -1,8 +1,10 @@
 import schedule
 import time
-from datetime import datetime
-from src.todolist.db.session import SessionLocal
+from datetime import datetime, timedelta
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
 from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.scheduler.leader import LeaderElector
 
 
 def close_overdue_tasks():
@@ -10,9 +12,14 @@ def close_overdue_tasks():
     Automatically close overdue tasks.
     This function is called periodically by the scheduler.
     """
-    db = SessionLocal()
+    db = None
     try:
-        repo = TaskRepository(db)
+        if Config.STORAGE_BACKEND == "memory":
+            from src.todolist.infrastructure.memory_backend import InMemoryTaskRepository, get_memory_store
+            repo = InMemoryTaskRepository(get_memory_store())
+        else:
+            db = WriteSessionLocal()
+            repo = TaskRepository(db)
         closed_count = repo.mark_overdue_as_closed()
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -24,33 +31,120 @@ def close_overdue_tasks():
     except Exception as e:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{timestamp}] ❌ Error in scheduler: {e}")
+    finally:
+        if db is not None:
+            db.close()
+
+
+def in_quiet_hours(now: datetime, quiet_hours: str = None) -> bool:
+    """
+    Check whether `now` (UTC) falls in PURGE_QUIET_HOURS, e.g. "1-5"
+    (01:00 to 04:59; "22-4" wraps midnight). Empty means any time.
+    """
+    quiet_hours = Config.PURGE_QUIET_HOURS if quiet_hours is None else quiet_hours
+    if not quiet_hours.strip():
+        return True
+    start, end = (int(hour) for hour in quiet_hours.split("-"))
+    if start <= end:
+        return start <= now.hour < end
+    return now.hour >= start or now.hour < end
+
+
+def purge_deleted_tasks(any_time: bool = False) -> int:
+    """
+    Physically remove soft-deleted tasks, in small batches.
+    This function is called periodically by the scheduler.
+    
+    Runs only during PURGE_QUIET_HOURS (unless any_time) and for at most
+    PURGE_MAX_RUN_SECONDS; batches of PURGE_BATCH_SIZE are paced to
+    PURGE_ROWS_PER_SECOND, so the purge never competes with peak traffic
+    for locks and I/O.
+    
+    Returns:
+        Number of tasks purged
+    """
+    def allowed() -> bool:
+        return any_time or in_quiet_hours(datetime.utcnow())
+
+    if Config.STORAGE_BACKEND == "memory" or not allowed():
+        return 0  # Deletes are immediate in memory
+
+    db = WriteSessionLocal()
+    purged = 0
+    try:
+        repo = TaskRepository(db)
+        deleted_before = datetime.utcnow() - timedelta(minutes=Config.PURGE_RETENTION_MINUTES)
+        pause = Config.PURGE_BATCH_SIZE / Config.PURGE_ROWS_PER_SECOND if Config.PURGE_ROWS_PER_SECOND > 0 else 0
+        deadline = time.monotonic() + Config.PURGE_MAX_RUN_SECONDS
+        
+        while True:
+            count = repo.purge_deleted(deleted_before, Config.PURGE_BATCH_SIZE)
+            purged += count
+            if count < Config.PURGE_BATCH_SIZE:
+                break
+            if time.monotonic() + pause >= deadline or not allowed():
+                break
+            time.sleep(pause)
+        
+        if purged > 0:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{timestamp}] 🧹 Purged {purged} deleted task(s)")
+            
+    except Exception as e:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{timestamp}] ❌ Error in purge job: {e}")
     finally:
         db.close()
+    return purged
 
 
 def run_scheduler():
     """
     Run the task scheduler.
     This function runs in a separate process and executes scheduled tasks.
+    
+    Several replicas can run it at once for availability: they elect a leader
+    and only the leader executes jobs. Standbys poll every few seconds and
+    take over when the leader goes away.
     """
     print("🚀 Task Scheduler started...")
-    print("⏰ Schedule: Check overdue tasks every 15 minutes")
+    print(f"⏰ Schedule: Check overdue tasks every {Config.AUTOCLOSE_INTERVAL_MINUTES} minutes")
+    print(f"🧹 Schedule: Purge deleted tasks every {Config.PURGE_INTERVAL_MINUTES} minutes")
+    print(f"👑 Leader election: polling every {Config.SCHEDULER_POLL_SECONDS} seconds")
     print("=" * 50)
     
-    # Schedule the task to run every 15 minutes
-    schedule.every(15).minutes.do(close_overdue_tasks)
+    # Schedule the task to run every 15 minutes (AUTOCLOSE_INTERVAL_MINUTES)
+    schedule.every(Config.AUTOCLOSE_INTERVAL_MINUTES).minutes.do(close_overdue_tasks)
+    schedule.every(Config.PURGE_INTERVAL_MINUTES).minutes.do(purge_deleted_tasks)
     
     # Alternative schedules (commented out):
     # schedule.every().day.at("02:00").do(close_overdue_tasks)  # Daily at 2 AM
     # schedule.every().hour.do(close_overdue_tasks)  # Every hour
     
-    # Run immediately for testing
-    close_overdue_tasks()
+    elector = LeaderElector("close_overdue_tasks")
+    was_leader = False
     
     # Main scheduler loop
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every 60 seconds
+    try:
+        while True:
+            is_leader = elector.ensure_leadership()
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            
+            if is_leader and not was_leader:
+                print(f"[{timestamp}] 👑 This replica is now the scheduler leader")
+                # Run immediately on takeover, so a failover doesn't skip a run
+                with elector.heartbeat():
+                    schedule.run_all()
+            elif is_leader:
+                with elector.heartbeat():
+                    schedule.run_pending()
+            elif was_leader:
+                print(f"[{timestamp}] ⏸️  Lost scheduler leadership, standing by")
+            
+            was_leader = is_leader
+            time.sleep(Config.SCHEDULER_POLL_SECONDS)
+    finally:
+        elector.release()
 
 
 if __name__ == "__main__":
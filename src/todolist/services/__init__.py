@@ -1,3 +1,4 @@
 from .task_service import TaskService
+from .project_service import ProjectService
 
-__all__ = ['TaskService']
+__all__ = ['TaskService', 'ProjectService']
@@ -0,0 +1,105 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import List, Optional, Tuple
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.repositories.task_repository import TaskRepository
+
+
+class CompletionTimeoutError(Exception):
+    """A queued completion wasn't committed within the batcher's timeout."""
+
+
+class CompletionBatcher:
+    """
+    Group commit for task completions.
+
+    Callers queue a task ID and block; a single flusher thread collects
+    requests for `window_ms` (or until `max_batch` are queued), completes
+    them with one UPDATE in one transaction, and hands every caller its
+    own result. While a batch is being written the next one fills up, so
+    a burst costs one commit per batch instead of one per request.
+    """
+
+    def __init__(self, window_ms: float, max_batch: int, timeout: float = None):
+        """
+        Initialize batcher (the flusher thread starts with the first request).
+
+        Args:
+            window_ms: How long to collect requests before writing
+            max_batch: Write as soon as this many requests are queued
+            timeout: How long a caller waits for its batch (default: COMPLETION_BATCH_TIMEOUT_SECONDS)
+        """
+        self.window_seconds = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self.timeout = timeout or Config.COMPLETION_BATCH_TIMEOUT_SECONDS
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, Future]] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def complete(self, task_id: int) -> bool:
+        """
+        Complete a task in the next batch and wait until it is committed.
+
+        Returns:
+            True if the task exists (completed now or before), False if not found
+
+        Raises:
+            CompletionTimeoutError: If the batch wasn't committed within `timeout`
+                (a batch already being written may still complete the task)
+        """
+        entry = (task_id, Future())
+        with self._cond:
+            self._queue.append(entry)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="completion-batcher", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        try:
+            return entry[1].result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._cond:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+            raise CompletionTimeoutError(f"Completion of task {task_id} timed out")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.window_seconds
+                while len(self._queue) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+            self._flush(batch)
+
+    @staticmethod
+    def _flush(batch: List[Tuple[int, Future]]):
+        # Never raises: the flusher thread must outlive a failed batch
+        try:
+            db = WriteSessionLocal()
+            try:
+                found = TaskRepository(db).mark_many_as_completed(task_id for task_id, _ in batch)
+            finally:
+                db.close()
+        except Exception as e:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{timestamp}] ❌ Error completing {len(batch)} task(s): {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for task_id, future in batch:
+            future.set_result(task_id in found)
+
+
+# Shared by all TaskService instances of the process (used when COMPLETION_BATCH_MS > 0)
+completion_batcher = CompletionBatcher(Config.COMPLETION_BATCH_MS, Config.COMPLETION_BATCH_MAX)
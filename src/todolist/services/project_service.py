@@ -0,0 +1,112 @@
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from src.todolist.domain.models import Project, Task
+from src.todolist.repositories.base import QuotaExceededError
+from src.todolist.repositories.project_repository import ProjectRepository
+from .task_service import TaskService
+
+
+class ProjectService:
+    """
+    Service class for projects and their tasks (SQL backend only).
+    Task operations are delegated to TaskService on the same session.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize the service with a database session.
+        """
+        self.db = db
+        self.project_repo = ProjectRepository(db)
+        self.tasks = TaskService(db)
+
+    def get_projects(self) -> List[Project]:
+        """
+        List all projects with their task counts.
+        Used by GET /projects endpoint.
+        """
+        return self.project_repo.get_projects()
+
+    def get_project(self, project_id: int) -> Optional[Project]:
+        """
+        Retrieve a single project by ID.
+        Used by GET /projects/{project_id}.
+        """
+        return self.project_repo.get_by_id(project_id)
+
+    def create_project(self, name: str, description: Optional[str] = None) -> Project:
+        """
+        Create a new project.
+        Raises ValueError if the name is taken and QuotaExceededError
+        once MAX_PROJECTS projects exist.
+        """
+        name = name.strip()
+        if self.project_repo.get_by_name(name):
+            raise ValueError("Project name already exists")
+        try:
+            return self.project_repo.create_project(name=name, description=description)
+        except QuotaExceededError:
+            self.db.rollback()
+            raise
+
+    def delete_project(self, project_id: int) -> bool:
+        """
+        Delete a project together with its tasks.
+        Returns True if deleted, False if not found.
+        """
+        return self.project_repo.delete(project_id)
+
+    def get_project_tasks(
+        self,
+        project_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        completed: Optional[bool] = None,
+        search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        sort: str = "default",
+    ) -> List[Task]:
+        """
+        Get a paginated list of a project's tasks, with the same filters as
+        TaskService.get_tasks.
+        Used by GET /projects/{project_id}/tasks endpoint.
+        """
+        return self.tasks.get_tasks(
+            skip=skip,
+            limit=limit,
+            completed=completed,
+            search=search,
+            overdue=overdue,
+            sort=sort,
+            project_id=project_id
+        )
+
+    def create_project_task(
+        self,
+        project_id: int,
+        title: str,
+        description: Optional[str] = None,
+        priority: int = 2,
+        due_date: Optional[datetime] = None,
+        category_name: Optional[str] = None
+    ) -> Task:
+        """
+        Create a task in a project.
+        Raises QuotaExceededError if the project already holds
+        MAX_TASKS_PER_PROJECT tasks.
+        Used by POST /projects/{project_id}/tasks endpoint.
+        """
+        try:
+            return self.tasks.create_task(
+                title=title,
+                description=description,
+                priority=priority,
+                due_date=due_date,
+                category_name=category_name,
+                project_id=project_id
+            )
+        except QuotaExceededError:
+            self.db.rollback()
+            raise
@@ -0,0 +1,78 @@
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+
+class _Call:
+    """An in-flight execution and its outcome."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller of a key runs
+    the function, callers arriving while it runs wait and get the same
+    result (or exception). Nothing is cached once the call returns.
+
+    Followers may see a result whose query started just before they
+    arrived, i.e. at most one execution older than a direct call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # operation name -> [executions, coalesced calls]
+        self._stats: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+    def do(self, key: Tuple, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Call identity; key[0] is the operation name used in stats
+            fn: Function to run
+
+        Returns:
+            Result of fn (shared with the other callers)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._stats[key[0]][0 if leader else 1] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Executions and coalesced calls per operation since startup."""
+        with self._lock:
+            return {
+                name: {"executions": executions, "coalesced": coalesced}
+                for name, (executions, coalesced) in self._stats.items()
+            }
+
+
+# Shared by all TaskService instances of the process
+single_flight = SingleFlight()
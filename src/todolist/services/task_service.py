@@ -1,10 +1,17 @@
-from typing import List, Optional, Dict
-from datetime import datetime
+import json
+import uuid
+from typing import Iterator, List, Optional, Dict
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 
+from src.todolist.audit import audit_log
+from src.todolist.config import Config
 from src.todolist.domain.models import Task
+from src.todolist.repositories.base import DEFER_COMMIT_KEY
 from src.todolist.repositories.task_repository import TaskRepository
 from src.todolist.repositories.category_repository import CategoryRepository
+from .completion_batcher import completion_batcher
+from .single_flight import single_flight
 
 
 class TaskService:
@@ -13,14 +20,15 @@ class TaskService:
     Acts as an orchestrator between repositories and presentation layer.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session], task_repo=None, category_repo=None):
         """
         Initialize the service with a database session.
-        Creates instances of required repositories.
+        Creates instances of required repositories, unless other
+        implementations (e.g. the in-memory backend) are passed in.
         """
         self.db = db
-        self.task_repo = TaskRepository(db)
-        self.category_repo = CategoryRepository(db)
+        self.task_repo = task_repo or TaskRepository(db)
+        self.category_repo = category_repo or CategoryRepository(db)
 
     def get_tasks(
         self,
@@ -28,19 +36,48 @@ class TaskService:
         limit: int = 100,
         completed: Optional[bool] = None,
         search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        sort: str = "default",
+        project_id: Optional[int] = None,
     ) -> List[Task]:
         """
         Get a paginated list of tasks with optional filtering and search.
         Categories are eagerly loaded for API responses.
-        Used by GET /tasks endpoint.
+        Concurrent identical calls share one query (see _coalesce).
+        Used by GET /tasks and GET /projects/{id}/tasks endpoints.
         """
-        return self.task_repo.get_tasks(
-            skip=skip,
-            limit=limit,
-            completed=completed,
-            search=search
+        return self._coalesce(
+            ("get_tasks", skip, limit, completed, search, overdue, sort, project_id),
+            lambda: self.task_repo.get_tasks(
+                skip=skip,
+                limit=limit,
+                completed=completed,
+                search=search,
+                overdue=overdue,
+                sort=sort,
+                project_id=project_id
+            )
         )
 
+    def count_tasks(
+        self,
+        completed: Optional[bool] = None,
+        search: Optional[str] = None,
+        overdue: Optional[bool] = None,
+        mode: str = "exact",
+        project_id: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Total number of tasks matching the get_tasks filters.
+        mode: "exact" (a full COUNT), "estimated" (counters, rollups or planner
+        statistics, see TaskRepository.estimate_task_count) or "none".
+        Used for the X-Total-Count header of the task listings.
+        """
+        if mode == "none":
+            return None
+        count = self.task_repo.estimate_task_count if mode == "estimated" else self.task_repo.count_tasks
+        return count(completed=completed, search=search, overdue=overdue, project_id=project_id)
+
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
         """
         Retrieve a single task by ID with its category eagerly loaded.
@@ -48,17 +85,40 @@ class TaskService:
         """
         return self.task_repo.get_by_id_with_category(task_id)
 
+    def get_next_tasks(
+        self,
+        n: int = 1,
+        claim: bool = False,
+        worker: Optional[str] = None
+    ) -> List[Task]:
+        """
+        Get the next open tasks by priority, then due date.
+        With claim=True the tasks are claimed for `worker` for
+        TASK_CLAIM_SECONDS, so concurrent workers get distinct tasks.
+        Used by GET /tasks/next endpoint.
+        """
+        if not claim:
+            return self.task_repo.get_next_tasks(n)
+        return self.task_repo.get_next_tasks(
+            n,
+            claim_by=worker or uuid.uuid4().hex,
+            claim_seconds=Config.TASK_CLAIM_SECONDS
+        )
+
     def create_task(
         self,
         title: str,
         description: Optional[str] = None,
         priority: int = 2,
         due_date: Optional[datetime] = None,
-        category_name: Optional[str] = None
+        category_name: Optional[str] = None,
+        project_id: Optional[int] = None
     ) -> Task:
         """
-        Create a new task with optional category.
+        Create a new task with optional category and project.
         If category_name is provided, it will be created if not exists.
+        In a project, raises QuotaExceededError once the project holds
+        MAX_TASKS_PER_PROJECT tasks.
         Returns the created task with category loaded (for API response).
         """
         category_id = None
@@ -72,7 +132,8 @@ class TaskService:
             description=description,
             priority=priority,
             due_date=due_date,
-            category_id=category_id
+            category_id=category_id,
+            project_id=project_id
         )
 
         # Re-fetch with category eagerly loaded so it's included in JSON response
@@ -85,18 +146,17 @@ class TaskService:
         description: Optional[str] = None,
         priority: Optional[int] = None,
         due_date: Optional[datetime] = None,
-        category_name: Optional[str] = None
+        category_name: Optional[str] = None,
+        expected_version: Optional[int] = None
     ) -> Optional[Task]:
         """
         Update an existing task.
         Only provided fields are updated.
         Handles category assignment or removal.
+        With expected_version (PATCH If-Match), raises StaleVersionError
+        unless the task is still at that version (checked by the UPDATE).
         Returns updated task with category loaded, or None if not found.
         """
-        task = self.task_repo.get_by_id(task_id)
-        if not task:
-            return None
-
         update_data: Dict[str, any] = {}
 
         if title is not None:
@@ -117,7 +177,7 @@ class TaskService:
                 update_data['category_id'] = None  # Remove category
 
         # Perform update
-        updated_task = self.task_repo.update(task_id, **update_data)
+        updated_task = self.task_repo.update(task_id, expected_version=expected_version, **update_data)
         if updated_task:
             # Reload with category for consistent API response
             return self.task_repo.get_by_id_with_category(task_id)
@@ -127,8 +187,15 @@ class TaskService:
         """
         Mark a task as completed.
         Sets is_completed=True and completed_at timestamp.
+        With COMPLETION_BATCH_MS set, the completion is group-committed
+        with concurrent ones (see CompletionBatcher).
         Returns updated task with category loaded.
         """
+        if self._batch_completions():
+            if not completion_batcher.complete(task_id):
+                return None
+            return self.task_repo.get_by_id_with_category(task_id)
+
         task = self.task_repo.mark_as_completed(task_id)
         if task:
             return self.task_repo.get_by_id_with_category(task_id)
@@ -144,9 +211,113 @@ class TaskService:
     def get_statistics(self) -> dict:
         """
         Get current task statistics.
+        Concurrent calls share one set of queries (see _coalesce).
         Used by GET /tasks/stats endpoint.
         """
-        return self.task_repo.get_statistics()
+        return self._coalesce(("get_statistics",), self.task_repo.get_statistics)
+
+    def get_category_statistics(self) -> List[dict]:
+        """
+        Get task counts per category, from the rollup cache when
+        CATEGORY_STATS_CACHE is enabled.
+        Used by GET /categories/stats endpoint.
+        """
+        return self._coalesce(
+            ("get_category_statistics",),
+            lambda: self.category_repo.get_statistics(cached=Config.CATEGORY_STATS_CACHE)
+        )
+
+    def get_analytics(
+        self,
+        bucket: str = "day",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        category_id: Optional[int] = None,
+        priority: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Tasks created and completed per day or week (weeks start on Monday),
+        category and priority, between start and end (inclusive, UTC).
+        Defaults to the last 30 days.
+        Used by GET /tasks/analytics endpoint.
+        """
+        end = end or datetime.utcnow().date()
+        start = start or end - timedelta(days=29)
+        rows = self.task_repo.get_daily_stats(
+            start, end, category_id=category_id, priority=priority
+        )
+        if bucket == "day":
+            for row in rows:
+                row['bucket'] = row.pop('day')
+            return rows
+
+        weeks: Dict[tuple, dict] = {}
+        for row in rows:
+            week = row['day'] - timedelta(days=row['day'].weekday())
+            key = (week, row['category_id'] or 0, row['priority'])
+            totals = weeks.setdefault(key, {
+                'bucket': week,
+                'category_id': row['category_id'],
+                'priority': row['priority'],
+                'created': 0,
+                'completed': 0
+            })
+            totals['created'] += row['created']
+            totals['completed'] += row['completed']
+        return [weeks[key] for key in sorted(weeks)]
+
+    def get_task_history(self, task_id: int, limit: int = 100) -> Optional[List[dict]]:
+        """
+        Field-level change history of a task, newest first, including
+        entries the audit log hasn't written yet (from this process).
+        Returns None if the task never existed or has no history.
+        Used by GET /tasks/{task_id}/history endpoint.
+        """
+        entries = self.task_repo.get_history(task_id, limit=limit)
+        if self.db is not None:
+            written = {entry['id'] for entry in entries}
+            entries += [
+                dict(entry, changes=json.loads(entry['changes']))
+                for entry in audit_log.pending(task_id)
+                if entry['id'] not in written
+            ]
+            entries.sort(key=lambda e: (e['changed_at'], e['version'] or 0), reverse=True)
+            entries = entries[:limit]
+        if not entries and not self.task_repo.get_by_id(task_id):
+            return None
+        return entries
+
+    def iter_tasks(
+        self,
+        status: Optional[str] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[Task]:
+        """
+        Stream tasks in ID order without loading them all into memory.
+        status: "pending", "completed", "overdue" or None for all.
+        Used by the CLI listing commands.
+        """
+        return self.task_repo.iter_tasks(status=status, skip=skip, limit=limit)
+
+    def _coalesce(self, key: tuple, fn):
+        """
+        Run a read through the process-wide single-flight group, so a burst
+        of identical requests runs it once (SINGLE_FLIGHT, see GET /metrics).
+        Reads inside a caller-owned transaction (batch mode) see their own
+        uncommitted changes and are never shared.
+        """
+        if not Config.SINGLE_FLIGHT or (self.db is not None and self.db.info.get(DEFER_COMMIT_KEY)):
+            return fn()
+        return single_flight.do(key, fn)
+
+    def _batch_completions(self) -> bool:
+        # Only for the SQL backend, and not inside a caller-owned transaction
+        return (
+            Config.COMPLETION_BATCH_MS > 0
+            and self.db is not None
+            and not self.db.info.get(DEFER_COMMIT_KEY)
+        )
 
     # Legacy methods kept for backward compatibility (CLI, tests, etc.)
     # These were part of Phase 2 and remain unchanged
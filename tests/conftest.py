@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+# Configuration is read at import time: point everything at a throwaway
+# SQLite database before any application module is imported
+_data_dir = tempfile.mkdtemp(prefix="todolist-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_data_dir, 'test.db')}"
+os.environ["STORAGE_BACKEND"] = "sql"
+os.environ["SQLITE_BUSY_TIMEOUT_MS"] = "2000"
+# Background writers are enabled by the tests that need them
+os.environ["AUDIT_LOG"] = "False"
+os.environ["OUTBOX_ENABLED"] = "False"
+
+import pytest
+from fastapi.testclient import TestClient
+from src.todolist.db.session import Base, SessionLocal, WriteSessionLocal, get_engine
+from src.todolist.domain import models  # noqa: F401 (registers all tables)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once per test run."""
+    Base.metadata.create_all(get_engine())
+    yield get_engine()
+    get_engine().dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_database(database):
+    """Empty every table after each test."""
+    yield
+    with database.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def db():
+    """A write session, closed after the test."""
+    session = WriteSessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def read_db():
+    """A read-only session, closed after the test."""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client():
+    """API client (imports the app on first use)."""
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
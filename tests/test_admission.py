@@ -0,0 +1,17 @@
+import pytest
+
+from src.todolist.api.admission import AdmissionControlMiddleware
+
+
+@pytest.mark.parametrize("method, path, route_class", [
+    ("GET", "/tasks/", "read"),
+    ("POST", "/tasks/", "write"),
+    ("GET", "/categories/stats", "read"),
+    ("GET", "/projects/", "read"),
+    ("POST", "/projects/1/tasks", "write"),
+    ("DELETE", "/projects/1", "write"),
+    ("GET", "/tasks/stream", None),
+    ("GET", "/docs", None),
+])
+def test_database_routes_are_admission_limited(method, path, route_class):
+    assert AdmissionControlMiddleware._route_class({"method": method, "path": path}) == route_class
@@ -0,0 +1,155 @@
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from src.todolist.audit.log import AuditLog
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.domain.models import TaskHistory
+
+
+def history_entry(task_id=1, kind="updated"):
+    return {
+        "id": uuid.uuid4().hex,
+        "changed_at": datetime.utcnow(),
+        "task_id": task_id,
+        "version": 1,
+        "kind": kind,
+        "source": "api",
+        "changes": "{}",
+    }
+
+
+def written_rows():
+    with WriteSessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(TaskHistory))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def make_log():
+    logs = []
+
+    def make(flush_ms=10, batch_size=50, buffer_size=1000, enqueue_timeout=1):
+        log = AuditLog(flush_ms, batch_size, buffer_size, enqueue_timeout)
+        logs.append(log)
+        return log
+
+    yield make
+    for log in logs:
+        log.close()
+
+
+def test_entries_are_written_in_batches(make_log, monkeypatch):
+    log = make_log(flush_ms=50, batch_size=50)
+    batches = []
+    original = log._write
+    monkeypatch.setattr(log, "_write", lambda entries: (batches.append(len(entries)), original(entries)))
+
+    log.add([history_entry() for _ in range(120)])
+    wait_for(lambda: log.stats()["written"] == 120)
+
+    assert batches == [50, 50, 20]
+    assert written_rows() == 120
+    assert log.stats() == {"written": 120, "dropped": 0, "buffered": 0}
+
+
+def test_full_buffer_drops_and_counts(make_log, monkeypatch):
+    log = make_log(flush_ms=1, batch_size=5, buffer_size=5, enqueue_timeout=0.1)
+    release = threading.Event()
+    original = log._write
+
+    def blocked_write(entries):
+        release.wait()
+        original(entries)
+
+    monkeypatch.setattr(log, "_write", blocked_write)
+
+    log.add([history_entry() for _ in range(5)])
+    wait_for(lambda: len(log._writing) == 5)  # first batch is being written
+    log.add([history_entry() for _ in range(5)])  # fills the buffer
+
+    start = time.monotonic()
+    log.add([history_entry() for _ in range(3)])
+    assert time.monotonic() - start >= 0.1  # waited for room first
+
+    assert log.stats() == {"written": 0, "dropped": 3, "buffered": 10}
+    release.set()
+    wait_for(lambda: log.stats()["written"] == 10)
+    assert written_rows() == 10
+
+
+def test_close_flushes_buffered_entries(make_log):
+    log = make_log(flush_ms=60_000, batch_size=1000)
+    log.add([history_entry() for _ in range(10)])
+
+    start = time.monotonic()
+    log.close()
+
+    assert time.monotonic() - start < 5
+    assert log.stats() == {"written": 10, "dropped": 0, "buffered": 0}
+    assert written_rows() == 10
+
+
+def test_add_after_close_writes_without_holding_the_lock(make_log, monkeypatch):
+    log = make_log()
+    log.close()
+    original = log._write
+    readable = []
+
+    def checking_write(entries):
+        # Another thread can still use the log while the INSERT runs
+        reader = threading.Thread(target=lambda: readable.append(log.stats()))
+        reader.start()
+        reader.join(timeout=2)
+        original(entries)
+
+    monkeypatch.setattr(log, "_write", checking_write)
+    log.add([history_entry()])
+
+    assert len(readable) == 1
+    assert log.stats()["written"] == 1
+    assert written_rows() == 1
+
+
+@pytest.fixture
+def api_log(make_log, monkeypatch):
+    """Fresh audit log used by the API, with history enabled."""
+    log = make_log(flush_ms=10)
+    monkeypatch.setattr(Config, "AUDIT_LOG", True)
+    monkeypatch.setattr("src.todolist.audit.writer.audit_log", log)
+    monkeypatch.setattr("src.todolist.services.task_service.audit_log", log)
+    return log
+
+
+def test_history_merges_written_and_pending_entries(client, api_log):
+    task = client.post("/tasks/", json={"title": "Tracked task"}).json()
+    wait_for(lambda: api_log.stats()["written"] == 1)
+
+    # Later changes stay buffered
+    api_log.flush_seconds = 60
+    api_log.batch_size = 1000
+    client.patch(f"/tasks/{task['id']}", json={"priority": 3})
+    client.patch(f"/tasks/{task['id']}/complete")
+    assert api_log.stats()["buffered"] >= 2
+
+    history = client.get(f"/tasks/{task['id']}/history").json()
+
+    assert [entry["kind"] for entry in history] == ["completed", "updated", "created"]
+    assert history[1]["changes"] == {"priority": [2, 3]}
+    assert history[2]["changes"]["title"] == [None, "Tracked task"]
+    assert written_rows() == 1
+
+
+def test_history_of_unknown_task(client, api_log):
+    assert client.get("/tasks/999/history").status_code == 404
@@ -0,0 +1,77 @@
+import builtins
+import warnings
+
+import pytest
+
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.repositories.task_repository import TaskRepository
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import main_cli
+
+
+def create_task(title):
+    with WriteSessionLocal() as db:
+        return TaskRepository(db).create(title=title).id
+
+
+def title_of(task_id):
+    with WriteSessionLocal() as db:
+        task = TaskRepository(db).get_by_id(task_id)
+        return task.title if task else None
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Answer CLI prompts in order; an API write runs at every prompt."""
+    replies = []
+    writes = []
+
+    def fake_input(prompt=""):
+        writes.append(create_task(f"written during: {prompt.strip()}"))
+        return replies.pop(0)
+
+    monkeypatch.setattr(builtins, "input", fake_input)
+    return replies, writes
+
+
+def test_update_prompts_without_holding_the_write_lock(answers):
+    replies, writes = answers
+    task_id = create_task("Old title")
+    replies.extend(["New title", "", "", "", ""])
+
+    main_cli.handle_tasks_update(task_id)
+
+    assert len(writes) == 5
+    assert title_of(task_id) == "New title"
+
+
+def test_delete_prompts_without_holding_the_write_lock(answers):
+    replies, writes = answers
+    task_id = create_task("Doomed")
+    replies.append("y")
+
+    main_cli.handle_tasks_delete(task_id)
+
+    assert len(writes) == 1
+    assert title_of(task_id) is None
+
+
+def test_streamed_listing_does_not_block_writers(monkeypatch, capsys):
+    for i in range(3):
+        create_task(f"listed {i}")
+    written = []
+    original_print = builtins.print
+
+    def print_and_write(*args, **kwargs):
+        # Another process writes while rows are being streamed out
+        if args and "listed" in str(args[0]) and not written:
+            written.append(create_task("written during listing"))
+        original_print(*args, **kwargs)
+
+    monkeypatch.setattr(builtins, "print", print_and_write)
+    main_cli.handle_tasks_list(["--format", "json"])
+
+    assert written
+    assert capsys.readouterr().out.count("listed") == 3
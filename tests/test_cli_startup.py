@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules `help` must not pay for
+HEAVY_MODULES = (
+    "sqlalchemy",
+    "src.todolist.db",
+    "src.todolist.domain",
+    "src.todolist.repositories",
+    "src.todolist.scheduler",
+)
+
+
+def imported_modules(*args):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main_cli.py", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    # stderr lines: "import time: <self us> | <cumulative us> | <indented module>"
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_help_does_not_import_the_database_layer():
+    modules = imported_modules("help")
+
+    assert "json" in modules  # sanity check: the output was parsed
+    heavy = sorted(
+        module for module in modules
+        if any(module == name or module.startswith(name + ".") for name in HEAVY_MODULES)
+    )
+    assert heavy == []
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.domain.models import Task
+from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.services import completion_batcher as batcher_module
+from src.todolist.services.completion_batcher import CompletionBatcher, CompletionTimeoutError
+
+
+def create_tasks(count):
+    with WriteSessionLocal() as db:
+        repo = TaskRepository(db)
+        return [repo.create(title=f"task {i}").id for i in range(count)]
+
+
+@pytest.fixture
+def flushes(monkeypatch):
+    """Batch sizes written by mark_many_as_completed."""
+    sizes = []
+    original = TaskRepository.mark_many_as_completed
+
+    def counting(self, task_ids):
+        task_ids = list(task_ids)
+        sizes.append(len(task_ids))
+        return original(self, task_ids)
+
+    monkeypatch.setattr(TaskRepository, "mark_many_as_completed", counting)
+    return sizes
+
+
+def complete_concurrently(batcher, task_ids):
+    results = {}
+
+    def run(task_id):
+        results[task_id] = batcher.complete(task_id)
+
+    threads = [threading.Thread(target=run, args=(task_id,)) for task_id in task_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_completions_share_a_commit(flushes):
+    task_ids = create_tasks(20)
+    batcher = CompletionBatcher(window_ms=100, max_batch=500, timeout=10)
+
+    results = complete_concurrently(batcher, task_ids + [999])
+
+    assert results == {**{task_id: True for task_id in task_ids}, 999: False}
+    assert sum(flushes) == 21
+    assert len(flushes) < 21
+    with WriteSessionLocal() as db:
+        assert all(db.get(Task, task_id).is_completed for task_id in task_ids)
+
+
+def test_max_batch_caps_a_flush(flushes):
+    task_ids = create_tasks(10)
+    batcher = CompletionBatcher(window_ms=200, max_batch=4, timeout=10)
+
+    complete_concurrently(batcher, task_ids)
+
+    assert max(flushes) <= 4
+    assert sum(flushes) == 10
+
+
+def test_failed_flush_keeps_the_flusher_alive(monkeypatch):
+    [task_id] = create_tasks(1)
+    batcher = CompletionBatcher(window_ms=1, max_batch=10, timeout=10)
+    calls = []
+
+    def failing_session():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+        return WriteSessionLocal()
+
+    monkeypatch.setattr(batcher_module, "WriteSessionLocal", failing_session)
+
+    with pytest.raises(RuntimeError, match="database unavailable"):
+        batcher.complete(task_id)
+    assert batcher.complete(task_id) is True
+    assert batcher._thread.is_alive()
+
+
+def test_waiting_is_bounded(monkeypatch):
+    [task_id] = create_tasks(1)
+    release = threading.Event()
+    original = CompletionBatcher._flush
+
+    def stuck_flush(batch):
+        release.wait()
+        original(batch)
+
+    monkeypatch.setattr(CompletionBatcher, "_flush", staticmethod(stuck_flush))
+    batcher = CompletionBatcher(window_ms=1, max_batch=10, timeout=0.2)
+
+    start = time.monotonic()
+    with pytest.raises(CompletionTimeoutError):
+        batcher.complete(task_id)
+    assert time.monotonic() - start < 2
+    release.set()
+
+
+def test_timeout_answers_503(client, monkeypatch):
+    task = client.post("/tasks/", json={"title": "Slow commit"}).json()
+
+    class StuckBatcher:
+        def complete(self, task_id):
+            raise CompletionTimeoutError(f"Completion of task {task_id} timed out")
+
+    monkeypatch.setattr(Config, "COMPLETION_BATCH_MS", 5)
+    monkeypatch.setattr("src.todolist.services.task_service.completion_batcher", StuckBatcher())
+
+    response = client.patch(f"/tasks/{task['id']}/complete")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
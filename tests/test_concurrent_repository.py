@@ -0,0 +1,197 @@
+import random
+import threading
+import time
+
+import pytest
+
+from src.todolist.config import Config
+from src.todolist.infrastructure.repository import ConcurrentInMemoryRepository
+
+THREADS = 16
+OPERATIONS = 2000
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    monkeypatch.setattr(Config, "MAX_PROJECTS", 64)
+    monkeypatch.setattr(Config, "MAX_TASKS_PER_PROJECT", 200)
+    return ConcurrentInMemoryRepository()
+
+
+def run_threads(count, target):
+    errors = []
+
+    def run(index):
+        try:
+            target(index)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def check_invariants(repo):
+    indexed = set(repo._tasks_by_id)
+    listed = set()
+    for project in repo.list_projects():
+        assert len(project.tasks) <= Config.MAX_TASKS_PER_PROJECT
+        # IDs are never reused, so insertion order is ID order
+        assert list(project.tasks) == sorted(project.tasks)
+        for task_id, task in project.tasks.items():
+            assert repo._tasks_by_id[task_id] == (project, task)
+        listed.update(project.tasks)
+    assert listed == indexed
+    assert {p.name for p in repo.list_projects()} == set(repo._projects_by_name)
+
+
+def test_hammering_keeps_invariants(repo):
+    projects = [repo.create_project(f"project-{i}") for i in range(8)]
+    created = [[] for _ in range(THREADS)]
+    stop = threading.Event()
+    read_errors = []
+
+    def writer(index):
+        rng = random.Random(index)
+        for _ in range(OPERATIONS):
+            project = rng.choice(projects)
+            action = rng.random()
+            if action < 0.6:
+                try:
+                    task = repo.add_task_to_project(project.id, f"task {index}")
+                except ValueError:
+                    continue  # quota reached
+                created[index].append(task.id)
+            elif action < 0.8:
+                tasks = repo.list_tasks(project.id)
+                if tasks:
+                    repo.update_task(project.id, rng.choice(tasks).id, status="doing")
+            else:
+                tasks = repo.list_tasks(project.id)
+                if tasks:
+                    repo.delete_task(project.id, rng.choice(tasks).id)
+
+    def reader():
+        while not stop.is_set():
+            try:
+                for project in projects:
+                    for task in repo.list_tasks(project.id):
+                        assert task.title.startswith("task ")
+                    repo.get_task(project.id, random.randint(1, THREADS * OPERATIONS))
+                repo.list_projects()
+            except Exception as e:
+                read_errors.append(e)
+                return
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    run_threads(THREADS, writer)
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert read_errors == []
+    ids = [task_id for ids in created for task_id in ids]
+    assert len(ids) == len(set(ids)), "task IDs were handed out twice"
+    assert repo.next_task_id == max(ids) + 1
+    check_invariants(repo)
+
+
+def test_project_quota_holds_under_contention(repo, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_PROJECTS", 10)
+    monkeypatch.setattr(Config, "MAX_TASKS_PER_PROJECT", 50)
+    project = repo.create_project("shared")
+
+    def create(index):
+        for i in range(10):
+            try:
+                repo.create_project(f"p-{index}-{i}")
+            except ValueError:
+                pass
+            try:
+                repo.add_task_to_project(project.id, "t")
+            except ValueError:
+                pass
+
+    run_threads(THREADS, create)
+    assert len(repo.list_projects()) == 10
+    assert len(repo.list_tasks(project.id)) == 50
+    check_invariants(repo)
+
+
+def test_writes_to_other_projects_are_not_blocked(repo):
+    first = repo.create_project("first")
+    second = repo.create_project("second")
+    assert repo._stripe(first.id) is not repo._stripe(second.id)
+
+    # A writer holding the first project's stripe doesn't stall the second one
+    with repo._stripe(first.id):
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (repo.add_task_to_project(second.id, "t"), done.set()))
+        thread.start()
+        assert done.wait(timeout=5)
+        thread.join()
+
+
+def test_write_cost_does_not_grow_with_project_size(repo, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_TASKS_PER_PROJECT", 1_000_000)
+    small = repo.create_project("small")
+    large = repo.create_project("large")
+    for _ in range(50_000):
+        repo.add_task_to_project(large.id, "filler")
+
+    def time_writes(project):
+        start = time.perf_counter()
+        for _ in range(500):
+            task = repo.add_task_to_project(project.id, "t")
+            repo.update_task(project.id, task.id, status="done")
+            repo.delete_task(project.id, task.id)
+        return time.perf_counter() - start
+
+    time_writes(small)  # warm up
+    # A copy of the 50k-entry dict per write would be ~100x slower
+    assert time_writes(large) < 5 * time_writes(small) + 0.05
+
+
+def test_throughput_scales_across_threads(repo):
+    projects = [repo.create_project(f"project-{i}") for i in range(16)]
+
+    def churn(index):
+        project = projects[index % len(projects)]
+        for _ in range(OPERATIONS):
+            task = repo.add_task_to_project(project.id, "t")
+            repo.update_task(project.id, task.id, status="doing")
+            repo.delete_task(project.id, task.id)
+
+    start = time.perf_counter()
+    run_threads(1, churn)
+    single = OPERATIONS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    run_threads(THREADS, churn)
+    parallel = THREADS * OPERATIONS / (time.perf_counter() - start)
+
+    # Under the GIL pure-Python work doesn't run faster with more threads,
+    # but striping must not collapse into lock convoys either
+    assert parallel > 0.5 * single
+    check_invariants(repo)
+
+
+def test_listings_do_not_wait_for_writers(repo):
+    project = repo.create_project("busy")
+    task = repo.add_task_to_project(project.id, "t")
+    listed = []
+
+    # A writer holds every lock a write to this project takes
+    with repo._global_lock, repo._stripe(project.id):
+        thread = threading.Thread(
+            target=lambda: listed.append((repo.list_projects(), repo.list_tasks(project.id)))
+        )
+        thread.start()
+        thread.join(timeout=5)
+        assert listed == [([project], [task])]
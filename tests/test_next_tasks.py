@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import event
+
+from src.todolist.db.session import get_engine
+
+
+@pytest.fixture
+def tasks(client):
+    """Five open tasks in two categories, one of them completed."""
+    for i in range(6):
+        category = "work" if i % 2 == 0 else "home"
+        client.post("/tasks/", json={"title": f"task {i}", "priority": 1 + i % 3, "category_name": category})
+    client.patch("/tasks/1/complete")
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", record)
+    yield executed
+    event.remove(get_engine(), "before_cursor_execute", record)
+
+
+def next_tasks(client, **params):
+    response = client.get("/tasks/next", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_claimed_tasks_are_loaded_in_one_query(client, tasks, statements):
+    peeked = next_tasks(client, n=5)
+    statements.clear()
+
+    claimed = next_tasks(client, n=5, claim="true", worker="w1")
+
+    assert [task["id"] for task in claimed] == [task["id"] for task in peeked]
+    assert all(task["category"]["name"] in ("work", "home") for task in claimed)
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    # The claim query and one reload after the commit, however many tasks are claimed
+    assert len(selects) == 2
+
+
+def test_claimed_tasks_are_skipped_by_other_workers(client, tasks):
+    first = next_tasks(client, n=3, claim="true", worker="w1")
+    second = next_tasks(client, n=3, claim="true", worker="w2")
+
+    assert len(first) == 3
+    assert len(second) == 2
+    assert not {task["id"] for task in first} & {task["id"] for task in second}
+    assert next_tasks(client, n=5, claim="true", worker="w3") == []
@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import select, update
+
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.domain.models import OutboxEvent
+from src.todolist.outbox.dispatcher import OutboxDispatcher, WebhookSender
+from src.todolist.repositories.base import DEFER_COMMIT_KEY
+from src.todolist.repositories.task_repository import TaskRepository
+
+
+class WebhookServer:
+    """Local webhook endpoint answering with the queued status codes (default 200)."""
+
+    def __init__(self):
+        self.received = []
+        self.statuses = []
+        self.delay = 0
+        self.on_request = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                server.received.append(json.loads(body)["events"])
+                if server.on_request:
+                    server.on_request()
+                time.sleep(server.delay)
+                status = server.statuses.pop(0) if server.statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/hook"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def webhook():
+    server = WebhookServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture(autouse=True)
+def outbox_config(monkeypatch):
+    monkeypatch.setattr(Config, "OUTBOX_ENABLED", True)
+    monkeypatch.setattr(Config, "OUTBOX_BACKOFF_SECONDS", 10)
+    monkeypatch.setattr(Config, "OUTBOX_LEASE_SECONDS", 60)
+
+
+def complete_task(title="Ship it"):
+    with WriteSessionLocal() as db:
+        repo = TaskRepository(db)
+        task = repo.create(title=title)
+        repo.mark_as_completed(task.id)
+        return task.id
+
+
+def outbox_events():
+    with WriteSessionLocal() as db:
+        return list(db.scalars(select(OutboxEvent).order_by(OutboxEvent.id)))
+
+
+def make_due():
+    with WriteSessionLocal() as db:
+        db.execute(update(OutboxEvent).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.commit()
+
+
+def test_completion_is_delivered(webhook):
+    task_id = complete_task()
+    dispatcher = OutboxDispatcher(sender=WebhookSender(webhook.url, timeout=5))
+
+    assert dispatcher.dispatch_once() == 1
+
+    assert len(webhook.received) == 1
+    [event] = webhook.received[0]
+    assert event["type"] == "task.completed"
+    assert event["task_id"] == task_id
+    [row] = outbox_events()
+    assert row.status == "delivered"
+    assert row.delivered_at is not None
+    assert dispatcher.dispatch_once() == 0
+
+
+def test_server_error_is_retried_with_backoff(webhook):
+    complete_task()
+    webhook.statuses = [500]
+    dispatcher = OutboxDispatcher(sender=WebhookSender(webhook.url, timeout=5))
+
+    before = datetime.utcnow()
+    assert dispatcher.dispatch_once() == 1
+
+    [row] = outbox_events()
+    assert row.status == "pending"
+    assert row.attempts == 1
+    assert "500" in row.last_error
+    assert row.next_attempt_at >= before + timedelta(seconds=Config.OUTBOX_BACKOFF_SECONDS)
+    # Not due yet
+    assert dispatcher.dispatch_once() == 0
+
+    make_due()
+    assert dispatcher.dispatch_once() == 1
+    [row] = outbox_events()
+    assert row.status == "delivered"
+    assert len(webhook.received) == 2
+
+
+def test_timeout_is_retried(webhook):
+    complete_task()
+    webhook.delay = 1
+    dispatcher = OutboxDispatcher(sender=WebhookSender(webhook.url, timeout=0.2))
+
+    assert dispatcher.dispatch_once() == 1
+
+    [row] = outbox_events()
+    assert row.status == "pending"
+    assert row.attempts == 1
+    assert "timed out" in row.last_error
+
+
+def test_event_is_dead_after_max_attempts(webhook):
+    complete_task()
+    webhook.statuses = [503, 503]
+    dispatcher = OutboxDispatcher(sender=WebhookSender(webhook.url, timeout=5), max_attempts=2)
+
+    dispatcher.dispatch_once()
+    make_due()
+    dispatcher.dispatch_once()
+
+    [row] = outbox_events()
+    assert row.status == "dead"
+    assert row.attempts == 2
+
+
+def test_rolled_back_transaction_emits_no_event(db, webhook):
+    db.info[DEFER_COMMIT_KEY] = True
+    repo = TaskRepository(db)
+    task = repo.create(title="Ship it")
+    repo.mark_as_completed(task.id)
+    db.rollback()
+
+    dispatcher = OutboxDispatcher(sender=WebhookSender(webhook.url, timeout=5))
+    assert dispatcher.dispatch_once() == 0
+    assert outbox_events() == []
+    assert webhook.received == []
+
+
+def test_no_transaction_is_held_during_delivery(webhook):
+    complete_task()
+    observed = {}
+
+    def on_request():
+        # Another writer gets through while the webhook is being called,
+        # and sees the claim (lease) already committed
+        with WriteSessionLocal() as other:
+            [row] = other.scalars(select(OutboxEvent))
+            observed["next_attempt_at"] = row.next_attempt_at
+            TaskRepository(other).create(title="Concurrent write")
+
+    webhook.on_request = on_request
+    dispatcher = OutboxDispatcher(sender=WebhookSender(webhook.url, timeout=5))
+    assert dispatcher.dispatch_once() == 1
+
+    assert observed["next_attempt_at"] > datetime.utcnow()
+    [row] = outbox_events()
+    assert row.status == "delivered"
+
+
+def test_expired_lease_outcome_is_not_recorded(webhook):
+    complete_task()
+
+    def on_request():
+        # The lease expired and another dispatcher claimed the event again
+        with WriteSessionLocal() as other:
+            other.execute(update(OutboxEvent).values(next_attempt_at=datetime.utcnow() + timedelta(hours=1)))
+            other.commit()
+
+    webhook.on_request = on_request
+    dispatcher = OutboxDispatcher(sender=WebhookSender(webhook.url, timeout=5))
+    dispatcher.dispatch_once()
+
+    [row] = outbox_events()
+    assert row.status == "pending"
+    assert row.attempts == 0
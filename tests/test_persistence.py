@@ -0,0 +1,257 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.todolist.infrastructure import persistence
+from src.todolist.infrastructure.memory_backend import (
+    InMemoryCategoryRepository, InMemoryStore, InMemoryTaskRepository
+)
+from src.todolist.infrastructure.persistence import (
+    OperationLog, StorePersistence, encode_category, encode_task, load_snapshot, write_snapshot
+)
+
+
+def store_state(store):
+    return (
+        sorted(encode_category(c) for c in store.categories.values()),
+        sorted(encode_task(t) for t in store.tasks.values()),
+        store.next_task_id,
+        store.next_category_id,
+    )
+
+
+def fill(store):
+    categories = InMemoryCategoryRepository(store)
+    tasks = InMemoryTaskRepository(store)
+    work = categories.create("work", "Day job")
+    home = categories.create("home")
+    first = tasks.create(title="Write report", description="Quarterly ✓", priority=3,
+                         due_date=datetime(2030, 1, 2, 3, 4, 5, 678), category_id=work.id)
+    tasks.create(title="Water plants", category_id=home.id)
+    third = tasks.create(title="Temporary")
+    tasks.update(first.id, title="Write the report")
+    tasks.mark_as_completed(first.id)
+    tasks.delete(third.id)
+    return store
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    original = os.fsync
+
+    def counting(fd):
+        calls.append(fd)
+        original(fd)
+
+    monkeypatch.setattr(persistence.os, "fsync", counting)
+    return calls
+
+
+def test_group_commit_shares_fsyncs(tmp_path, fsyncs):
+    log = OperationLog(str(tmp_path), 0, group_commit_ms=20)
+    barrier = threading.Barrier(20)
+
+    def writer(i):
+        barrier.wait()
+        log.wait_durable(log.append({"o": "td", "id": i}))
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.close()
+
+    assert log.durable_lsn == 20
+    assert len(fsyncs) < 20
+    replayed = list(OperationLog.replay(str(tmp_path), 0))
+    assert [lsn for lsn, _ in replayed] == list(range(1, 21))
+    assert sorted(op["id"] for _, op in replayed) == list(range(20))
+
+
+def test_replay_skips_covered_records_and_truncates_torn_tail(tmp_path):
+    log = OperationLog(str(tmp_path), 0, group_commit_ms=1)
+    for i in range(3):
+        log.append({"o": "td", "id": i})
+    log.close()
+    [(_, path)] = OperationLog.segments(str(tmp_path))
+    size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b"\x04\x00\x00")  # crash in the middle of a record header
+
+    assert [lsn for lsn, _ in OperationLog.replay(str(tmp_path), 1)] == [2, 3]
+    assert os.path.getsize(path) == size
+
+
+def test_snapshot_round_trip(tmp_path):
+    store = fill(InMemoryStore())
+    path = str(tmp_path / "snapshot.bin")
+
+    write_snapshot(path, 42, store.next_task_id, store.next_category_id,
+                   list(store.categories.values()), list(store.tasks.values()))
+    restored = InMemoryStore()
+    assert load_snapshot(path, restored) == 42
+
+    assert store_state(restored) == store_state(store)
+    report = next(t for t in restored.tasks.values() if t.title == "Write the report")
+    assert report.category is restored.categories[report.category_id]
+    assert report.description == "Quarterly ✓"
+    assert report.version == 3
+    assert restored.categories_by_name.keys() == {"work", "home"}
+
+
+def test_recovery_from_snapshot_and_log_tail(tmp_path):
+    directory = str(tmp_path)
+    store = InMemoryStore()
+    journal = StorePersistence(store, directory, snapshot_interval_seconds=3600, group_commit_ms=1)
+    journal.open()
+    fill(store)
+    journal.snapshot()
+    # Changes after the snapshot only live in the log
+    tasks = InMemoryTaskRepository(store)
+    late = tasks.create(title="After snapshot", due_date=datetime.utcnow() + timedelta(days=1))
+    InMemoryCategoryRepository(store).update(store.categories_by_name["home"].id, name="house")
+    expected = store_state(store)
+
+    # Crash: the log is on disk, but no final snapshot is written
+    journal._stopping.set()
+    journal._thread.join()
+    journal.log.close()
+
+    recovered = InMemoryStore()
+    reopened = StorePersistence(recovered, directory, snapshot_interval_seconds=3600, group_commit_ms=1)
+    reopened.open()
+    try:
+        assert store_state(recovered) == expected
+        assert recovered.tasks[late.id].title == "After snapshot"
+        assert "house" in recovered.categories_by_name
+        # New IDs continue after the recovered ones
+        assert InMemoryTaskRepository(recovered).create(title="Next").id == expected[2]
+    finally:
+        reopened.close()
+
+
+def test_get_or_create_waits_for_disk_outside_the_store_lock(tmp_path):
+    store = InMemoryStore()
+    journal = StorePersistence(store, str(tmp_path), snapshot_interval_seconds=3600, group_commit_ms=1)
+    journal.open()
+    lock_free = []
+    original = journal.log.wait_durable
+
+    def checking_wait(lsn):
+        # Another writer can take the store lock while this one waits for fsync
+        def try_lock():
+            if store.lock.acquire(timeout=1):
+                lock_free.append(True)
+                store.lock.release()
+        other = threading.Thread(target=try_lock)
+        other.start()
+        other.join()
+        original(lsn)
+
+    journal.log.wait_durable = checking_wait
+    try:
+        categories = InMemoryCategoryRepository(store)
+        category = categories.get_or_create("errands")
+        assert categories.get_or_create("errands") is category
+        assert lock_free == [True]
+    finally:
+        journal.close()
+
+
+def test_snapshot_load_builds_tasks_on_first_use(tmp_path):
+    store = fill(InMemoryStore())
+    path = str(tmp_path / "snapshot.bin")
+    write_snapshot(path, 1, store.next_task_id, store.next_category_id,
+                   list(store.categories.values()), list(store.tasks.values()))
+    first, second = sorted(store.tasks)
+
+    restored = InMemoryStore()
+    load_snapshot(path, restored)
+    tasks = restored.tasks
+
+    # Only the IDs were read
+    assert dict.__len__(tasks) == 0
+    assert len(tasks) == 2 and first in tasks and 999 not in tasks
+    assert tasks.get(first).title == "Write the report"
+    assert tasks.get(first) is tasks[first]
+    assert dict.__len__(tasks) == 1
+    assert tasks.get(999) is None
+    with pytest.raises(KeyError):
+        tasks[999]
+
+    InMemoryTaskRepository(restored).create(title="After restart")
+    assert len(tasks) == 3
+    assert sorted(t.title for t in tasks.values()) == ["After restart", "Water plants", "Write the report"]
+    # Everything is built: the map is released
+    assert tasks._mm is None
+    assert tasks.pop(second).title == "Water plants"
+    assert len(tasks) == 2
+
+
+class SlowFsync:
+    """fsync that takes a while and, while `store` is set, records whether its lock is free meanwhile."""
+
+    def __init__(self):
+        self.store = None
+        self.lock_free = []
+
+    def __call__(self, fd, original=os.fsync):
+        if self.store is not None:
+            def try_lock():
+                free = self.store.lock.acquire(timeout=1)
+                if free:
+                    self.store.lock.release()
+                self.lock_free.append(free)
+            other = threading.Thread(target=try_lock)
+            other.start()
+            other.join()
+        time.sleep(0.05)
+        original(fd)
+
+
+@pytest.fixture
+def slow_fsync(monkeypatch):
+    fsync = SlowFsync()
+    monkeypatch.setattr(persistence.os, "fsync", fsync)
+    return fsync
+
+
+def test_snapshot_fsyncs_outside_the_store_lock(tmp_path, slow_fsync):
+    store = InMemoryStore()
+    journal = StorePersistence(store, str(tmp_path), snapshot_interval_seconds=3600, group_commit_ms=1)
+    journal.open()
+    try:
+        fill(store)
+        # Logged but not yet fsynced when the snapshot rotates the log
+        journal.log.group_commit_seconds = 0.2
+        with store.lock:
+            store.persist_task(next(iter(store.tasks.values())))
+        slow_fsync.store = store
+        journal.snapshot()
+        journal.log.wait_durable(journal.log.lsn)
+    finally:
+        slow_fsync.store = None
+        journal.close()
+
+    assert slow_fsync.lock_free and all(slow_fsync.lock_free)
+
+
+def test_appends_do_not_wait_for_a_running_fsync(tmp_path, slow_fsync):
+    log = OperationLog(str(tmp_path), 0, group_commit_ms=0)
+    try:
+        log.append({"o": "td", "id": 0})
+        time.sleep(0.01)  # the group commit is now in its fsync
+
+        start = time.monotonic()
+        lsn = log.append({"o": "td", "id": 1})
+        assert time.monotonic() - start < 0.03
+
+        log.wait_durable(lsn)
+        assert log.durable_lsn == 2
+    finally:
+        log.close()
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+from sqlalchemy import event, func, select
+
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal, get_engine
+from src.todolist.domain.models import CategoryTaskCounts, Project, Task
+from src.todolist.repositories.base import QuotaExceededError
+from src.todolist.repositories.soft_delete import INCLUDE_DELETED
+from src.todolist.services.project_service import ProjectService
+
+THREADS = 12
+
+
+def race(action):
+    """Run action(index) in THREADS threads at once, each on its own session."""
+    barrier = threading.Barrier(THREADS)
+    outcomes = [None] * THREADS
+
+    def run(index):
+        with WriteSessionLocal() as db:
+            service = ProjectService(db)
+            barrier.wait()
+            try:
+                action(service, index)
+                outcomes[index] = "ok"
+            except QuotaExceededError:
+                outcomes[index] = "quota"
+            except Exception as e:  # pragma: no cover - reported by the assertion
+                outcomes[index] = repr(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_task_quota_holds_under_concurrent_creates(db, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_TASKS_PER_PROJECT", 5)
+    project = ProjectService(db).create_project("race")
+    project_id = project.id
+    db.close()
+
+    outcomes = race(lambda service, i: service.create_project_task(project_id, f"task {i}"))
+
+    assert sorted(outcomes) == ["ok"] * 5 + ["quota"] * (THREADS - 5)
+    with WriteSessionLocal() as check:
+        assert check.get(Project, project_id).task_count == 5
+        assert check.scalar(select(func.count(Task.id)).where(Task.project_id == project_id)) == 5
+
+
+def test_project_quota_holds_under_concurrent_creates(monkeypatch):
+    monkeypatch.setattr(Config, "MAX_PROJECTS", 3)
+
+    outcomes = race(lambda service, i: service.create_project(f"project {i}"))
+
+    assert sorted(outcomes) == ["ok"] * 3 + ["quota"] * (THREADS - 3)
+    with WriteSessionLocal() as check:
+        assert check.scalar(select(func.count(Project.id))) == 3
+
+
+def test_freed_slot_can_be_reused(client, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_TASKS_PER_PROJECT", 2)
+    project = client.post("/projects/", json={"name": "small"}).json()
+    ids = [client.post(f"/projects/{project['id']}/tasks", json={"title": f"task {i}"}).json()["id"] for i in range(2)]
+
+    assert client.post(f"/projects/{project['id']}/tasks", json={"title": "one too many"}).status_code == 409
+    assert client.delete(f"/tasks/{ids[0]}").status_code == 204
+    assert client.post(f"/projects/{project['id']}/tasks", json={"title": "fits again"}).status_code == 201
+    assert client.get(f"/projects/{project['id']}").json()["task_count"] == 2
+
+
+def test_project_delete_does_not_load_tasks(client, monkeypatch):
+    monkeypatch.setattr(Config, "CATEGORY_STATS_CACHE", True)
+    monkeypatch.setattr(Config, "MAX_TASKS_PER_PROJECT", 50)
+    project = client.post("/projects/", json={"name": "doomed"}).json()
+    for i in range(20):
+        client.post(f"/projects/{project['id']}/tasks", json={"title": f"task {i}", "category_name": "home"})
+    client.post("/tasks/", json={"title": "unrelated", "category_name": "home"})
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", record)
+    try:
+        response = client.delete(f"/projects/{project['id']}")
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", record)
+
+    assert response.status_code == 204
+    assert not [s for s in statements if s.startswith("SELECT") and "FROM tasks" in s]
+    assert client.get(f"/projects/{project['id']}").status_code == 404
+    with WriteSessionLocal() as check:
+        remaining = check.scalars(select(Task.title).execution_options(**{INCLUDE_DELETED: True}))
+        assert list(remaining) == ["unrelated"]
+        # Rollups followed the deleted tasks
+        assert check.scalar(select(CategoryTaskCounts.total)) == 1
+
+
+def test_delete_missing_project(client):
+    assert client.delete("/projects/999").status_code == 404
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import select
+
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.domain.models import SchedulerLease
+from src.todolist.scheduler.background import BackgroundScheduler
+from src.todolist.scheduler.leader import LeaderElector
+
+LEASE_SECONDS = 0.3
+
+
+@pytest.fixture
+def electors():
+    created = []
+
+    def make(name="test-job"):
+        elector = LeaderElector(name, lease_seconds=LEASE_SECONDS)
+        created.append(elector)
+        return elector
+
+    yield make
+    for elector in created:
+        elector.release()
+
+
+def standby_took_over(standby, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if standby.ensure_leadership():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def lease_holder():
+    with WriteSessionLocal() as db:
+        return db.scalar(select(SchedulerLease.holder).where(SchedulerLease.name == "test-job"))
+
+
+def test_standby_takes_over_an_expired_lease(electors):
+    leader, standby = electors(), electors()
+    assert leader.ensure_leadership()
+    assert not standby.ensure_leadership()
+
+    # The leader stops renewing, e.g. it's busy with a long job
+    assert standby_took_over(standby, LEASE_SECONDS * 4)
+    assert lease_holder() == standby.holder
+
+
+def test_heartbeat_keeps_the_lease_during_a_long_job(electors):
+    leader, standby = electors(), electors()
+    assert leader.ensure_leadership()
+
+    with leader.heartbeat():
+        # The job runs for several lease periods
+        assert not standby_took_over(standby, LEASE_SECONDS * 4)
+
+    assert leader.is_leader
+    assert lease_holder() == leader.holder
+
+
+def test_heartbeat_stops_with_the_job(electors):
+    leader, standby = electors(), electors()
+    assert leader.ensure_leadership()
+
+    with leader.heartbeat():
+        pass
+
+    assert not [t for t in threading.enumerate() if t.name == "test-job-heartbeat"]
+    assert standby_took_over(standby, LEASE_SECONDS * 4)
+
+
+def test_background_scheduler_renews_the_lease_while_a_job_runs(electors, monkeypatch):
+    monkeypatch.setattr(Config, "SCHEDULER_LEASE_SECONDS", LEASE_SECONDS)
+    scheduler = BackgroundScheduler()
+    standby = electors("close_overdue_tasks")
+    assert scheduler._elector.ensure_leadership()
+    took_over = []
+
+    scheduler._run_job(lambda: took_over.append(standby_took_over(standby, LEASE_SECONDS * 4)))
+
+    assert took_over == [False]
+    scheduler._elector.release()
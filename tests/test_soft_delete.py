@@ -0,0 +1,150 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from src.todolist.config import Config
+from src.todolist.db.session import WriteSessionLocal
+from src.todolist.domain.models import Task
+from src.todolist.repositories.soft_delete import INCLUDE_DELETED
+from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.scheduler import tasks as scheduler_tasks
+from src.todolist.scheduler.tasks import in_quiet_hours, purge_deleted_tasks
+
+
+@pytest.fixture
+def deleted_task(client):
+    """ID of a deleted task, next to a live one."""
+    client.post("/tasks/", json={"title": "Still here", "priority": 1})
+    task = client.post("/tasks/", json={"title": "Gone task", "priority": 3}).json()
+    assert client.delete(f"/tasks/{task['id']}").status_code == 204
+    return task["id"]
+
+
+def all_rows():
+    with WriteSessionLocal() as db:
+        return db.scalar(
+            select(func.count()).select_from(Task).execution_options(**{INCLUDE_DELETED: True})
+        )
+
+
+def test_deleted_task_is_hidden_from_get(client, deleted_task):
+    assert client.get(f"/tasks/{deleted_task}").status_code == 404
+
+
+def test_deleted_task_is_hidden_from_lists(client, deleted_task):
+    response = client.get("/tasks/", params={"count": "exact"})
+    assert [task["title"] for task in response.json()] == ["Still here"]
+    assert response.headers["X-Total-Count"] == "1"
+    assert client.get("/tasks/", params={"q": "Gone"}).json() == []
+
+
+def test_deleted_task_is_hidden_from_stats(client, deleted_task):
+    stats = client.get("/tasks/stats").json()
+    assert stats["total"] == 1
+    assert stats["pending"] == 1
+
+
+def test_deleted_task_is_hidden_from_next(client, deleted_task):
+    # The deleted task has the highest priority
+    assert [task["title"] for task in client.get("/tasks/next", params={"n": 5}).json()] == ["Still here"]
+    claimed = client.get("/tasks/next", params={"n": 5, "claim": "true", "worker": "w1"}).json()
+    assert [task["title"] for task in claimed] == ["Still here"]
+
+
+def test_deleted_task_cannot_be_changed(client, deleted_task):
+    assert client.patch(f"/tasks/{deleted_task}/complete").status_code == 404
+    assert client.patch(f"/tasks/{deleted_task}", json={"title": "Back again"}).status_code == 404
+    assert client.delete(f"/tasks/{deleted_task}").status_code == 404
+
+
+def test_deleted_task_row_is_kept_until_purged(client, deleted_task):
+    assert all_rows() == 2
+
+
+@pytest.fixture
+def purge_config(monkeypatch):
+    monkeypatch.setattr(Config, "PURGE_RETENTION_MINUTES", 0)
+    monkeypatch.setattr(Config, "PURGE_BATCH_SIZE", 3)
+    monkeypatch.setattr(Config, "PURGE_ROWS_PER_SECOND", 30)
+    monkeypatch.setattr(Config, "PURGE_MAX_RUN_SECONDS", 60)
+    sleeps = []
+    monkeypatch.setattr(scheduler_tasks.time, "sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    sizes = []
+    original = TaskRepository.purge_deleted
+
+    def recording(self, deleted_before, batch_size):
+        count = original(self, deleted_before, batch_size)
+        sizes.append(count)
+        return count
+
+    monkeypatch.setattr(TaskRepository, "purge_deleted", recording)
+    return sizes
+
+
+def delete_tasks(count, keep=0):
+    with WriteSessionLocal() as db:
+        repo = TaskRepository(db)
+        ids = [repo.create(title=f"task {i}").id for i in range(count + keep)]
+        for task_id in ids[:count]:
+            repo.delete(task_id)
+
+
+def test_purge_runs_in_paced_batches(purge_config, batches):
+    delete_tasks(7, keep=2)
+
+    assert purge_deleted_tasks(any_time=True) == 7
+
+    assert batches == [3, 3, 1]
+    # PURGE_BATCH_SIZE / PURGE_ROWS_PER_SECOND between full batches
+    assert purge_config == pytest.approx([0.1, 0.1])
+    assert all_rows() == 2
+
+
+def test_purge_stops_at_max_run_time(purge_config, batches, monkeypatch):
+    monkeypatch.setattr(Config, "PURGE_MAX_RUN_SECONDS", 0.05)
+    delete_tasks(7)
+
+    assert purge_deleted_tasks(any_time=True) == 3
+    assert batches == [3]
+    assert all_rows() == 4
+
+
+def test_purge_keeps_recently_deleted_tasks(purge_config, monkeypatch):
+    monkeypatch.setattr(Config, "PURGE_RETENTION_MINUTES", 60)
+    delete_tasks(2)
+
+    assert purge_deleted_tasks(any_time=True) == 0
+    assert all_rows() == 2
+
+
+def test_purge_waits_for_quiet_hours(purge_config, monkeypatch):
+    monkeypatch.setattr(scheduler_tasks, "in_quiet_hours", lambda now: False)
+    delete_tasks(2)
+
+    assert purge_deleted_tasks() == 0
+    assert all_rows() == 2
+    assert purge_deleted_tasks(any_time=True) == 2
+
+
+@pytest.mark.parametrize("hour, quiet_hours, expected", [
+    (0, "1-5", False),
+    (1, "1-5", True),
+    (4, "1-5", True),
+    (5, "1-5", False),
+    (23, "22-4", True),
+    (3, "22-4", True),
+    (12, "22-4", False),
+    (12, "", True),
+])
+def test_in_quiet_hours(hour, quiet_hours, expected):
+    assert in_quiet_hours(datetime(2026, 1, 1, hour, 30), quiet_hours) is expected
+
+
+def test_quiet_hours_default_to_night():
+    assert Config.PURGE_QUIET_HOURS == "1-5"
@@ -0,0 +1,39 @@
+from src.todolist.repositories.base import DEFER_COMMIT_KEY
+from src.todolist.repositories.task_repository import TaskRepository
+
+
+def test_concurrent_reads_do_not_take_the_write_lock(read_db):
+    from src.todolist.db.session import SessionLocal
+
+    # An open read transaction ...
+    TaskRepository(read_db).get_statistics()
+    assert read_db.in_transaction()
+
+    # ... doesn't block another reader
+    other = SessionLocal()
+    try:
+        assert TaskRepository(other).get_statistics()["total"] == 0
+    finally:
+        other.close()
+
+
+def test_reads_run_while_a_write_transaction_is_open(db, read_db):
+    repo = TaskRepository(db)
+    repo.create(title="committed")
+
+    # Uncommitted write holding the write lock
+    db.info[DEFER_COMMIT_KEY] = True
+    repo.create(title="pending")
+
+    stats = TaskRepository(read_db).get_statistics()
+    assert stats["total"] == 1
+    db.rollback()
+
+
+def test_write_sessions_begin_immediate(db, read_db):
+    from src.todolist.db.session import SQLITE_BEGIN_MODE_OPTION
+
+    read_options = read_db.connection().get_execution_options()
+    write_options = db.connection().get_execution_options()
+    assert SQLITE_BEGIN_MODE_OPTION not in read_options
+    assert write_options[SQLITE_BEGIN_MODE_OPTION] == "IMMEDIATE"
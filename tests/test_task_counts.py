@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy import delete, event
+
+from src.todolist.db.session import get_engine
+from src.todolist.domain.models import TaskDailyStats
+from src.todolist.rollups import backfill_daily_stats
+
+
+@pytest.fixture
+def backfilled(db):
+    """The daily rollup was backfilled (before any task was written)."""
+    backfill_daily_stats(db)
+
+
+@pytest.fixture
+def tasks(client):
+    """Six tasks: three 'alpha' and three 'beta', two of them completed, one overdue."""
+    ids = []
+    for i in range(6):
+        name = "alpha" if i % 2 == 0 else "beta"
+        ids.append(client.post("/tasks/", json={"title": f"{name} task {i}"}).json()["id"])
+    for task_id in ids[:2]:
+        client.patch(f"/tasks/{task_id}/complete")
+    client.post("/tasks/", json={"title": "alpha late", "due_date": "2000-01-01T00:00:00"})
+    return ids
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", record)
+    yield executed
+    event.remove(get_engine(), "before_cursor_execute", record)
+
+
+def total_count(client, **params):
+    response = client.get("/tasks/", params=params)
+    assert response.status_code == 200
+    return response.headers.get("X-Total-Count")
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({}, "7"),
+    ({"completed": "true"}, "2"),
+    ({"completed": "false"}, "5"),
+    ({"q": "alpha"}, "4"),
+    ({"q": "alpha", "completed": "false"}, "3"),
+    ({"overdue": "true"}, "1"),
+])
+def test_exact_count_with_filters(client, tasks, params, expected):
+    assert total_count(client, count="exact", **params) == expected
+
+
+def test_exact_count_ignores_paging(client, tasks):
+    response = client.get("/tasks/", params={"count": "exact", "limit": 2, "skip": 2})
+    assert len(response.json()) == 2
+    assert response.headers["X-Total-Count"] == "7"
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({}, "7"),
+    ({"completed": "true"}, "2"),
+    ({"completed": "false"}, "5"),
+])
+def test_estimated_count_without_filters_uses_the_rollup(client, backfilled, tasks, statements, params, expected):
+    statements.clear()
+
+    assert total_count(client, count="estimated", **params) == expected
+
+    counts = [s for s in statements if "count(" in s.lower()]
+    assert counts == []
+    assert any("task_daily_stats" in s for s in statements)
+
+
+def test_estimated_count_follows_deletes(client, backfilled, tasks):
+    client.delete(f"/tasks/{tasks[-1]}")
+    assert total_count(client, count="estimated") == "6"
+
+
+def test_estimated_count_before_the_backfill(client, tasks, db, statements):
+    # Tasks written before the rollup existed aren't in it
+    db.execute(delete(TaskDailyStats))
+    db.commit()
+    statements.clear()
+
+    assert total_count(client, count="estimated") == "7"
+    assert total_count(client, count="estimated", completed="true") == "2"
+    # Not backfilled: the rollup isn't trusted, SQLite counts exactly
+    assert [s for s in statements if "count(" in s.lower()]
+
+    backfill_daily_stats(db)
+    statements.clear()
+    assert total_count(client, count="estimated") == "7"
+    assert not [s for s in statements if "count(" in s.lower()]
+
+
+def test_estimated_count_with_filters(client, tasks):
+    # Text filters can't use the rollup; SQLite then counts exactly
+    assert total_count(client, count="estimated", q="beta") == "3"
+
+
+def test_estimated_project_count_uses_task_count(client, statements):
+    project = client.post("/projects/", json={"name": "counted"}).json()
+    for i in range(3):
+        client.post(f"/projects/{project['id']}/tasks", json={"title": f"task {i}"})
+    statements.clear()
+
+    response = client.get(f"/projects/{project['id']}/tasks", params={"count": "estimated"})
+
+    assert response.headers["X-Total-Count"] == "3"
+    assert not [s for s in statements if "count(" in s.lower()]
+
+
+@pytest.mark.parametrize("params", [{}, {"count": "none"}, {"count": "none", "completed": "true"}])
+def test_no_header_without_count(client, tasks, params):
+    assert total_count(client, **params) is None
@@ -0,0 +1,129 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select
+
+from src.todolist.config import Config
+from src.todolist.db.session import get_engine
+from src.todolist.domain.models import Category, CategoryTaskCounts
+from src.todolist.repositories import task_repository
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed while the fixture is active."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", record)
+    yield executed
+    event.remove(get_engine(), "before_cursor_execute", record)
+
+
+def create_task(client, **fields):
+    response = client.post("/tasks/", json={"title": "Write tests", **fields})
+    assert response.status_code == 201
+    return response.json()
+
+
+def task_updates(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("UPDATE TASKS")]
+
+
+def test_update_with_matching_if_match(client, statements):
+    task = create_task(client)
+    statements.clear()
+
+    response = client.patch(f"/tasks/{task['id']}", json={"title": "Write more tests"}, headers={"If-Match": '"1"'})
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Write more tests"
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+    # One conditional UPDATE; the version check is part of it
+    [update] = task_updates(statements)
+    assert "version" in update.split("WHERE", 1)[1]
+
+
+def test_update_with_stale_if_match_is_rejected(client, statements):
+    task = create_task(client)
+    client.patch(f"/tasks/{task['id']}", json={"priority": 3})
+    statements.clear()
+
+    response = client.patch(f"/tasks/{task['id']}", json={"title": "Lost update"}, headers={"If-Match": '"1"'})
+
+    assert response.status_code == 412
+    assert len(task_updates(statements)) == 1
+    current = client.get(f"/tasks/{task['id']}").json()
+    assert current["title"] == "Write tests"
+    assert current["version"] == 2
+
+
+def task_selects(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT") and " tasks" in s]
+
+
+def test_update_reads_nothing_before_the_update(client, statements):
+    task = create_task(client)
+    statements.clear()
+
+    response = client.patch(f"/tasks/{task['id']}", json={"title": "Write more tests"}, headers={"If-Match": '"1"'})
+
+    assert response.status_code == 200
+    [update] = task_updates(statements)
+    # The UPDATE is the first statement touching tasks (the response is reloaded afterwards)
+    first = next(s for s in statements if " tasks" in s)
+    assert first is update
+
+
+def test_update_of_missing_task(client, statements):
+    response = client.patch("/tasks/999", json={"title": "Nobody home"})
+
+    assert response.status_code == 404
+    assert len(task_updates(statements)) == 1
+    assert task_selects(statements) == []
+
+
+def test_update_of_missing_task_with_if_match(client, statements):
+    response = client.patch("/tasks/999", json={"title": "Nobody home"}, headers={"If-Match": '"1"'})
+
+    assert response.status_code == 404
+    # Nothing matched: one cheap SELECT tells a missing task from a stale version
+    assert len(task_updates(statements)) == 1
+    assert len(task_selects(statements)) == 1
+
+
+def test_update_reports_old_values_in_the_change(client, monkeypatch):
+    task = create_task(client, due_date="2030-01-02T03:04:05.000678", priority=1)
+    changes = []
+    original = task_repository.dispatch_task_changes
+    monkeypatch.setattr(
+        task_repository, "dispatch_task_changes",
+        lambda session, batch: (changes.extend(batch), original(session, batch))
+    )
+
+    client.patch(f"/tasks/{task['id']}", json={"due_date": "2031-01-01T00:00:00", "priority": 1, "title": "Renamed"})
+
+    [change] = changes
+    assert change.kind == "updated"
+    assert change.previous == {"due_date": datetime(2030, 1, 2, 3, 4, 5, 678)}
+    assert change.diff == {
+        "due_date": [datetime(2030, 1, 2, 3, 4, 5, 678), datetime(2031, 1, 1)],
+        "title": ["Write tests", "Renamed"],
+    }
+
+
+def test_update_reports_previous_values_to_rollups(client, read_db, monkeypatch):
+    monkeypatch.setattr(Config, "CATEGORY_STATS_CACHE", True)
+    task = create_task(client, category_name="home")
+
+    response = client.patch(f"/tasks/{task['id']}", json={"category_name": "work"})
+
+    assert response.json()["category"]["name"] == "work"
+    counts = dict(read_db.execute(
+        select(Category.name, CategoryTaskCounts.total)
+        .join(CategoryTaskCounts, CategoryTaskCounts.category_id == Category.id)
+    ).all())
+    assert counts == {"home": 0, "work": 1}